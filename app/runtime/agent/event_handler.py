@@ -33,32 +33,33 @@ class EventHandler:
     def __call__(self, event: Any) -> None:
         etype = event.type
         logger.debug("[event_handler] event type=%s", etype)
-        if etype == SessionEventType.ASSISTANT_MESSAGE_DELTA:
-            self._handle_delta(event)
-        elif etype == SessionEventType.ASSISTANT_MESSAGE:
-            self.final_text = event.data.content
-            logger.info("[event_handler] ASSISTANT_MESSAGE received, len=%d", len(self.final_text or ""))
-        elif etype == SessionEventType.SESSION_IDLE:
-            logger.info("[event_handler] SESSION_IDLE -- marking done")
-            self.done.set()
-        elif etype == SessionEventType.SESSION_ERROR:
-            self.error = str(event.data) if hasattr(event, "data") else "Unknown error"
-            logger.error("[event_handler] SESSION_ERROR: %s", self.error)
-            self.done.set()
-        elif self.on_event:
-            self._dispatch_intermediate(etype, event)
-
-    def _handle_delta(self, event: Any) -> None:
+        handler = _CORE_TABLE.get(etype)
+        if handler is None and self.on_event:
+            handler = _DISPATCH_TABLE.get(etype)
+        if handler is not None:
+            handler(self, event)
+
+    def _on_delta(self, event: Any) -> None:
         chunk = event.data.delta_content or ""
         if self.on_delta and chunk:
             self.on_delta(chunk)
 
-    def _dispatch_intermediate(self, etype: Any, event: Any) -> None:
-        handler = _DISPATCH_TABLE.get(etype)
-        if handler:
-            handler(self, etype, event)
+    def _on_message(self, event: Any) -> None:
+        self.final_text = event.data.content
+        logger.info(
+            "[event_handler] ASSISTANT_MESSAGE received, len=%d", len(self.final_text or ""),
+        )
+
+    def _on_idle(self, _event: Any) -> None:
+        logger.info("[event_handler] SESSION_IDLE -- marking done")
+        self.done.set()
+
+    def _on_error(self, event: Any) -> None:
+        self.error = str(event.data) if hasattr(event, "data") else "Unknown error"
+        logger.error("[event_handler] SESSION_ERROR: %s", self.error)
+        self.done.set()
 
-    def _on_tool_start(self, _etype: Any, event: Any) -> None:
+    def _on_tool_start(self, event: Any) -> None:
         assert self.on_event is not None
         tool = _extract_tool_name(event.data)
         call_id = event.data.tool_call_id or ""
@@ -70,7 +71,7 @@ class EventHandler:
             "arguments": str(event.data.arguments) if event.data.arguments else None,
         })
 
-    def _on_tool_complete(self, _etype: Any, event: Any) -> None:
+    def _on_tool_complete(self, event: Any) -> None:
         assert self.on_event is not None
         call_id = event.data.tool_call_id or ""
         tool = _extract_tool_name(event.data, self._tool_names.get(call_id, "unknown"))
@@ -79,7 +80,7 @@ class EventHandler:
             result_text = event.data.result.content[:500]
         self.on_event("tool_done", {"tool": tool, "call_id": call_id, "result": result_text})
 
-    def _on_tool_progress(self, _etype: Any, event: Any) -> None:
+    def _on_tool_progress(self, event: Any) -> None:
         assert self.on_event is not None
         call_id = event.data.tool_call_id or ""
         tool = _extract_tool_name(event.data, self._tool_names.get(call_id, "unknown"))
@@ -89,31 +90,40 @@ class EventHandler:
             "message": event.data.progress_message or "",
         })
 
-    def _on_reasoning(self, _etype: Any, event: Any) -> None:
+    def _on_reasoning(self, event: Any) -> None:
         assert self.on_event is not None
         text = event.data.reasoning_text or event.data.delta_content or ""
         if text:
             self.on_event("reasoning", {"text": text})
 
-    def _on_skill(self, _etype: Any, event: Any) -> None:
+    def _on_skill(self, event: Any) -> None:
         assert self.on_event is not None
         skill_name = event.data.name or "unknown"
         self.on_event("skill", {"name": skill_name})
         from ..state.profile import increment_skill_usage
         increment_skill_usage(skill_name)
 
-    def _on_subagent_start(self, _etype: Any, event: Any) -> None:
+    def _on_subagent_start(self, event: Any) -> None:
         assert self.on_event is not None
         name = event.data.agent_name or event.data.agent_display_name or "unknown"
         self.on_event("subagent_start", {"name": name})
 
-    def _on_subagent_done(self, _etype: Any, event: Any) -> None:
+    def _on_subagent_done(self, event: Any) -> None:
         assert self.on_event is not None
         name = event.data.agent_name or event.data.agent_display_name or "unknown"
         self.on_event("subagent_done", {"name": name})
 
 
-_DISPATCH_TABLE: dict[Any, Callable] = {
+# Always handled, whether or not an on_event callback is set.
+_CORE_TABLE: dict[Any, Callable[[EventHandler, Any], None]] = {
+    SessionEventType.ASSISTANT_MESSAGE_DELTA: EventHandler._on_delta,
+    SessionEventType.ASSISTANT_MESSAGE: EventHandler._on_message,
+    SessionEventType.SESSION_IDLE: EventHandler._on_idle,
+    SessionEventType.SESSION_ERROR: EventHandler._on_error,
+}
+
+# Intermediate events, forwarded only to an on_event callback.
+_DISPATCH_TABLE: dict[Any, Callable[[EventHandler, Any], None]] = {
     SessionEventType.TOOL_EXECUTION_START: EventHandler._on_tool_start,
     SessionEventType.TOOL_EXECUTION_COMPLETE: EventHandler._on_tool_complete,
     SessionEventType.TOOL_EXECUTION_PROGRESS: EventHandler._on_tool_progress,
@@ -125,4 +135,9 @@ _DISPATCH_TABLE: dict[Any, Callable] = {
 
 
 def _extract_tool_name(data: Any, fallback: str = "unknown") -> str:
-    return data.tool_name or getattr(data, "mcp_tool_name", None) or data.name or fallback
+    return (
+        getattr(data, "tool_name", None)
+        or getattr(data, "mcp_tool_name", None)
+        or getattr(data, "name", None)
+        or fallback
+    )
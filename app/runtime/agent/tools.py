@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field
 
 from ..config.settings import cfg
 from ..messaging.cards import CARD_TOOLS
+from ..util.async_helpers import run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -159,7 +160,7 @@ def make_voice_call(params: MakeCallParams) -> dict:
         "embeddings. Only works when Foundry IQ is enabled."
     )
 )
-def search_memories_tool(params: SearchMemoriesParams) -> dict:
+async def search_memories_tool(params: SearchMemoriesParams) -> dict:
     from ..services.foundry_iq import search_memories
     from ..state.foundry_iq_config import get_foundry_iq_config
 
@@ -169,7 +170,8 @@ def search_memories_tool(params: SearchMemoriesParams) -> dict:
 
     try:
         top = min(max(params.top, 1), 10)
-        data = search_memories(params.query, top, config)
+        # The Search and embedding calls block; keep them off the event loop.
+        data = await run_sync(search_memories, params.query, top, config)
         if data.get("status") == "ok" and data.get("results"):
             formatted = [
                 {
@@ -105,20 +105,23 @@ class CommandDispatcher:
         *,
         channel_ctx: ChannelContext | None = None,
     ) -> bool:
+        # Every command starts with "/"; plain chat messages skip the lookups entirely.
+        if not text.startswith("/"):
+            return False
         lower = text.lower()
-        ctx = CommandContext(text=text, reply=reply, channel=channel, channel_ctx=channel_ctx)
 
         handler_name = self._EXACT_COMMANDS.get(lower)
-        if handler_name:
-            await getattr(self, handler_name)(ctx)
-            return True
-
-        for prefix, handler_name in self._PREFIX_COMMANDS:
-            if lower.startswith(prefix):
-                await getattr(self, handler_name)(ctx)
-                return True
+        if handler_name is None:
+            handler_name = next(
+                (name for prefix, name in self._PREFIX_COMMANDS if lower.startswith(prefix)),
+                None,
+            )
+        if handler_name is None:
+            return False
 
-        return False
+        ctx = CommandContext(text=text, reply=reply, channel=channel, channel_ctx=channel_ctx)
+        await getattr(self, handler_name)(ctx)
+        return True
 
     async def _cmd_new(self, ctx: CommandContext) -> None:
         await self._agent.new_session()
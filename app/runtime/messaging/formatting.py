@@ -4,9 +4,25 @@ from __future__ import annotations
 
 import re
 
+_FENCED_CODE = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
+_INLINE_CODE = re.compile(r"`([^`\n]+)`")
+_HEADER = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_UNDERLINE = re.compile(r"__(.+?)__")
+_ITALIC_STAR = re.compile(r"(?<!\w)\*([^*\n]+?)\*(?!\w)")
+_ITALIC_UNDERSCORE = re.compile(r"(?<!\w)_([^_\n]+?)_(?!\w)")
+_STRIKE = re.compile(r"~~(.+?)~~")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_HR = re.compile(r"^---+\s*$", re.MULTILINE)
+_PLACEHOLDER = re.compile(r"\x00PH(\d+)\x00")
+# Every pattern above needs one of these; text without any is returned as is.
+_MARKUP_CHARS = frozenset("`#*_~[-")
+
 
 def markdown_to_telegram(text: str) -> str:
     """Convert standard Markdown to Telegram legacy Markdown."""
+    if _MARKUP_CHARS.isdisjoint(text):
+        return text.strip()
     placeholders: list[str] = []
 
     def _stash(m: re.Match) -> str:
@@ -14,29 +30,31 @@ def markdown_to_telegram(text: str) -> str:
         placeholders.append(m.group(0))
         return f"\x00PH{idx}\x00"
 
-    text = re.sub(r"```(\w*)\n(.*?)```", _stash, text, flags=re.DOTALL)
-    text = re.sub(r"`([^`\n]+)`", _stash, text)
-    text = re.sub(r"^#{1,6}\s+(.+)$", r"*\1*", text, flags=re.MULTILINE)
-    text = re.sub(r"\*\*(.+?)\*\*", r"*\1*", text)
-    text = re.sub(r"__(.+?)__", r"*\1*", text)
-    text = re.sub(r"~~(.+?)~~", r"\1", text)
-    text = re.sub(r"^---+\s*$", "", text, flags=re.MULTILINE)
+    text = _FENCED_CODE.sub(_stash, text)
+    text = _INLINE_CODE.sub(_stash, text)
+    text = _HEADER.sub(r"*\1*", text)
+    text = _BOLD.sub(r"*\1*", text)
+    text = _UNDERLINE.sub(r"*\1*", text)
+    text = _STRIKE.sub(r"\1", text)
+    text = _HR.sub("", text)
 
-    for idx, original in enumerate(placeholders):
-        text = text.replace(f"\x00PH{idx}\x00", original, 1)
+    if placeholders:
+        text = _PLACEHOLDER.sub(lambda m: placeholders[int(m.group(1))], text)
 
     return text.strip()
 
 
 def strip_markdown(text: str) -> str:
     """Strip all Markdown formatting to produce clean plain text."""
-    text = re.sub(r"```\w*\n(.*?)```", r"\1", text, flags=re.DOTALL)
-    text = re.sub(r"^#{1,6}\s+(.+)$", r"\1", text, flags=re.MULTILINE)
-    text = re.sub(r"\*\*(.+?)\*\*", r"\1", text)
-    text = re.sub(r"__(.+?)__", r"\1", text)
-    text = re.sub(r"(?<!\w)\*([^*\n]+?)\*(?!\w)", r"\1", text)
-    text = re.sub(r"(?<!\w)_([^_\n]+?)_(?!\w)", r"\1", text)
-    text = re.sub(r"~~(.+?)~~", r"\1", text)
-    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r"\1 (\2)", text)
-    text = re.sub(r"^---+\s*$", "", text, flags=re.MULTILINE)
+    if _MARKUP_CHARS.isdisjoint(text):
+        return text.strip()
+    text = _FENCED_CODE.sub(r"\2", text)
+    text = _HEADER.sub(r"\1", text)
+    text = _BOLD.sub(r"\1", text)
+    text = _UNDERLINE.sub(r"\1", text)
+    text = _ITALIC_STAR.sub(r"\1", text)
+    text = _ITALIC_UNDERSCORE.sub(r"\1", text)
+    text = _STRIKE.sub(r"\1", text)
+    text = _LINK.sub(r"\1 (\2)", text)
+    text = _HR.sub("", text)
     return text.strip()
@@ -541,7 +541,7 @@ class AppFactory:
 
         # Provision order: 1) start tunnel → 2) create/update bot with new URL
         logger.info("Startup: provisioning infrastructure from config ...")
-        steps = await run_sync(self._provisioner.provision)
+        steps = await self._provisioner.provision_async()
         self._rebuild_adapter()
         for s in steps:
             logger.info("  provision: %s = %s (%s)", s.get("step"), s.get("status"), s.get("detail", ""))
@@ -588,7 +588,7 @@ class AppFactory:
             logger.info("Lock Down Mode active -- skipping shutdown decommission")
         elif self._infra_store.bot_configured and cfg.env.read("BOT_NAME"):
             logger.info("Shutdown: decommissioning infrastructure ...")
-            steps = await run_sync(self._provisioner.decommission)
+            steps = await self._provisioner.decommission_async()
             for s in steps:
                 logger.info("  decommission: %s = %s (%s)", s.get("step"), s.get("status"), s.get("detail", ""))
 
@@ -21,6 +21,7 @@ from ...services.foundry_iq import (
 from ...state.deploy_state import DeployStateStore
 from ...state.foundry_iq_config import FoundryIQConfigStore
 from ...util.async_helpers import run_sync
+from ..responses import json_response
 
 logger = logging.getLogger(__name__)
 
@@ -54,60 +55,60 @@ class FoundryIQRoutes:
         router.add_delete("/api/foundry-iq/provision", self._decommission)
 
     async def _get_config(self, _req: web.Request) -> web.Response:
-        return web.json_response(self._store.to_safe_dict())
+        return json_response(self._store.to_safe_dict())
 
     async def _save_config(self, req: web.Request) -> web.Response:
         data = await req.json()
         self._store.save(**data)
-        return web.json_response({"status": "ok", "config": self._store.to_safe_dict()})
+        return json_response({"status": "ok", "config": self._store.to_safe_dict()})
 
     async def _test_search(self, _req: web.Request) -> web.Response:
         result = await run_sync(test_search_connection, self._store)
-        return web.json_response(result)
+        return json_response(result)
 
     async def _test_embedding(self, _req: web.Request) -> web.Response:
         result = await run_sync(test_embedding_connection, self._store)
-        return web.json_response(result)
+        return json_response(result)
 
     async def _ensure_index(self, _req: web.Request) -> web.Response:
         result = await run_sync(ensure_index, self._store)
-        return web.json_response(result)
+        return json_response(result)
 
     async def _delete_index(self, _req: web.Request) -> web.Response:
         result = await run_sync(delete_index, self._store)
-        return web.json_response(result)
+        return json_response(result)
 
     async def _run_indexing(self, _req: web.Request) -> web.Response:
         try:
             result = await run_sync(index_memories, self._store)
         except Exception as exc:
             logger.exception("Indexing failed")
-            return web.json_response(
+            return json_response(
                 {"status": "error", "message": f"Indexing crashed: {exc}"},
                 status=500,
             )
-        return web.json_response(result)
+        return json_response(result)
 
     async def _get_stats(self, _req: web.Request) -> web.Response:
         result = await run_sync(get_index_stats, self._store)
-        return web.json_response(result)
+        return json_response(result)
 
     async def _search(self, req: web.Request) -> web.Response:
         data = await req.json()
         query = data.get("query", "").strip()
         if not query:
-            return web.json_response(
+            return json_response(
                 {"status": "error", "message": "Query is required"}, status=400
             )
         top = data.get("top", 5)
         result = await run_sync(search_memories, query, top, self._store)
-        return web.json_response(result)
+        return json_response(result)
 
     async def _provision(self, req: web.Request) -> web.Response:
         if not self._az:
             return _no_az()
         if self._store.is_provisioned:
-            return web.json_response({
+            return json_response({
                 "status": "ok",
                 "message": "Already provisioned",
                 "steps": [],
@@ -185,7 +186,7 @@ class FoundryIQRoutes:
             })
 
         logger.info("Foundry IQ provisioned: search=%s, openai=%s", search_name, openai_name)
-        return web.json_response({
+        return json_response({
             "status": "ok",
             "message": f"Foundry IQ provisioned in {rg}",
             "steps": steps,
@@ -196,7 +197,7 @@ class FoundryIQRoutes:
         if not self._az:
             return _no_az()
         if not self._store.is_provisioned:
-            return web.json_response(
+            return json_response(
                 {"status": "error", "message": "Nothing provisioned"}, status=400
             )
 
@@ -260,7 +261,7 @@ class FoundryIQRoutes:
         steps.append({"step": "clear_config", "status": "ok", "detail": "Cleared"})
 
         logger.info("Foundry IQ decommissioned: %s, %s", search_name, openai_name)
-        return web.json_response({
+        return json_response({
             "status": "ok", "message": "Resources removed", "steps": steps
         })
 
@@ -438,13 +439,13 @@ class FoundryIQRoutes:
 
 
 def _no_az() -> web.Response:
-    return web.json_response(
+    return json_response(
         {"status": "error", "message": "Azure CLI not available"}, status=500
     )
 
 
 def _fail_response(steps: list[dict[str, Any]]) -> web.Response:
-    return web.json_response(
+    return json_response(
         {"status": "error", "message": "Provisioning failed", "steps": steps},
         status=500,
     )
@@ -64,34 +64,35 @@ class SandboxRoutes:
                 {"status": "error", "message": "Invalid JSON"}, status=400
             )
 
-        if "enabled" in body:
-            self._store.set_enabled(bool(body["enabled"]))
-        if "sync_data" in body:
-            self._store.set_sync_data(bool(body["sync_data"]))
-        if "session_pool_endpoint" in body:
-            self._store.set_session_pool_endpoint(str(body["session_pool_endpoint"]))
-
-        if "whitelist" in body:
-            wl = body["whitelist"]
-            if not isinstance(wl, list):
-                return web.json_response(
-                    {"status": "error", "message": "whitelist must be a list"},
-                    status=400,
-                )
-            self._store.set_whitelist(wl)
-
-        if "add_whitelist" in body:
-            item = str(body["add_whitelist"])
-            if not self._store.add_whitelist_item(item):
-                return web.json_response(
-                    {"status": "error", "message": f"'{item}' is blacklisted"},
-                    status=400,
-                )
-
-        if "remove_whitelist" in body:
-            self._store.remove_whitelist_item(str(body["remove_whitelist"]))
-        if body.get("reset_whitelist"):
-            self._store.reset_whitelist()
+        with self._store.batch():
+            if "enabled" in body:
+                self._store.set_enabled(bool(body["enabled"]))
+            if "sync_data" in body:
+                self._store.set_sync_data(bool(body["sync_data"]))
+            if "session_pool_endpoint" in body:
+                self._store.set_session_pool_endpoint(str(body["session_pool_endpoint"]))
+
+            if "whitelist" in body:
+                wl = body["whitelist"]
+                if not isinstance(wl, list):
+                    return web.json_response(
+                        {"status": "error", "message": "whitelist must be a list"},
+                        status=400,
+                    )
+                self._store.set_whitelist(wl)
+
+            if "add_whitelist" in body:
+                item = str(body["add_whitelist"])
+                if not self._store.add_whitelist_item(item):
+                    return web.json_response(
+                        {"status": "error", "message": f"'{item}' is blacklisted"},
+                        status=400,
+                    )
+
+            if "remove_whitelist" in body:
+                self._store.remove_whitelist_item(str(body["remove_whitelist"]))
+            if body.get("reset_whitelist"):
+                self._store.reset_whitelist()
 
         return web.json_response({"status": "ok", **self._store.to_dict()})
 
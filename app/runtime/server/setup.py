@@ -361,8 +361,7 @@ class SetupRoutes:
         return web.json_response(result)
 
     async def infra_deploy(self, _req: web.Request) -> web.Response:
-        decomm_steps = await run_sync(self._provisioner.decommission)
-        prov_steps = await run_sync(self._provisioner.provision)
+        decomm_steps, prov_steps = await self._provisioner.redeploy_async()
         self._rebuild()
 
         all_steps = decomm_steps + prov_steps
@@ -374,7 +373,7 @@ class SetupRoutes:
         }, status=500 if prov_failed else 200)
 
     async def infra_decommission(self, _req: web.Request) -> web.Response:
-        steps = await run_sync(self._provisioner.decommission)
+        steps = await self._provisioner.decommission_async()
         self._rebuild()
         failed = any(s.get("status") == "failed" for s in steps)
         return web.json_response({
@@ -2,19 +2,49 @@
 
 from __future__ import annotations
 
-import functools
+import asyncio
 import logging
+import re
 import secrets
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
 
 from aiohttp import web
 
 from ..config.settings import cfg
 from ..services.azure import AzureCLI
 from ..state.infra_config import InfraConfigStore
-from ..util.async_helpers import run_sync
+from ..util.async_helpers import run_az_sync
+from .responses import json_response
 
 logger = logging.getLogger(__name__)
 
+_ACS_PREFIX = "polyclaw-acs-"
+_AOAI_PREFIX = "polyclaw-aoai-"
+_NAME_SUFFIX_BYTES = 6
+_PORTAL_PHONES_URL = (
+    "https://portal.azure.com/#@/resource/subscriptions/{sub}"
+    "/resourceGroups/{rg}"
+    "/providers/Microsoft.Communication"
+    "/CommunicationServices/{acs}"
+    "/phonenumbers"
+)
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+# Discovery listings are cached briefly; failures (e.g. before az login) never are.
+_DISCOVERY_TTL = 30
+_RG_CACHE_TTL = 300
+_CONN_STR_TTL = 600
+_E164_RE = re.compile(r"^\+[1-9]\d{7,14}$")
+_REALTIME_MODELS = frozenset({
+    "gpt-4o-realtime-preview",
+    "gpt-realtime-mini",
+    "gpt-4o-mini-realtime-preview",
+})
+_AOAI_LIST_ARGS = ("resource", "list", "--resource-type", "Microsoft.CognitiveServices/accounts")
+_ACS_LIST_ARGS = ("communication", "list")
+
 
 class VoiceSetupRoutes:
     """ACS + Azure OpenAI provisioning, phone config, and decommissioning."""
@@ -22,18 +52,22 @@ class VoiceSetupRoutes:
     def __init__(self, az: AzureCLI, store: InfraConfigStore) -> None:
         self._az = az
         self._store = store
+        self._rg_exists: dict[str, float] = {}
+        self._conn_str_cache: dict[tuple[str, str], tuple[float, str]] = {}
 
     def register(self, router: web.UrlDispatcher) -> None:
-        router.add_get("/api/setup/voice/config", self.get_config)
-        router.add_post("/api/setup/voice/deploy", self.deploy)
-        router.add_post("/api/setup/voice/connect", self.connect_existing)
-        router.add_post("/api/setup/voice/phone", self.save_phone)
-        router.add_post("/api/setup/voice/decommission", self.decommission)
-        router.add_get("/api/setup/voice/aoai/list", self.list_aoai)
-        router.add_get("/api/setup/voice/aoai/deployments", self.list_aoai_deployments)
-        router.add_post("/api/setup/voice/aoai/validate", self.validate_aoai)
-        router.add_get("/api/setup/voice/acs/list", self.list_acs)
-        router.add_get("/api/setup/voice/acs/phones", self.list_acs_phones)
+        router.add_routes([
+            web.get("/api/setup/voice/config", self.get_config),
+            web.post("/api/setup/voice/deploy", self.deploy),
+            web.post("/api/setup/voice/connect", self.connect_existing),
+            web.post("/api/setup/voice/phone", self.save_phone),
+            web.post("/api/setup/voice/decommission", self.decommission),
+            web.get("/api/setup/voice/aoai/list", self.list_aoai),
+            web.get("/api/setup/voice/aoai/deployments", self.list_aoai_deployments),
+            web.post("/api/setup/voice/aoai/validate", self.validate_aoai),
+            web.get("/api/setup/voice/acs/list", self.list_acs),
+            web.get("/api/setup/voice/acs/phones", self.list_acs_phones),
+        ])
 
     # ------------------------------------------------------------------
     # Config
@@ -44,17 +78,13 @@ class VoiceSetupRoutes:
         if vc.get("acs_resource_name"):
             rg = vc.get("voice_resource_group") or vc.get("resource_group")
             if rg:
-                account = self._az.account_info()
+                account = await run_az_sync(self._az.account_info)
                 sub_id = account.get("id", "") if account else ""
                 if sub_id:
-                    vc["portal_phone_url"] = (
-                        f"https://portal.azure.com/#@/resource/subscriptions/{sub_id}"
-                        f"/resourceGroups/{rg}"
-                        f"/providers/Microsoft.Communication"
-                        f"/CommunicationServices/{vc['acs_resource_name']}"
-                        f"/phonenumbers"
+                    vc["portal_phone_url"] = _PORTAL_PHONES_URL.format(
+                        sub=sub_id, rg=rg, acs=vc["acs_resource_name"],
                     )
-        return web.json_response(vc)
+        return json_response(vc)
 
     # ------------------------------------------------------------------
     # Deploy
@@ -62,8 +92,8 @@ class VoiceSetupRoutes:
 
     async def deploy(self, req: web.Request) -> web.Response:
         body = await req.json()
-        location = body.get("location", "swedencentral").strip()
-        voice_rg = body.get("voice_resource_group", "").strip() or "polyclaw-voice-rg"
+        location = _field(body, "location", "swedencentral")
+        voice_rg = _field(body, "voice_resource_group") or "polyclaw-voice-rg"
         logger.info("Voice deploy started: voice_rg=%s, location=%s", voice_rg, location)
 
         steps: list[dict] = []
@@ -88,13 +118,14 @@ class VoiceSetupRoutes:
             voice_rg, location, acs_name, conn_str,
             aoai_name, aoai_endpoint, aoai_key, deployment_name, steps,
         )
+        self._invalidate_discovery(aoai_name, voice_rg)
         logger.info("Voice deploy completed: acs=%s, aoai=%s", acs_name, aoai_name)
 
         reinit = req.app.get("_reinit_voice")
         if reinit:
             reinit()
 
-        return web.json_response({
+        return json_response({
             "status": "ok",
             "steps": steps,
             "message": (
@@ -109,20 +140,20 @@ class VoiceSetupRoutes:
 
     async def save_phone(self, req: web.Request) -> web.Response:
         body = await req.json()
-        phone = body.get("phone_number", "").strip()
-        target = body.get("target_number", "").strip()
+        phone = _field(body, "phone_number")
+        target = _field(body, "target_number")
 
         updates: dict[str, str] = {}
         env_updates: dict[str, str] = {}
 
         if phone:
-            if not phone.startswith("+"):
+            if not _E164_RE.match(phone):
                 return _error("Source phone number must be in E.164 format (e.g. +14155551234)", 400)
             updates["acs_source_number"] = phone
             env_updates["ACS_SOURCE_NUMBER"] = phone
 
         if target:
-            if not target.startswith("+"):
+            if not _E164_RE.match(target):
                 return _error("Target phone number must be in E.164 format (e.g. +41781234567)", 400)
             updates["voice_target_number"] = target
             env_updates["VOICE_TARGET_NUMBER"] = target
@@ -149,9 +180,10 @@ class VoiceSetupRoutes:
         steps: list[dict] = []
 
         if voice_rg:
-            rg_exists = await run_sync(self._az.json, "group", "show", "--name", voice_rg)
+            self._rg_exists.pop(voice_rg, None)
+            rg_exists = await run_az_sync(self._az.json, "group", "show", "--name", voice_rg)
             if rg_exists:
-                ok, msg = await run_sync(
+                ok, msg = await run_az_sync(
                     self._az.ok, "group", "delete", "--name", voice_rg, "--yes", "--no-wait",
                 )
                 steps.append({
@@ -165,7 +197,7 @@ class VoiceSetupRoutes:
         else:
             rg = vc.resource_group
             if vc.acs_resource_name and rg:
-                ok, _ = await run_sync(
+                ok, _ = await run_az_sync(
                     self._az.ok, "communication", "delete",
                     "--name", vc.acs_resource_name, "--resource-group", rg, "--yes",
                 )
@@ -176,7 +208,7 @@ class VoiceSetupRoutes:
                 })
 
             if vc.azure_openai_resource_name and rg:
-                ok, _ = await run_sync(
+                ok, _ = await run_az_sync(
                     self._az.ok, "cognitiveservices", "account", "delete",
                     "--name", vc.azure_openai_resource_name, "--resource-group", rg, "--yes",
                 )
@@ -186,6 +218,8 @@ class VoiceSetupRoutes:
                     "name": vc.azure_openai_resource_name,
                 })
 
+        self._invalidate_discovery(vc.azure_openai_resource_name, voice_rg)
+        self._conn_str_cache.clear()
         self._store.clear_voice_call()
         cfg.write_env(
             ACS_CONNECTION_STRING="",
@@ -197,7 +231,7 @@ class VoiceSetupRoutes:
             ACS_CALLBACK_TOKEN="",
         )
 
-        return web.json_response({
+        return json_response({
             "status": "ok",
             "steps": steps,
             "message": "Voice infrastructure decommissioned",
@@ -207,15 +241,14 @@ class VoiceSetupRoutes:
     # Discovery: AOAI
     # ------------------------------------------------------------------
 
-    async def list_aoai(self, _req: web.Request) -> web.Response:
-        resources = await run_sync(
-            self._az.json, "resource", "list",
-            "--resource-type", "Microsoft.CognitiveServices/accounts",
+    async def list_aoai(self, req: web.Request) -> web.Response:
+        resources = await run_az_sync(
+            self._az.json_cached, *_AOAI_LIST_ARGS, ttl=_DISCOVERY_TTL, failure_ttl=0,
         )
         if not isinstance(resources, list):
-            return web.json_response([])
+            return json_response([])
 
-        return web.json_response([
+        result = [
             {
                 "name": r.get("name", ""),
                 "resource_group": r.get("resourceGroup", ""),
@@ -223,67 +256,71 @@ class VoiceSetupRoutes:
             }
             for r in resources
             if r.get("kind") == "OpenAI"
-        ])
+        ]
+        if req.query.get("include_deployments") == "1":
+            await self._attach_deployments(result)
+        return json_response(result)
 
     async def list_aoai_deployments(self, req: web.Request) -> web.Response:
-        name = req.query.get("name", "").strip()
-        rg = req.query.get("resource_group", "").strip()
+        name = _field(req.query, "name")
+        rg = _field(req.query, "resource_group")
         if not name or not rg:
             return _error("name and resource_group are required", 400)
 
-        deployments = await run_sync(
-            self._az.json, "cognitiveservices", "account", "deployment", "list",
-            "--name", name, "--resource-group", rg,
+        deployments = await run_az_sync(
+            self._az.json_cached,
+            *_deployment_list_args(name, rg),
+            ttl=_DISCOVERY_TTL,
+            failure_ttl=0,
         )
         if not isinstance(deployments, list):
-            return web.json_response([])
+            return json_response([])
 
-        return web.json_response([
-            {
-                "deployment_name": d.get("name", ""),
-                "model_name": d.get("properties", {}).get("model", {}).get("name", ""),
-                "model_version": d.get("properties", {}).get("model", {}).get("version", ""),
-                "model_format": d.get("properties", {}).get("model", {}).get("format", ""),
-            }
-            for d in deployments
-        ])
+        return json_response([_deployment_entry(d) for d in deployments])
 
     async def validate_aoai(self, req: web.Request) -> web.Response:
         body = await req.json()
-        name = body.get("name", "").strip()
-        rg = body.get("resource_group", "").strip()
+        name = _field(body, "name")
+        rg = _field(body, "resource_group")
         if not name or not rg:
             return _error("name and resource_group are required", 400)
 
-        deployments = await run_sync(
-            self._az.json, "cognitiveservices", "account", "deployment", "list",
-            "--name", name, "--resource-group", rg,
+        deployments = await run_az_sync(
+            self._az.json_cached,
+            *_deployment_list_args(name, rg),
+            ttl=_DISCOVERY_TTL,
+            failure_ttl=0,
         )
         if not isinstance(deployments, list):
-            return web.json_response({
+            return json_response({
                 "valid": False,
                 "message": f"Cannot list deployments for {name}",
                 "deployments": [],
             })
 
-        realtime_models = {
-            "gpt-4o-realtime-preview",
-            "gpt-realtime-mini",
-            "gpt-4o-mini-realtime-preview",
-        }
+        if req.query.get("summary") == "1":
+            return json_response({
+                "valid": any(
+                    _deployment_model(d).get("name", "") in _REALTIME_MODELS
+                    for d in deployments
+                ),
+            })
+
         found = []
+        has_realtime = False
         for d in deployments:
-            model = d.get("properties", {}).get("model", {})
+            model = _deployment_model(d)
             model_name = model.get("name", "")
+            is_realtime = model_name in _REALTIME_MODELS
+            has_realtime = has_realtime or is_realtime
             found.append({
                 "deployment_name": d.get("name", ""),
                 "model_name": model_name,
                 "model_version": model.get("version", ""),
-                "is_realtime": model_name in realtime_models,
+                "is_realtime": is_realtime,
             })
 
-        has_realtime = any(f["is_realtime"] for f in found)
-        return web.json_response({
+        return json_response({
             "valid": has_realtime,
             "message": (
                 "Realtime model deployment found"
@@ -298,11 +335,13 @@ class VoiceSetupRoutes:
     # ------------------------------------------------------------------
 
     async def list_acs(self, _req: web.Request) -> web.Response:
-        resources = await run_sync(self._az.json, "communication", "list")
+        resources = await run_az_sync(
+            self._az.json_cached, *_ACS_LIST_ARGS, ttl=_DISCOVERY_TTL, failure_ttl=0,
+        )
         if not isinstance(resources, list):
-            return web.json_response([])
+            return json_response([])
 
-        return web.json_response([
+        return json_response([
             {
                 "name": r.get("name", ""),
                 "resource_group": r.get("resourceGroup", ""),
@@ -312,27 +351,23 @@ class VoiceSetupRoutes:
         ])
 
     async def list_acs_phones(self, req: web.Request) -> web.Response:
-        name = req.query.get("name", "").strip()
-        rg = req.query.get("resource_group", "").strip()
+        name = _field(req.query, "name")
+        rg = _field(req.query, "resource_group")
         if not name or not rg:
             return _error("name and resource_group are required", 400)
 
-        keys = await run_sync(
-            self._az.json, "communication", "list-key",
-            "--name", name, "--resource-group", rg,
-        )
-        conn_str = keys.get("primaryConnectionString", "") if isinstance(keys, dict) else ""
+        conn_str = await self._acs_connection_string(name, rg)
         if not conn_str:
-            return web.json_response([])
+            return json_response([])
 
-        phones = await run_sync(
+        phones = await run_az_sync(
             self._az.json, "communication", "phonenumber", "list",
             "--connection-string", conn_str,
         )
         if not isinstance(phones, list):
-            return web.json_response([])
+            return json_response([])
 
-        return web.json_response([
+        return json_response([
             {"phone_number": p.get("phoneNumber", "")}
             for p in phones
             if p.get("phoneNumber")
@@ -346,27 +381,37 @@ class VoiceSetupRoutes:
         body = await req.json()
         steps: list[dict] = []
 
-        aoai_name = body.get("aoai_name", "").strip()
-        aoai_rg = body.get("aoai_resource_group", "").strip()
-        aoai_deployment = body.get("aoai_deployment", "").strip() or "gpt-realtime-mini"
+        aoai_name = _field(body, "aoai_name")
+        aoai_rg = _field(body, "aoai_resource_group")
+        aoai_deployment = _field(body, "aoai_deployment") or "gpt-realtime-mini"
 
         if not aoai_name or not aoai_rg:
             return _error("aoai_name and aoai_resource_group are required", 400)
 
-        aoai_info = await run_sync(
-            self._az.json, "cognitiveservices", "account", "show",
-            "--name", aoai_name, "--resource-group", aoai_rg,
-        )
+        acs_name = _field(body, "acs_name")
+        acs_rg = _field(body, "acs_resource_group")
+
+        lookups = [
+            run_az_sync(
+                self._az.json, "cognitiveservices", "account", "show",
+                "--name", aoai_name, "--resource-group", aoai_rg,
+            ),
+            run_az_sync(self._az.json, *_deployment_list_args(aoai_name, aoai_rg)),
+            run_az_sync(
+                self._az.json, "cognitiveservices", "account", "keys", "list",
+                "--name", aoai_name, "--resource-group", aoai_rg,
+            ),
+        ]
+        if acs_name and acs_rg:
+            lookups.append(self._acs_connection_string(acs_name, acs_rg))
+        aoai_info, deployments, aoai_keys, *acs_conn = await asyncio.gather(*lookups)
+
         if not isinstance(aoai_info, dict):
             return _error(f"Azure OpenAI resource '{aoai_name}' not found in RG '{aoai_rg}'", 404)
 
         aoai_endpoint = aoai_info.get("properties", {}).get("endpoint", "")
         steps.append({"step": "aoai_resource", "status": "ok", "name": f"{aoai_name} (existing)"})
 
-        deployments = await run_sync(
-            self._az.json, "cognitiveservices", "account", "deployment", "list",
-            "--name", aoai_name, "--resource-group", aoai_rg,
-        )
         dep_found = isinstance(deployments, list) and any(
             d.get("name") == aoai_deployment for d in deployments
         )
@@ -380,10 +425,6 @@ class VoiceSetupRoutes:
 
         steps.append({"step": "aoai_deployment", "status": "ok", "name": f"{aoai_deployment} (verified)"})
 
-        aoai_keys = await run_sync(
-            self._az.json, "cognitiveservices", "account", "keys", "list",
-            "--name", aoai_name, "--resource-group", aoai_rg,
-        )
         aoai_key = aoai_keys.get("key1", "") if isinstance(aoai_keys, dict) else ""
         if aoai_key:
             steps.append({"step": "aoai_keys", "status": "ok"})
@@ -394,17 +435,11 @@ class VoiceSetupRoutes:
                 "detail": "Key-based auth disabled; will use Entra ID (DefaultAzureCredential)",
             })
 
-        acs_name = body.get("acs_name", "").strip()
-        acs_rg = body.get("acs_resource_group", "").strip()
         conn_str = ""
         voice_rg = aoai_rg
 
-        if acs_name and acs_rg:
-            keys = await run_sync(
-                self._az.json, "communication", "list-key",
-                "--name", acs_name, "--resource-group", acs_rg,
-            )
-            conn_str = keys.get("primaryConnectionString", "") if isinstance(keys, dict) else ""
+        if acs_conn:
+            conn_str = acs_conn[0]
             if not conn_str:
                 steps.append({
                     "step": "acs_resource", "status": "failed",
@@ -426,30 +461,35 @@ class VoiceSetupRoutes:
         if not aoai_key:
             await self._ensure_rbac(aoai_name, aoai_rg, steps)
 
+        phone = _field(body, "phone_number")
+        target = _field(body, "target_number")
+        extra: dict[str, str] = {}
+        extra_env: dict[str, str] = {}
+        if phone:
+            extra["acs_source_number"] = phone
+            extra_env["ACS_SOURCE_NUMBER"] = phone
+        if target:
+            extra["voice_target_number"] = target
+            extra_env["VOICE_TARGET_NUMBER"] = target
+
         self._persist_config(
             voice_rg, location, acs_name, conn_str,
             aoai_name, aoai_endpoint, aoai_key, aoai_deployment, steps,
+            extra=extra, extra_env=extra_env,
         )
-
-        phone = body.get("phone_number", "").strip()
         if phone:
-            self._store.save_voice_call(acs_source_number=phone)
-            cfg.write_env(ACS_SOURCE_NUMBER=phone)
             steps.append({"step": "phone_number", "status": "ok", "name": phone})
-
-        target = body.get("target_number", "").strip()
         if target:
-            self._store.save_voice_call(voice_target_number=target)
-            cfg.write_env(VOICE_TARGET_NUMBER=target)
             steps.append({"step": "target_number", "status": "ok", "name": target})
 
+        self._invalidate_discovery(aoai_name, aoai_rg)
         logger.info("Voice connect completed: acs=%s, aoai=%s", acs_name, aoai_name)
 
         reinit = req.app.get("_reinit_voice")
         if reinit:
             reinit()
 
-        return web.json_response({
+        return json_response({
             "status": "ok",
             "steps": steps,
             "message": "Connected to existing Azure resources.",
@@ -459,10 +499,53 @@ class VoiceSetupRoutes:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    async def _attach_deployments(self, resources: list[dict]) -> None:
+        """Fan out one deployment listing per resource (bounded by the ``az`` pool)."""
+        results = await asyncio.gather(*(
+            run_az_sync(
+                self._az.json_cached,
+                *_deployment_list_args(r["name"], r["resource_group"]),
+                ttl=_DISCOVERY_TTL,
+                failure_ttl=0,
+            )
+            for r in resources
+        ))
+        for r, deployments in zip(resources, results):
+            r["deployments"] = (
+                [_deployment_entry(d) for d in deployments] if isinstance(deployments, list) else []
+            )
+
+    async def _acs_connection_string(self, name: str, rg: str) -> str:
+        cached = self._conn_str_cache.get((name, rg))
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        keys = await run_az_sync(
+            self._az.json, "communication", "list-key",
+            "--name", name, "--resource-group", rg,
+        )
+        conn_str = keys.get("primaryConnectionString", "") if isinstance(keys, dict) else ""
+        if conn_str:
+            self._conn_str_cache[(name, rg)] = (time.monotonic() + _CONN_STR_TTL, conn_str)
+        return conn_str
+
+    def _invalidate_discovery(self, aoai_name: str, aoai_rg: str) -> None:
+        self._az.invalidate_cache(*_AOAI_LIST_ARGS)
+        self._az.invalidate_cache(*_ACS_LIST_ARGS)
+        if aoai_name and aoai_rg:
+            self._az.invalidate_cache(*_deployment_list_args(aoai_name, aoai_rg))
+
     async def _ensure_rbac(
         self, aoai_name: str, rg: str, steps: list[dict],
     ) -> None:
-        account = self._az.account_info()
+        account, user_info, aoai_info = await asyncio.gather(
+            run_az_sync(self._az.account_info),
+            run_az_sync(self._az.json, "ad", "signed-in-user", "show", quiet=True),
+            run_az_sync(
+                self._az.json, "cognitiveservices", "account", "show",
+                "--name", aoai_name, "--resource-group", rg,
+            ),
+        )
         if not account:
             steps.append({
                 "step": "rbac_assign", "status": "skip",
@@ -473,16 +556,13 @@ class VoiceSetupRoutes:
         principal_id = ""
         principal_type = "User"
 
-        user_info = await run_sync(
-            functools.partial(self._az.json, "ad", "signed-in-user", "show", quiet=True),
-        )
         if isinstance(user_info, dict) and user_info.get("id"):
             principal_id = user_info["id"]
         else:
             sp_id = account.get("user", {}).get("name", "")
             if sp_id:
-                sp_info = await run_sync(
-                    functools.partial(self._az.json, "ad", "sp", "show", "--id", sp_id, quiet=True),
+                sp_info = await run_az_sync(
+                    self._az.json, "ad", "sp", "show", "--id", sp_id, quiet=True,
                 )
                 if isinstance(sp_info, dict) and sp_info.get("id"):
                     principal_id = sp_info["id"]
@@ -495,10 +575,6 @@ class VoiceSetupRoutes:
             })
             return
 
-        aoai_info = await run_sync(
-            self._az.json, "cognitiveservices", "account", "show",
-            "--name", aoai_name, "--resource-group", rg,
-        )
         scope = aoai_info.get("id", "") if isinstance(aoai_info, dict) else ""
         if not scope:
             steps.append({
@@ -509,7 +585,7 @@ class VoiceSetupRoutes:
 
         role = "5e0bd9bd-7b93-4f28-af87-19fc36ad61bd"
         logger.info("Assigning Cognitive Services OpenAI User role: principal=%s", principal_id)
-        ok, msg = await run_sync(
+        ok, msg = await run_az_sync(
             self._az.ok, "role", "assignment", "create",
             "--assignee-object-id", principal_id,
             "--assignee-principal-type", principal_type,
@@ -527,22 +603,29 @@ class VoiceSetupRoutes:
             logger.warning("RBAC role assignment failed (non-fatal): %s", msg)
 
     async def _ensure_rg(self, rg: str, location: str, steps: list[dict]) -> bool:
-        existing = await run_sync(self._az.json, "group", "show", "--name", rg)
+        if self._rg_exists.get(rg, 0.0) > time.monotonic():
+            steps.append({"step": "resource_group", "status": "ok", "name": f"{rg} (existing)"})
+            return True
+
+        existing = await run_az_sync(self._az.json, "group", "show", "--name", rg)
         if existing:
+            self._rg_exists[rg] = time.monotonic() + _RG_CACHE_TTL
             steps.append({"step": "resource_group", "status": "ok", "name": f"{rg} (existing)"})
             return True
 
-        result = await run_sync(
+        result = await run_az_sync(
             self._az.json, "group", "create", "--name", rg, "--location", location,
         )
         steps.append({"step": "resource_group", "status": "ok" if result else "failed", "name": rg})
         if not result:
             logger.error("Voice deploy FAILED at resource group creation: %s", self._az.last_stderr)
-        return bool(result)
+            return False
+        self._rg_exists[rg] = time.monotonic() + _RG_CACHE_TTL
+        return True
 
     async def _create_acs(self, rg: str, steps: list[dict]) -> tuple[str, str]:
-        acs_name = f"polyclaw-acs-{secrets.token_hex(4)}"
-        acs = await run_sync(
+        acs_name = _ACS_PREFIX + secrets.token_hex(_NAME_SUFFIX_BYTES)
+        acs = await run_az_sync(
             self._az.json, "communication", "create",
             "--name", acs_name, "--location", "Global",
             "--data-location", "United States", "--resource-group", rg,
@@ -552,11 +635,7 @@ class VoiceSetupRoutes:
             logger.error("Voice deploy FAILED at ACS creation: %s", self._az.last_stderr)
             return "", ""
 
-        keys = await run_sync(
-            self._az.json, "communication", "list-key",
-            "--name", acs_name, "--resource-group", rg,
-        )
-        conn_str = keys.get("primaryConnectionString", "") if isinstance(keys, dict) else ""
+        conn_str = await self._acs_connection_string(acs_name, rg)
         steps.append({"step": "acs_keys", "status": "ok" if conn_str else "failed"})
         if not conn_str:
             logger.error("Voice deploy FAILED retrieving ACS keys: %s", self._az.last_stderr)
@@ -566,10 +645,10 @@ class VoiceSetupRoutes:
     async def _create_aoai(
         self, rg: str, location: str, steps: list[dict],
     ) -> tuple[str, str, str, str]:
-        aoai_name = f"polyclaw-aoai-{secrets.token_hex(4)}"
+        aoai_name = _AOAI_PREFIX + secrets.token_hex(_NAME_SUFFIX_BYTES)
         deployment_name = "gpt-realtime-mini"
 
-        aoai = await run_sync(
+        aoai = await run_az_sync(
             self._az.json, "cognitiveservices", "account", "create",
             "--name", aoai_name, "--resource-group", rg,
             "--location", location, "--kind", "OpenAI",
@@ -580,7 +659,7 @@ class VoiceSetupRoutes:
             logger.error("Voice deploy FAILED at AOAI creation: %s", self._az.last_stderr)
             return "", "", "", ""
 
-        dep = await run_sync(
+        dep = await run_az_sync(
             self._az.json, "cognitiveservices", "account", "deployment", "create",
             "--name", aoai_name, "--resource-group", rg,
             "--deployment-name", deployment_name,
@@ -594,7 +673,7 @@ class VoiceSetupRoutes:
             logger.error("Voice deploy FAILED at model deployment: %s", self._az.last_stderr)
             return aoai_name, "", "", ""
 
-        aoai_info = await run_sync(
+        aoai_info = await run_az_sync(
             self._az.json, "cognitiveservices", "account", "show",
             "--name", aoai_name, "--resource-group", rg,
         )
@@ -602,7 +681,7 @@ class VoiceSetupRoutes:
         if isinstance(aoai_info, dict):
             aoai_endpoint = aoai_info.get("properties", {}).get("endpoint", "")
 
-        aoai_keys = await run_sync(
+        aoai_keys = await run_az_sync(
             self._az.json, "cognitiveservices", "account", "keys", "list",
             "--name", aoai_name, "--resource-group", rg,
         )
@@ -631,7 +710,15 @@ class VoiceSetupRoutes:
         aoai_key: str,
         deployment_name: str,
         steps: list[dict],
+        *,
+        extra: dict[str, str] | None = None,
+        extra_env: dict[str, str] | None = None,
     ) -> None:
+        """Persist the voice config with one store save and one ``.env`` write.
+
+        *extra* / *extra_env* carry additional voice-call fields and env keys
+        (e.g. phone numbers) so callers never trigger a second write.
+        """
         self._store.save_voice_call(
             acs_resource_name=acs_name,
             acs_connection_string=conn_str,
@@ -642,30 +729,59 @@ class VoiceSetupRoutes:
             resource_group=voice_rg,
             voice_resource_group=voice_rg,
             location=location,
+            **(extra or {}),
         )
         callback_token = cfg.acs_callback_token
-        cfg.write_env(
-            ACS_CONNECTION_STRING=conn_str,
-            ACS_SOURCE_NUMBER="",
-            AZURE_OPENAI_ENDPOINT=aoai_endpoint,
-            AZURE_OPENAI_API_KEY=aoai_key,
-            AZURE_OPENAI_REALTIME_DEPLOYMENT=deployment_name,
-            ACS_CALLBACK_TOKEN=callback_token,
-        )
+        cfg.write_env(**{
+            "ACS_CONNECTION_STRING": conn_str,
+            "ACS_SOURCE_NUMBER": "",
+            "AZURE_OPENAI_ENDPOINT": aoai_endpoint,
+            "AZURE_OPENAI_API_KEY": aoai_key,
+            "AZURE_OPENAI_REALTIME_DEPLOYMENT": deployment_name,
+            "ACS_CALLBACK_TOKEN": callback_token,
+            **(extra_env or {}),
+        })
         steps.append({"step": "persist_config", "status": "ok"})
 
 
+def _deployment_list_args(name: str, rg: str) -> tuple[str, ...]:
+    return (
+        "cognitiveservices", "account", "deployment", "list",
+        "--name", name, "--resource-group", rg,
+    )
+
+
+def _field(data: Mapping[str, Any], key: str, default: str = "") -> str:
+    """Return the stripped string at *key*, or *default* when missing or not a string."""
+    value = data.get(key, default)
+    return value.strip() if isinstance(value, str) else default
+
+
+def _deployment_model(d: dict) -> Mapping[str, Any]:
+    return (d.get("properties") or _EMPTY).get("model") or _EMPTY
+
+
+def _deployment_entry(d: dict) -> dict[str, str]:
+    model = _deployment_model(d)
+    return {
+        "deployment_name": d.get("name", ""),
+        "model_name": model.get("name", ""),
+        "model_version": model.get("version", ""),
+        "model_format": model.get("format", ""),
+    }
+
+
 def _ok(message: str) -> web.Response:
-    return web.json_response({"status": "ok", "message": message})
+    return json_response({"status": "ok", "message": message})
 
 
 def _error(message: str, status: int = 500) -> web.Response:
-    return web.json_response({"status": "error", "message": message}, status=status)
+    return json_response({"status": "error", "message": message}, status=status)
 
 
 def _voice_fail(steps: list[dict]) -> web.Response:
-    failed = [s for s in steps if s.get("status") == "failed"]
-    msg = failed[0].get("name", "Unknown step") if failed else "Unknown error"
-    return web.json_response(
+    failed = next((s for s in steps if s.get("status") == "failed"), None)
+    msg = failed.get("name", "Unknown step") if failed else "Unknown error"
+    return json_response(
         {"status": "error", "steps": steps, "message": f"Voice deploy failed at: {msg}"},
     )
@@ -228,6 +228,11 @@ class SmokeTestRunner:
                 ).check(path)
                 if error:
                     problems.append(f"sessions/{path.name}: {error}")
+            for path in sessions_dir.glob("*.jsonl"):
+                checked += 1
+                error = _check_session_log(path)
+                if error:
+                    problems.append(f"sessions/{path.name}: {error}")
 
         if problems:
             self._step("state_files", False, "; ".join(problems))
@@ -238,6 +243,20 @@ class SmokeTestRunner:
             )
 
 
+def _check_session_log(path: Path) -> str | None:
+    """Validate the header line of a JSON Lines session log."""
+    try:
+        with path.open(encoding="utf-8") as f:
+            header = json.loads(f.readline())
+    except json.JSONDecodeError as exc:
+        return f"invalid header: {exc}"
+    except OSError as exc:
+        return f"read error: {exc}"
+    if not isinstance(header, dict) or "id" not in header:
+        return "header missing key 'id'"
+    return None
+
+
 class _StateFileValidator:
     """Lightweight JSON-file validator."""
 
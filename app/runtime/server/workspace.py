@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import stat
+import time
 from pathlib import Path
 from typing import Any
 
 from aiohttp import web
 
+from ..util.async_helpers import run_sync
+from .responses import json_response
+
 _MAX_PREVIEW_SIZE = 512 * 1024
+_SNIFF_SIZE = 8192
+_STREAM_CHUNK_SIZE = 64 * 1024
+_MAX_CONCURRENT_IO = 64
+_LIST_CACHE_TTL = 2.0
+_LIST_CACHE_MAX = 256
+# Formats whose sniffed head may not contain a NUL byte but is never text.
+_BINARY_MAGICS = (b"\x89PNG", b"PK\x03\x04", b"%PDF-", b"\x7fELF", b"GIF8", b"\xff\xd8\xff")
+_TEXT_SUFFIXES = frozenset({".md", ".txt", ".py", ".json", ".jsonl", ".yaml", ".yml", ".log"})
 
 
 class WorkspaceHandler:
@@ -18,6 +32,14 @@ class WorkspaceHandler:
         "data": Path(os.getenv("POLYCLAW_DATA_DIR", str(Path.home() / ".polyclaw"))),
     }
 
+    def __init__(self) -> None:
+        # Short-lived listing cache, including negative (unreadable) results.
+        self._list_cache: dict[Path, tuple[float, list[dict[str, Any]] | None]] = {}
+        # Caps concurrent blocking file work (and therefore open descriptors).
+        self._io_sem = asyncio.BoundedSemaphore(_MAX_CONCURRENT_IO)
+        # Roots are fixed for the handler's lifetime; resolve each one once.
+        self._resolved_roots: dict[Path, str] = {}
+
     def register(self, router: web.UrlDispatcher) -> None:
         router.add_get("/api/workspace/list", self.list_dir)
         router.add_get("/api/workspace/read", self.read_file)
@@ -26,62 +48,70 @@ class WorkspaceHandler:
         rel = req.query.get("path", "data") or "data"
         target = self._resolve(rel)
         if target is None or not target.is_dir():
-            return web.json_response(
+            return json_response(
                 {"status": "error", "message": "Invalid directory"}, status=400
             )
 
         root_key, root = self._root_for(rel)
-        try:
-            children = sorted(
-                target.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower())
-            )
-            entries = [
-                self._entry(c, root_key, root)
-                for c in children
-                if c.name != "__pycache__"
-            ]
-        except PermissionError:
-            return web.json_response(
+        cached = self._list_cache.get(target)
+        if cached is not None and time.monotonic() - cached[0] < _LIST_CACHE_TTL:
+            entries = cached[1]
+        else:
+            async with self._io_sem:
+                entries = await run_sync(self._scan_dir, target, root_key, root)
+            if len(self._list_cache) >= _LIST_CACHE_MAX:
+                self._list_cache.clear()
+            self._list_cache[target] = (time.monotonic(), entries)
+        if entries is None:
+            return json_response(
                 {"status": "error", "message": "Permission denied"}, status=403
             )
-        return web.json_response({"status": "ok", "path": rel, "entries": entries})
+        return json_response({"status": "ok", "path": rel, "entries": entries})
 
-    async def read_file(self, req: web.Request) -> web.Response:
+    async def read_file(self, req: web.Request) -> web.StreamResponse:
         rel = req.query.get("path", "")
         if not rel:
-            return web.json_response(
+            return json_response(
                 {"status": "error", "message": "path required"}, status=400
             )
 
         target = self._resolve(rel)
-        if target is None or not target.is_file():
-            return web.json_response(
+        if target is None:
+            return json_response(
                 {"status": "error", "message": "File not found"}, status=404
             )
 
+        plain = _wants_plain_text(req)
         try:
-            size = target.stat().st_size
-        except OSError:
-            return web.json_response(
-                {"status": "error", "message": "Cannot stat file"}, status=500
+            async with self._io_sem:
+                if plain:
+                    preview = await run_sync(self._read_preview, target, plain=True)
+                else:
+                    preview = await run_sync(self._read_text_preview, target)
+        except OSError as exc:
+            return json_response(
+                {"status": "error", "message": str(exc)}, status=500
+            )
+        if preview is None:
+            return json_response(
+                {"status": "error", "message": "File not found"}, status=404
             )
 
-        if self._is_binary(target):
-            return web.json_response(
+        size, content = preview
+        if content is None:
+            return json_response(
                 {"status": "ok", "path": rel, "binary": True, "size": size, "content": None}
             )
 
         truncated = size > _MAX_PREVIEW_SIZE
-        try:
-            content = target.read_text(errors="replace")
-            if truncated:
-                content = content[:_MAX_PREVIEW_SIZE]
-        except OSError as exc:
-            return web.json_response(
-                {"status": "error", "message": str(exc)}, status=500
-            )
-
-        return web.json_response({
+        if plain:
+            headers = {"Content-Type": "text/plain; charset=utf-8"}
+            if not truncated:
+                # Served with sendfile(); the file never passes through Python.
+                return web.FileResponse(target, chunk_size=_STREAM_CHUNK_SIZE, headers=headers)
+            return web.Response(body=content, headers={**headers, "X-Preview-Truncated": "1"})
+
+        return json_response({
             "status": "ok",
             "path": rel,
             "binary": False,
@@ -90,6 +120,36 @@ class WorkspaceHandler:
             "content": content,
         })
 
+    @classmethod
+    def _read_preview(cls, target: Path, *, plain: bool) -> tuple[int, bytes | None] | None:
+        """Stat, sniff and read the preview head of *target* in one blocking call.
+
+        Returns ``None`` if *target* is not a regular file and ``(size, None)``
+        for binaries. Plain-text previews that fit are streamed later, so
+        their head is not read here.
+        """
+        try:
+            st = target.stat()
+        except FileNotFoundError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        size = st.st_size
+        if cls._is_binary(target, size):
+            return size, None
+        if plain and size <= _MAX_PREVIEW_SIZE:
+            return size, b""
+        with open(target, "rb") as f:
+            return size, f.read(_MAX_PREVIEW_SIZE)
+
+    @classmethod
+    def _read_text_preview(cls, target: Path) -> tuple[int, str | None] | None:
+        preview = cls._read_preview(target, plain=False)
+        if preview is None:
+            return None
+        size, head = preview
+        return size, None if head is None else head.decode("utf-8", errors="replace")
+
     def _resolve(self, rel: str) -> Path | None:
         if not rel or rel == ".":
             return None
@@ -102,7 +162,11 @@ class WorkspaceHandler:
             target = (root / sub).resolve()
         except (ValueError, OSError):
             return None
-        if not str(target).startswith(str(root.resolve())):
+        root_str = self._resolved_roots.get(root)
+        if root_str is None:
+            root_str = self._resolved_roots[root] = str(root.resolve())
+        target_str = str(target)
+        if target_str != root_str and not target_str.startswith(root_str + os.sep):
             return None
         return target
 
@@ -110,14 +174,24 @@ class WorkspaceHandler:
         key = rel.split("/", 1)[0]
         return key, self.ROOTS[key]
 
+    @classmethod
+    def _scan_dir(cls, target: Path, root_key: str, root: Path) -> list[dict[str, Any]] | None:
+        """List *target* (blocking); ``None`` when the directory is unreadable."""
+        prefix = target.relative_to(root)
+        try:
+            with os.scandir(target) as it:
+                children = [e for e in it if e.name != "__pycache__"]
+            children.sort(key=lambda e: (not e.is_dir(), e.name.lower()))
+            return [cls._entry(c, root_key + "/" + str(prefix / c.name)) for c in children]
+        except PermissionError:
+            return None
+
     @staticmethod
-    def _entry(child: Path, root_key: str, root: Path) -> dict[str, Any]:
-        entry: dict[str, Any] = {
-            "name": child.name,
-            "path": root_key + "/" + str(child.relative_to(root)),
-            "is_dir": child.is_dir(),
-        }
-        if not child.is_dir():
+    def _entry(child: os.DirEntry[str], path: str) -> dict[str, Any]:
+        # DirEntry caches the dirent type and stat result, so each child costs one stat at most.
+        is_dir = child.is_dir()
+        entry: dict[str, Any] = {"name": child.name, "path": path, "is_dir": is_dir}
+        if not is_dir:
             try:
                 entry["size"] = child.stat().st_size
             except OSError:
@@ -125,9 +199,17 @@ class WorkspaceHandler:
         return entry
 
     @staticmethod
-    def _is_binary(path: Path) -> bool:
+    def _is_binary(path: Path, size: int) -> bool:
+        if size == 0 or path.suffix.lower() in _TEXT_SUFFIXES:
+            return False
         try:
             with open(path, "rb") as f:
-                return b"\x00" in f.read(8192)
+                head = f.read(min(size, _SNIFF_SIZE))
+            return head.startswith(_BINARY_MAGICS) or b"\x00" in head
         except OSError:
             return True
+
+
+def _wants_plain_text(req: web.Request) -> bool:
+    """True when the client asked for the raw preview (``Accept: text/plain``)."""
+    return req.headers.get("Accept", "").split(",", 1)[0].strip().startswith("text/plain")
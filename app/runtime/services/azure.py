@@ -13,6 +13,8 @@ from time import sleep
 from time import time as _time
 from typing import Any
 
+import orjson
+
 from ..config.settings import cfg
 from ..util.result import Result
 
@@ -23,6 +25,8 @@ class AzureCLI:
     """Thin wrapper around ``az`` with JSON output parsing."""
 
     CACHE_TTL = 30
+    ACCOUNT_CACHE_TTL = 300
+    STATUS_CACHE_TTL = 5
     HEARTBEAT_INTERVAL = 15
     TIMEOUT = 1200
 
@@ -94,12 +98,19 @@ class AzureCLI:
             return None
         _log("[az] OK (%.1fs): az %s", elapsed, cmd_summary)
         try:
-            return json.loads(result.stdout)
-        except (json.JSONDecodeError, ValueError):
+            return orjson.loads(result.stdout)
+        except orjson.JSONDecodeError:
             logger.warning("[az] could not parse JSON output for: az %s", cmd_summary)
             return None
 
-    def json_cached(self, *args: str, ttl: int | None = None) -> dict | list | None:
+    def json_cached(
+        self, *args: str, ttl: int | None = None, failure_ttl: int | None = None,
+    ) -> dict | list | None:
+        """Run ``az`` once per *ttl* seconds for the same *args*.
+
+        A failed call (``None``) is kept for *failure_ttl* seconds instead
+        when given; ``0`` leaves failures uncached.
+        """
         ttl = ttl if ttl is not None else self.CACHE_TTL
         key = " ".join(args)
         cached = self._cache.get(key)
@@ -109,7 +120,12 @@ class AzureCLI:
                 logger.debug("[az] cache hit (ttl %ds): az %s", ttl, key)
                 return value
         result = self.json(*args, quiet=True)
-        self._cache[key] = (_time() + ttl, result)
+        if result is None and failure_ttl is not None:
+            ttl = failure_ttl
+        if ttl > 0:
+            self._cache[key] = (_time() + ttl, result)
+        else:
+            self._cache.pop(key, None)
         return result
 
     def invalidate_cache(self, *args: str) -> None:
@@ -135,7 +151,10 @@ class AzureCLI:
         return Result(success=success, message=result.stderr.strip())
 
     def account_info(self) -> dict[str, Any] | None:
-        account = self.json_cached("account", "show")
+        # Only a signed-in account is worth the long TTL; retry failures sooner.
+        account = self.json_cached(
+            "account", "show", ttl=self.ACCOUNT_CACHE_TTL, failure_ttl=self.CACHE_TTL,
+        )
         return account if isinstance(account, dict) else None
 
     def login_device_code(self) -> dict[str, Any]:
@@ -185,7 +204,7 @@ class AzureCLI:
         name = cfg.env.read("BOT_NAME")
         if not (rg and name):
             return {}
-        bot_info = self.json("bot", "show", "--resource-group", rg, "--name", name)
+        bot_info = self.json_cached(*bot_show_args(rg, name), ttl=self.STATUS_CACHE_TTL)
         if bot_info:
             props = bot_info.get("properties", {})
             configured = props.get("configuredChannels") or props.get("enabledChannels") or []
@@ -264,6 +283,7 @@ class AzureCLI:
         name = cfg.env.read("BOT_NAME")
         if not (rg and name):
             return Result.fail("Bot not deployed")
+        self.invalidate_cache(*bot_show_args(rg, name))
         self.ok("bot", "telegram", "delete", "--resource-group", rg, "--name", name)
         result = self.ok(
             "bot", "telegram", "create", "--resource-group", rg, "--name", name,
@@ -276,5 +296,11 @@ class AzureCLI:
         name = cfg.env.read("BOT_NAME")
         if not (rg and name):
             return Result.fail("Bot not deployed")
+        self.invalidate_cache(*bot_show_args(rg, name))
         result = self.ok("bot", channel, "delete", "--resource-group", rg, "--name", name)
         return Result.ok(f"{channel} removed") if result else result
+
+
+def bot_show_args(rg: str, name: str) -> tuple[str, ...]:
+    """``az`` arguments for ``bot show``; shared so cached results can be invalidated."""
+    return ("bot", "show", "--resource-group", rg, "--name", name)
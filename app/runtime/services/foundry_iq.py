@@ -2,23 +2,72 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..config.settings import cfg
 from ..state.foundry_iq_config import FoundryIQConfigStore, get_foundry_iq_config
+from ..util.singletons import register_singleton
 
 logger = logging.getLogger(__name__)
 
 SEARCH_API_VERSION = "2024-07-01"
+EMBEDDING_BATCH_SIZE = 16
+UPLOAD_BATCH_SIZE = 100
+UPLOAD_WORKERS = 4
+
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\n+")
+
+# One keep-alive pool for the search and embedding endpoints; also retries throttling.
+# Read timeouts are not retried, so a request never blocks past its own timeout.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        connect=1,
+        read=0,
+        other=0,
+        status=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 503),
+        allowed_methods=frozenset({"GET", "PUT", "POST", "DELETE"}),
+        raise_on_status=False,
+    ),
+))
+
+_COGNITIVE_SCOPE = "https://cognitiveservices.azure.com/.default"
+_TOKEN_REFRESH_SKEW = 60
+
+# Building DefaultAzureCredential probes every credential source, so keep one
+# instance and its token until shortly before expiry.
+_token_lock = threading.Lock()
+_credential: Any = None
+_token: str | None = None
+_token_expires: float = 0.0
 
 
 def _get_embedding(text: str, config: FoundryIQConfigStore) -> list[float]:
+    return _get_embeddings([text], config)[0]
+
+
+def _get_embeddings(texts: list[str], config: FoundryIQConfigStore) -> list[list[float]]:
+    """Embed *texts* in one request; results are returned in input order."""
     c = config.config
     url = (
         f"{c.embedding_endpoint.rstrip('/')}/openai/deployments/"
@@ -30,16 +79,37 @@ def _get_embedding(text: str, config: FoundryIQConfigStore) -> list[float]:
     else:
         headers["Authorization"] = f"Bearer {_get_entra_token()}"
 
-    resp = requests.post(url, headers=headers, json={"input": text, "model": c.embedding_model}, timeout=30)
+    resp = _SESSION.post(
+        url, headers=headers,
+        data=orjson.dumps({"input": texts, "model": c.embedding_model}), timeout=30,
+    )
     resp.raise_for_status()
-    return resp.json()["data"][0]["embedding"]
+    # Responses carry thousands of floats per input; orjson parses them far faster.
+    data = sorted(orjson.loads(resp.content)["data"], key=lambda d: d.get("index", 0))
+    return [d["embedding"] for d in data]
 
 
 def _get_entra_token() -> str:
-    from azure.identity import DefaultAzureCredential  # type: ignore[import-untyped]
+    global _credential, _token, _token_expires
+    with _token_lock:
+        if _token and time.time() < _token_expires - _TOKEN_REFRESH_SKEW:
+            return _token
+        if _credential is None:
+            from azure.identity import DefaultAzureCredential  # type: ignore[import-untyped]
+
+            _credential = DefaultAzureCredential()
+        access = _credential.get_token(_COGNITIVE_SCOPE)
+        _token, _token_expires = access.token, access.expires_on
+        return _token
+
 
-    credential = DefaultAzureCredential()
-    return credential.get_token("https://cognitiveservices.azure.com/.default").token
+def _reset_entra_token() -> None:
+    global _credential, _token, _token_expires
+    with _token_lock:
+        _credential, _token, _token_expires = None, None, 0.0
+
+
+register_singleton(_reset_entra_token)
 
 
 def _search_headers(config: FoundryIQConfigStore) -> dict[str, str]:
@@ -88,11 +158,13 @@ def ensure_index(config: FoundryIQConfigStore | None = None) -> dict[str, Any]:
 
     url = _search_url(config, f"indexes/{c.index_name}")
     try:
-        resp = requests.put(url, headers=_search_headers(config), json=index_def, timeout=30)
+        resp = _SESSION.put(
+            url, headers=_search_headers(config), data=orjson.dumps(index_def), timeout=30,
+        )
     except Exception as exc:
         return {"status": "error", "message": f"Failed to connect to search service: {exc}", "detail": str(exc), "url": url}
     if resp.status_code in (200, 201, 204):
-        return {"status": "ok", "index": c.index_name}
+        return {"status": "ok", "index": c.index_name, "created": resp.status_code == 201}
     try:
         body = resp.json()
     except Exception:
@@ -103,13 +175,14 @@ def ensure_index(config: FoundryIQConfigStore | None = None) -> dict[str, Any]:
 def delete_index(config: FoundryIQConfigStore | None = None) -> dict[str, Any]:
     config = config or get_foundry_iq_config()
     try:
-        resp = requests.delete(
+        resp = _SESSION.delete(
             _search_url(config, f"indexes/{config.config.index_name}"),
             headers=_search_headers(config), timeout=30,
         )
     except Exception as exc:
         return {"status": "error", "message": f"Connection failed: {exc}"}
     if resp.status_code in (200, 204):
+        config.set_last_indexed("")
         return {"status": "ok"}
     return {"status": "error", "message": f"Delete failed (HTTP {resp.status_code}): {resp.text[:300]}"}
 
@@ -119,7 +192,7 @@ def get_index_stats(config: FoundryIQConfigStore | None = None) -> dict[str, Any
     if not config.is_configured:
         return {"status": "ok", "document_count": 0, "storage_size": 0, "index_missing": True}
     try:
-        resp = requests.get(
+        resp = _SESSION.get(
             _search_url(config, f"indexes/{config.config.index_name}/stats"),
             headers=_search_headers(config), timeout=15,
         )
@@ -135,40 +208,65 @@ def get_index_stats(config: FoundryIQConfigStore | None = None) -> dict[str, Any
 
 def _discover_memory_files() -> list[dict[str, str]]:
     files: list[dict[str, str]] = []
-    daily_dir = cfg.memory_daily_dir
-    if daily_dir.is_dir():
-        for f in sorted(daily_dir.glob("*.md")):
-            files.append({"path": str(f), "title": f"Daily Log - {f.stem}", "source_type": "daily", "date": f.stem})
-    topics_dir = cfg.memory_topics_dir
-    if topics_dir.is_dir():
-        for f in sorted(topics_dir.glob("*.md")):
-            files.append({
-                "path": str(f),
-                "title": f"Topic - {f.stem.replace('-', ' ').title()}",
-                "source_type": "topic", "date": "",
-            })
+    for path, stem in _markdown_files(cfg.memory_daily_dir):
+        files.append({
+            "path": path,
+            "title": f"Daily Log - {stem}",
+            "source_type": "daily", "date": stem,
+        })
+    for path, stem in _markdown_files(cfg.memory_topics_dir):
+        files.append({
+            "path": path,
+            "title": f"Topic - {stem.replace('-', ' ').title()}",
+            "source_type": "topic", "date": "",
+        })
     return files
 
 
+def _markdown_files(directory: Path) -> list[tuple[str, str]]:
+    """``(path, stem)`` for each ``*.md`` file in *directory*, sorted by name."""
+    try:
+        with os.scandir(directory) as it:
+            entries = [
+                e for e in it
+                if e.name.endswith(".md") and not e.name.startswith(".") and e.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    entries.sort(key=lambda e: e.name)
+    return [(e.path, e.name[:-3]) for e in entries]
+
+
+def _parse_timestamp(value: str) -> float:
+    """Epoch seconds for an ISO timestamp; 0 when unset or malformed."""
+    try:
+        return datetime.fromisoformat(value).timestamp() if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+@functools.lru_cache(maxsize=4096)
 def _file_to_doc_id(path: str) -> str:
-    return hashlib.md5(path.encode()).hexdigest()
+    return hashlib.md5(path.encode(), usedforsecurity=False).hexdigest()
 
 
 def _chunk_text(text: str, max_chars: int = 4000) -> list[str]:
     if len(text) <= max_chars:
         return [text]
     chunks: list[str] = []
-    paragraphs = text.split("\n\n")
-    current = ""
-    for para in paragraphs:
-        if len(current) + len(para) + 2 > max_chars:
+    current: list[str] = []
+    current_len = 0
+    for para in _PARAGRAPH_BREAK_RE.split(text):
+        if current_len + len(para) + 2 > max_chars:
             if current:
-                chunks.append(current.strip())
-            current = para
+                chunks.append("\n\n".join(current).strip())
+            current, current_len = [para], len(para)
         else:
-            current = current + "\n\n" + para if current else para
-    if current.strip():
-        chunks.append(current.strip())
+            current_len += len(para) + (2 if current else 0)
+            current.append(para)
+    tail = "\n\n".join(current).strip()
+    if tail:
+        chunks.append(tail)
     return chunks if chunks else [text[:max_chars]]
 
 
@@ -195,51 +293,94 @@ def index_memories(config: FoundryIQConfigStore | None = None) -> dict[str, Any]
     if not files:
         return {"status": "ok", "indexed": 0, "message": "No memory files found"}
 
-    documents: list[dict[str, Any]] = []
+    # A freshly created index is empty, so everything must be (re)uploaded.
+    since = 0.0 if idx_result.get("created") else _parse_timestamp(config.config.last_indexed_at)
+    pending: list[tuple[dict[str, str], int, str]] = []
     errors: list[str] = []
+    skipped = 0
     now = datetime.now(UTC).isoformat()
 
     for file_info in files:
         try:
-            content = Path(file_info["path"]).read_text(errors="replace")
-            if not content.strip():
+            if os.stat(file_info["path"]).st_mtime <= since:
+                skipped += 1
                 continue
-            chunks = _chunk_text(content)
-            for i, chunk in enumerate(chunks):
-                doc_id = _file_to_doc_id(file_info["path"]) + (f"-{i}" if i > 0 else "")
-                try:
-                    embedding = _get_embedding(chunk, config)
-                except Exception as exc:
-                    errors.append(f"Embedding failed for {file_info['path']}[{i}]: {exc}")
-                    continue
-                documents.append({
-                    "@search.action": "mergeOrUpload", "id": doc_id, "content": chunk,
-                    "title": file_info["title"], "source_type": file_info["source_type"],
-                    "source_path": file_info["path"], "date": file_info["date"],
-                    "indexed_at": now, "content_vector": embedding,
-                })
+            content = Path(file_info["path"]).read_text(errors="replace")
         except Exception as exc:
             errors.append(f"Failed to read {file_info['path']}: {exc}")
+            continue
+        if not content.strip():
+            continue
+        for i, chunk in enumerate(_chunk_text(content)):
+            pending.append((file_info, i, chunk))
+
+    documents: list[dict[str, Any]] = []
+    for start in range(0, len(pending), EMBEDDING_BATCH_SIZE):
+        group = pending[start:start + EMBEDDING_BATCH_SIZE]
+        try:
+            embeddings = _get_embeddings([chunk for _, _, chunk in group], config)
+        except Exception as exc:
+            errors.extend(f"Embedding failed for {f['path']}[{i}]: {exc}" for f, i, _ in group)
+            continue
+        for (file_info, i, chunk), embedding in zip(group, embeddings):
+            doc_id = _file_to_doc_id(file_info["path"]) + (f"-{i}" if i > 0 else "")
+            documents.append({
+                "@search.action": "mergeOrUpload", "id": doc_id, "content": chunk,
+                "title": file_info["title"], "source_type": file_info["source_type"],
+                "source_path": file_info["path"], "date": file_info["date"],
+                "indexed_at": now, "content_vector": embedding,
+            })
 
     if not documents:
-        return {"status": "ok", "indexed": 0, "message": "No documents to index", "errors": errors}
+        if not errors:
+            config.set_last_indexed(now)
+        return {
+            "status": "ok", "indexed": 0, "skipped": skipped,
+            "message": "No documents to index", "errors": errors,
+        }
 
+    batches = [
+        documents[start:start + UPLOAD_BATCH_SIZE]
+        for start in range(0, len(documents), UPLOAD_BATCH_SIZE)
+    ]
     indexed = 0
-    batch_size = 100
-    for start in range(0, len(documents), batch_size):
-        batch = documents[start:start + batch_size]
-        resp = requests.post(
-            _search_url(config, f"indexes/{config.config.index_name}/docs/index"),
-            headers=_search_headers(config), json={"value": batch}, timeout=60,
-        )
-        if resp.ok:
-            result = resp.json()
-            indexed += sum(1 for r in result.get("value", []) if r.get("statusCode") in (200, 201))
-        else:
-            errors.append(f"Batch upload failed: {resp.status_code} {resp.text[:200]}")
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="fiq-upload") as pool:
+        for count, error in pool.map(lambda batch: _upload_batch(batch, config), batches):
+            indexed += count
+            if error:
+                errors.append(error)
+
+    # Files that failed must not fall behind the watermark, or they would be skipped next run.
+    if not errors:
+        config.set_last_indexed(now)
+    return {
+        "status": "ok", "indexed": indexed, "skipped": skipped, "total_files": len(files),
+        "total_chunks": len(documents), "errors": errors,
+    }
 
-    config.set_last_indexed(now)
-    return {"status": "ok", "indexed": indexed, "total_files": len(files), "total_chunks": len(documents), "errors": errors}
+
+def _upload_batch(
+    batch: list[dict[str, Any]], config: FoundryIQConfigStore,
+) -> tuple[int, str | None]:
+    """Upload one document batch; returns (documents accepted, error message)."""
+    resp = _SESSION.post(
+        _search_url(config, f"indexes/{config.config.index_name}/docs/index"),
+        headers=_search_headers(config), data=orjson.dumps({"value": batch}), timeout=60,
+    )
+    if not resp.ok:
+        return 0, f"Batch upload failed: {resp.status_code} {resp.text[:200]}"
+    items = resp.json().get("value", [])
+    # A 207 reports per-document failures; any of them must hold back the watermark.
+    failed = [
+        r for r in items if not r.get("status", True) or r.get("statusCode") not in (200, 201)
+    ]
+    if not failed:
+        return len(items), None
+    first = failed[0]
+    return len(items) - len(failed), (
+        f"{len(failed)} of {len(items)} documents failed to index: "
+        f"{first.get('key', '?')}: {first.get('errorMessage') or first.get('statusCode')}"
+    )
 
 
 def search_memories(query: str, top: int = 5, config: FoundryIQConfigStore | None = None) -> dict[str, Any]:
@@ -261,9 +402,9 @@ def search_memories(query: str, top: int = 5, config: FoundryIQConfigStore | Non
         "vectorQueries": [{"kind": "vector", "vector": query_vector, "fields": "content_vector", "k": top}],
     }
 
-    resp = requests.post(
+    resp = _SESSION.post(
         _search_url(config, f"indexes/{config.config.index_name}/docs/search"),
-        headers=_search_headers(config), json=search_body, timeout=30,
+        headers=_search_headers(config), data=orjson.dumps(search_body), timeout=30,
     )
     if not resp.ok:
         return {"status": "error", "message": f"Search failed: {resp.status_code} {resp.text[:200]}"}
@@ -283,7 +424,9 @@ def search_memories(query: str, top: int = 5, config: FoundryIQConfigStore | Non
 def test_search_connection(config: FoundryIQConfigStore | None = None) -> dict[str, Any]:
     config = config or get_foundry_iq_config()
     try:
-        resp = requests.get(_search_url(config, "indexes"), headers=_search_headers(config), timeout=10)
+        resp = _SESSION.get(
+            _search_url(config, "indexes"), headers=_search_headers(config), timeout=10,
+        )
         if resp.ok:
             indexes = resp.json().get("value", [])
             return {"status": "ok", "message": f"Connected. {len(indexes)} index(es) found.", "indexes": [i["name"] for i in indexes]}
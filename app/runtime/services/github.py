@@ -11,6 +11,9 @@ from typing import Any
 
 from ..config.settings import cfg
 
+_DEVICE_CODE_RE = re.compile(r"one-time code:\s*(\S+)", re.IGNORECASE)
+_DEVICE_URL_RE = re.compile(r"(https://github\.com/login/device\S*)")
+
 
 class GitHubAuth:
     """Manages authentication via ``gh auth``."""
@@ -68,10 +71,10 @@ class GitHubAuth:
                     continue
                 stripped = raw.strip()
                 lines.append(stripped)
-                m_code = re.search(r"one-time code:\s*(\S+)", stripped, re.IGNORECASE)
+                m_code = _DEVICE_CODE_RE.search(stripped)
                 if m_code:
                     code = m_code.group(1)
-                m_url = re.search(r"(https://github\.com/login/device\S*)", stripped)
+                m_url = _DEVICE_URL_RE.search(stripped)
                 if m_url:
                     url = m_url.group(1)
             if proc.poll() is not None:
@@ -6,18 +6,23 @@ import logging
 import os
 import re
 import subprocess
+import threading
 import time
 import urllib.request
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
 KV_REF_PREFIX = "@kv:"
+RESOLVE_MAX_WORKERS = 8
 _KV_REF_RE = re.compile(r"^@kv:([a-zA-Z0-9-]{1,127})$")
 
 
 def is_kv_ref(value: str) -> bool:
-    return bool(_KV_REF_RE.match(value))
+    # The prefix test rejects ordinary values without running the regex.
+    return value.startswith(KV_REF_PREFIX) and _KV_REF_RE.match(value) is not None
 
 
 def make_ref(secret_name: str) -> str:
@@ -33,11 +38,22 @@ def secret_name_to_env_key(name: str) -> str:
 
 
 class KeyVaultClient:
+    SECRET_CACHE_TTL = 300
+
     def __init__(self) -> None:
         self._client: Any = None
         self._url: str | None = None
         self._initialised = False
+        # Serialises first use; resolve_many() fans out across threads.
+        self._init_lock = threading.Lock()
+        # Marks a thread that is inside _ensure_init; settings import re-enters it.
+        self._init_local = threading.local()
         self._ip_allowed = False
+        # Single-flights the allow-IP step so concurrent firewall errors open it once.
+        self._fw_lock = threading.Lock()
+        self._fw_attempts = 0
+        # Resolved secret values by name; config reloads re-resolve the same refs.
+        self._secret_cache: dict[str, tuple[float, str]] = {}
 
     @property
     def enabled(self) -> bool:
@@ -57,12 +73,12 @@ class KeyVaultClient:
         for attempt in range(max_retries):
             try:
                 self._client.set_secret(name, value)
+                self._secret_cache[name] = (time.monotonic() + self.SECRET_CACHE_TTL, value)
                 logger.info("Stored secret '%s' in Key Vault", name)
                 return make_ref(name)
             except Exception as exc:
                 if self._is_firewall_error(exc) and not self._ip_allowed:
-                    if self._allow_current_ip():
-                        self._ip_allowed = True
+                    if self._ensure_ip_allowed():
                         continue
                 if "ForbiddenByRbac" in str(exc) and attempt < max_retries - 1:
                     logger.warning("RBAC not propagated for '%s', retrying in %.0fs...", name, wait)
@@ -90,6 +106,7 @@ class KeyVaultClient:
     def delete(self, name: str) -> None:
         if not self.enabled:
             return
+        self._secret_cache.pop(name, None)
         try:
             self._client.begin_delete_secret(name).wait()
         except Exception:
@@ -108,15 +125,35 @@ class KeyVaultClient:
         return self.store(env_key_to_secret_name(env_key), value)
 
     def reinit(self) -> None:
-        self._initialised = False
-        self._client = None
-        self._url = None
-        self._ip_allowed = False
+        with self._init_lock:
+            self._initialised = False
+            self._client = None
+            self._url = None
+            self._ip_allowed = False
+            self._secret_cache.clear()
 
     def _ensure_init(self) -> None:
-        if self._initialised:
+        if self._initialised or getattr(self._init_local, "active", False):
+            # A nested call sees Key Vault as disabled until the outer one connects.
             return
-        self._initialised = True
+        self._init_local.active = True
+        try:
+            # Read outside the lock: importing settings may itself resolve refs via kv.
+            url = self._configured_url()
+            with self._init_lock:
+                if self._initialised:
+                    return
+                try:
+                    self._connect(url)
+                finally:
+                    # Only published once _url/_client are final, so a concurrent
+                    # caller never sees a half-initialised client as disabled.
+                    self._initialised = True
+        finally:
+            self._init_local.active = False
+
+    @staticmethod
+    def _configured_url() -> str:
         url = os.getenv("KEY_VAULT_URL", "").strip().rstrip("/")
         if not url:
             try:
@@ -124,6 +161,9 @@ class KeyVaultClient:
                 url = (cfg.env.read("KEY_VAULT_URL") or "").strip().rstrip("/")
             except Exception:
                 pass
+        return url
+
+    def _connect(self, url: str) -> None:
         if not url:
             return
         try:
@@ -145,21 +185,40 @@ class KeyVaultClient:
             "caller is not a trusted service",
         ))
 
-    def _get_secret(self, name: str, _fw_retries: int = 0) -> str:
+    def _get_secret(self, name: str) -> str:
+        cached = self._secret_cache.get(name)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        value = self._fetch_secret(name)
+        self._secret_cache[name] = (time.monotonic() + self.SECRET_CACHE_TTL, value)
+        return value
+
+    def _fetch_secret(self, name: str, _fw_retries: int = 0) -> str:
+        # Snapshot first: another thread may open the firewall while this request fails.
+        ip_allowed = self._ip_allowed
         try:
             return self._client.get_secret(name).value or ""
         except Exception as exc:
             if self._is_firewall_error(exc):
-                if not self._ip_allowed:
-                    if self._allow_current_ip():
-                        self._ip_allowed = True
-                        return self._get_secret(name)
+                if not ip_allowed:
+                    if self._ensure_ip_allowed():
+                        return self._fetch_secret(name)
                 elif _fw_retries < 2:
                     time.sleep(60)
-                    return self._get_secret(name, _fw_retries=_fw_retries + 1)
+                    return self._fetch_secret(name, _fw_retries=_fw_retries + 1)
             logger.error("Failed to resolve Key Vault secret '%s'", name)
             raise
 
+    def _ensure_ip_allowed(self) -> bool:
+        attempts = self._fw_attempts
+        with self._fw_lock:
+            # Callers that queued behind an attempt share its outcome instead
+            # of issuing overlapping vault updates.
+            if not self._ip_allowed and self._fw_attempts == attempts:
+                self._ip_allowed = self._allow_current_ip()
+                self._fw_attempts += 1
+            return self._ip_allowed
+
     def _allow_current_ip(self) -> bool:
         try:
             with urllib.request.urlopen("https://api.ipify.org", timeout=10) as resp:
@@ -221,3 +280,26 @@ def resolve_if_kv_ref(value: str) -> str:
             return ""
         return kv.resolve_value(value)
     return value
+
+
+def resolve_many(values: Iterable[str]) -> dict[str, str]:
+    """Resolve the distinct Key Vault references among *values* concurrently.
+
+    Returns a ``ref -> value`` mapping; references that fail to resolve are
+    logged and left out so callers can skip just those fields.
+    """
+    refs = list(dict.fromkeys(v for v in values if is_kv_ref(v)))
+    if len(refs) <= 1:
+        results = [_resolve_or_none(ref) for ref in refs]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(refs), RESOLVE_MAX_WORKERS)) as pool:
+            results = list(pool.map(_resolve_or_none, refs))
+    return {ref: value for ref, value in zip(refs, results) if value is not None}
+
+
+def _resolve_or_none(ref: str) -> str | None:
+    try:
+        return resolve_if_kv_ref(ref)
+    except Exception:
+        logger.warning("Failed to resolve Key Vault reference %r", ref, exc_info=True)
+        return None
@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 from ..config.settings import cfg
 from ..state.deploy_state import DeploymentRecord, DeployStateStore
 from ..state.infra_config import InfraConfigStore
-from .azure import AzureCLI
+from ..util.async_helpers import run_sync
+from .azure import AzureCLI, bot_show_args
 from .deployer import BotDeployer, DeployRequest
 from .tunnel import CloudflareTunnel
 
 logger = logging.getLogger(__name__)
 
+# Runs provisioning pre-checks that do not depend on earlier steps.
+_CHECK_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="provision-check")
+
 
 class Provisioner:
     """Orchestrates full infrastructure lifecycle from config."""
@@ -31,6 +37,22 @@ class Provisioner:
         self._tunnel = tunnel
         self._store = store
         self._deploy_store = deploy_store
+        # Serialises lifecycle runs started from the event loop (startup, UI, shutdown).
+        self._lock = asyncio.Lock()
+
+    async def provision_async(self) -> list[dict[str, Any]]:
+        async with self._lock:
+            return await run_sync(self.provision)
+
+    async def decommission_async(self) -> list[dict[str, Any]]:
+        async with self._lock:
+            return await run_sync(self.decommission)
+
+    async def redeploy_async(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Decommission then provision without another run interleaving."""
+        async with self._lock:
+            decomm_steps = await run_sync(self.decommission)
+            return decomm_steps, await run_sync(self.provision)
 
     def provision(self) -> list[dict[str, Any]]:
         steps: list[dict[str, Any]] = []
@@ -49,6 +71,10 @@ class Provisioner:
                 self._deploy_store.register(rec)
                 logger.info("Created new local deployment record: %s", rec.deploy_id)
 
+        # The Telegram getMe check needs neither the tunnel nor the bot, so it
+        # runs alongside them instead of after.
+        tg_check = self._start_telegram_check()
+
         logger.info("Provision step 1/3: Ensuring tunnel...")
         tunnel_url = self._ensure_tunnel(steps)
         if not tunnel_url:
@@ -61,7 +87,7 @@ class Provisioner:
             return steps
 
         logger.info("Provision step 3/3: Ensuring channels...")
-        self._ensure_channels(steps)
+        self._ensure_channels(steps, tg_check)
         logger.info("Provisioning completed: %d steps", len(steps))
         return steps
 
@@ -120,10 +146,18 @@ class Provisioner:
             steps.append({"step": "bot_deploy", "status": "failed", "detail": result.error})
         return result.ok
 
-    def _ensure_channels(self, steps: list[dict]) -> None:
+    def _start_telegram_check(self) -> Future[Any] | None:
+        token = self._store.channels.telegram.token
+        if not token:
+            return None
+        return _CHECK_POOL.submit(self._az.validate_telegram_token, token)
+
+    def _ensure_channels(self, steps: list[dict], tg_check: Future[Any] | None = None) -> None:
         tg = self._store.channels.telegram
         if tg.token:
-            tok_ok, tok_detail = self._az.validate_telegram_token(tg.token)
+            tok_ok, tok_detail = (
+                tg_check.result() if tg_check else self._az.validate_telegram_token(tg.token)
+            )
             if not tok_ok:
                 steps.append({"step": "telegram_validate", "status": "failed", "detail": tok_detail})
                 return
@@ -149,7 +183,10 @@ class Provisioner:
         )
 
         if name and rg:
-            bot_exists = self._az.json("bot", "show", "--resource-group", rg, "--name", name) is not None
+            # Shares the short-lived cache with status(), which usually ran just before.
+            bot_exists = self._az.json_cached(
+                *bot_show_args(rg, name), ttl=self._az.STATUS_CACHE_TTL,
+            ) is not None
             if bot_exists and self._store.telegram_configured:
                 ok, msg = self._az.remove_channel("telegram")
                 steps.append({"step": "telegram_remove", "status": "ok" if ok else "failed", "detail": msg})
@@ -157,6 +194,8 @@ class Provisioner:
                 steps.append({"step": "telegram_remove", "status": "skip", "detail": "Bot resource not found"})
 
         if name:
+            if rg:
+                self._az.invalidate_cache(*bot_show_args(rg, name))
             result = self._deployer.delete()
             steps.extend(result.steps)
             steps.append({
@@ -182,8 +221,11 @@ class Provisioner:
                 logger.info("Skipping RG deletion: %s is the %s resource group", rg, label)
                 steps.append({"step": "resource_group_delete", "status": "skip", "detail": f"{rg} is the {label} RG -- not deleting"})
             else:
-                rg_exists = self._az.json("group", "show", "--name", rg) is not None
+                rg_exists = self._az.json_cached(
+                    "group", "show", "--name", rg, ttl=self._az.STATUS_CACHE_TTL,
+                ) is not None
                 if rg_exists:
+                    self._az.invalidate_cache("group", "show", "--name", rg)
                     ok, msg = self._az.ok("group", "delete", "--name", rg, "--yes", "--no-wait")
                     steps.append({"step": "resource_group_delete", "status": "ok" if ok else "failed", "detail": f"Deleting {rg}" if ok else msg})
                 else:
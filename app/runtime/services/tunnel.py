@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
+import selectors
 import shutil
 import subprocess
 import threading
-from time import sleep
 from time import time as _time
-from typing import Any
 
 from ..util.result import Result
 
 logger = logging.getLogger(__name__)
 
+_URL_RE = re.compile(rb"https://[\w-]+\.trycloudflare\.com")
+_READ_SIZE = 4096
+_DRAIN_SIZE = 64 * 1024
+
 
 class CloudflareTunnel:
     """Manages a ``cloudflared tunnel --url`` subprocess."""
@@ -50,7 +54,8 @@ class CloudflareTunnel:
         try:
             proc = subprocess.Popen(
                 ["cloudflared", "tunnel", "--url", f"http://127.0.0.1:{port}"],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                # Only stderr carries anything we read (the URL banner).
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
             )
             url = self._wait_for_url(proc)
             if url:
@@ -65,26 +70,39 @@ class CloudflareTunnel:
 
     @staticmethod
     def _wait_for_url(proc: subprocess.Popen, timeout: float = 20) -> str | None:
-        start = _time()
-        while _time() - start < timeout:
-            line = proc.stderr.readline().decode("utf-8", errors="replace")
-            if not line:
-                sleep(0.2)
-                continue
-            match = re.search(r"(https://[\w-]+\.trycloudflare\.com)", line)
-            if match:
-                return match.group(1)
+        """Scan cloudflared's stderr for the quick-tunnel URL.
+
+        Waits on the pipe with a selector so the deadline holds even when no
+        output arrives, and gives up as soon as the process closes stderr.
+        """
+        deadline = _time() + timeout
+        fd = proc.stderr.fileno()
+        pending = b""
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            while (remaining := deadline - _time()) > 0:
+                if not sel.select(remaining):
+                    break
+                chunk = os.read(fd, _READ_SIZE)
+                if not chunk:
+                    return None
+                # Only complete lines are matched; a partial one waits for the rest.
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    match = _URL_RE.search(line)
+                    if match:
+                        return match.group(0).decode()
         return None
 
     @staticmethod
     def _drain_background(proc: subprocess.Popen) -> None:
-        for stream in (proc.stdout, proc.stderr):
-            threading.Thread(target=_drain, args=(stream,), daemon=True).start()
+        # Keep consuming stderr so a full pipe never stalls cloudflared.
+        threading.Thread(target=_drain, args=(proc.stderr.fileno(),), daemon=True).start()
 
 
-def _drain(stream: Any) -> None:
+def _drain(fd: int) -> None:
     try:
-        for _ in stream:
+        while os.read(fd, _DRAIN_SIZE):
             pass
-    except Exception:
+    except OSError:
         pass
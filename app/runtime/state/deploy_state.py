@@ -6,20 +6,26 @@ unique deploy_id and matching Azure resource tag prefix.
 
 from __future__ import annotations
 
-import json
 import logging
 import secrets
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Literal
 
+import orjson
+
 from ..config.settings import cfg
+from ..util.atomic_file import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
 TAG_PREFIX = "polycl"
 
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
 
 def generate_deploy_id() -> str:
     return secrets.token_hex(4)
@@ -109,6 +115,8 @@ class DeployStateStore:
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or (cfg.data_dir / "deployments.json")
         self._deployments: dict[str, DeploymentRecord] = {}
+        self._batch_depth = 0
+        self._dirty = False
         self._load()
 
     @property
@@ -161,6 +169,17 @@ class DeployStateStore:
             return True
         return False
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several mutations into a single write on exit."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._save()
+
     def to_dict(self) -> dict[str, Any]:
         return {"deployments": {did: asdict(rec) for did, rec in self._deployments.items()}}
 
@@ -183,7 +202,7 @@ class DeployStateStore:
         if not self._path.exists():
             return
         try:
-            raw = json.loads(self._path.read_text())
+            raw = orjson.loads(self._path.read_bytes())
             for did, rec_data in raw.get("deployments", {}).items():
                 resources = [ResourceEntry(**r) for r in rec_data.pop("resources", [])]
                 rec = DeploymentRecord(**{
@@ -196,5 +215,10 @@ class DeployStateStore:
             logger.warning("Failed to load deploy state from %s: %s", self._path, exc)
 
     def _save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._dirty = False
+        # orjson encodes the record dataclasses natively; no asdict() copy needed.
+        payload = {"deployments": self._deployments}
+        atomic_write_bytes(self._path, orjson.dumps(payload, option=_JSON_OPTS))
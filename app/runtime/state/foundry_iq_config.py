@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import threading
+from collections.abc import Callable
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from ..config.settings import cfg
+from ..services import keyvault
+from ..util.atomic_file import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
 
 @dataclass
 class FoundryIQConfig:
@@ -37,6 +44,12 @@ class FoundryIQConfigStore:
     """JSON-file-backed Foundry IQ configuration."""
 
     _SECRET_FIELDS = frozenset({"search_api_key", "embedding_api_key"})
+    _FIELDS = frozenset(FoundryIQConfig.__dataclass_fields__)
+    # Form posts deliver every value as a string; these fields need a real type.
+    _STR_COERCERS: dict[str, Callable[[str], Any]] = {
+        "enabled": lambda v: v.lower() in ("true", "1", "yes"),
+        "embedding_dimensions": int,
+    }
 
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or (cfg.data_dir / "foundry_iq.json")
@@ -81,12 +94,11 @@ class FoundryIQConfigStore:
 
     def save(self, **kwargs: Any) -> None:
         for k, v in kwargs.items():
-            if hasattr(self._config, k):
-                if k == "enabled" and isinstance(v, str):
-                    v = v.lower() in ("true", "1", "yes")
-                elif k == "embedding_dimensions" and isinstance(v, str):
-                    v = int(v)
-                setattr(self._config, k, v)
+            if k not in self._FIELDS:
+                continue
+            if isinstance(v, str) and k in self._STR_COERCERS:
+                v = self._STR_COERCERS[k](v)
+            setattr(self._config, k, v)
         self._save()
 
     def set_last_indexed(self, timestamp: str) -> None:
@@ -109,59 +121,67 @@ class FoundryIQConfigStore:
         if not self._path.exists():
             return
         try:
-            raw = json.loads(self._path.read_text())
-            for k in FoundryIQConfig.__dataclass_fields__:
+            raw = orjson.loads(self._path.read_bytes())
+            resolved = keyvault.resolve_many(
+                raw[k] for k in self._SECRET_FIELDS if isinstance(raw.get(k), str)
+            )
+            for k in self._FIELDS:
                 if k in raw:
                     value = raw[k]
-                    if k in self._SECRET_FIELDS and isinstance(value, str):
-                        value = self._resolve_secret(value)
+                    if (
+                        k in self._SECRET_FIELDS
+                        and isinstance(value, str)
+                        and keyvault.is_kv_ref(value)
+                    ):
+                        if value not in resolved:
+                            logger.warning("Failed to resolve Foundry IQ %s -- skipping", k)
+                            continue
+                        value = resolved[value]
                     setattr(self._config, k, value)
         except Exception as exc:
             logger.warning("Failed to load Foundry IQ config from %s: %s", self._path, exc)
 
     def _save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
         data = asdict(self._config)
         data = self._store_secrets(data)
-        self._path.write_text(json.dumps(data, indent=2) + "\n")
+        atomic_write_bytes(self._path, orjson.dumps(data, option=_JSON_OPTS))
 
     def _store_secrets(self, d: dict[str, Any]) -> dict[str, Any]:
-        from ..services.keyvault import kv, env_key_to_secret_name, is_kv_ref
-
+        kv = keyvault.kv
         result = dict(d)
         if not kv.enabled:
             return result
         for k in self._SECRET_FIELDS:
             val = result.get(k, "")
-            if val and not is_kv_ref(val):
+            if val and not keyvault.is_kv_ref(val):
                 try:
-                    ref = kv.store(env_key_to_secret_name(f"foundryiq-{k}"), val)
+                    ref = kv.store(keyvault.env_key_to_secret_name(f"foundryiq-{k}"), val)
                     result[k] = ref
                 except Exception as exc:
                     logger.warning("Failed to store secret %s in KV: %s", k, exc)
         return result
 
-    @staticmethod
-    def _resolve_secret(value: str) -> str:
-        from ..services.keyvault import resolve_if_kv_ref
-        return resolve_if_kv_ref(value)
-
 
 # -- singleton -------------------------------------------------------------
 
 _store: FoundryIQConfigStore | None = None
+# Construction resolves Key Vault secrets; only one thread should pay for it.
+_store_lock = threading.Lock()
 
 
 def get_foundry_iq_config() -> FoundryIQConfigStore:
     global _store
     if _store is None:
-        _store = FoundryIQConfigStore()
+        with _store_lock:
+            if _store is None:
+                _store = FoundryIQConfigStore()
     return _store
 
 
 def _reset_store() -> None:
     global _store
-    _store = None
+    with _store_lock:
+        _store = None
 
 
 from ..util.singletons import register_singleton
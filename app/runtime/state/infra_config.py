@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from ..config.settings import cfg
+from ..services import keyvault
+from ..util.atomic_file import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
 
 @dataclass
 class BotInfraConfig:
@@ -51,7 +56,11 @@ class ChannelsConfig:
 class InfraConfigStore:
     """Persists infrastructure configuration to ``infra.json``."""
 
-    _SECRET_FIELDS = {"token", "acs_connection_string", "azure_openai_api_key"}
+    _SECRET_FIELDS = frozenset({"token", "acs_connection_string", "azure_openai_api_key"})
+
+    _BOT_FIELDS = frozenset(BotInfraConfig.__dataclass_fields__)
+    _TELEGRAM_FIELDS = frozenset(TelegramChannelConfig.__dataclass_fields__)
+    _VOICE_CALL_FIELDS = frozenset(VoiceCallConfig.__dataclass_fields__)
 
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or (cfg.data_dir / "infra.json")
@@ -75,30 +84,33 @@ class InfraConfigStore:
         if not self._path.exists():
             return
         try:
-            data = json.loads(self._path.read_text())
-        except (json.JSONDecodeError, OSError):
+            data = orjson.loads(self._path.read_bytes())
+        except (orjson.JSONDecodeError, OSError):
             return
-        bot_data = data.get("bot", {})
-        for k, v in bot_data.items():
-            if hasattr(self.bot, k):
-                try:
-                    setattr(self.bot, k, self._resolve_secret(v))
-                except Exception:
-                    logger.warning("Failed to resolve bot.%s -- skipping", k, exc_info=True)
-        tg_data = data.get("channels", {}).get("telegram", {})
-        for k, v in tg_data.items():
-            if hasattr(self.channels.telegram, k):
-                try:
-                    setattr(self.channels.telegram, k, self._resolve_secret(v))
-                except Exception:
-                    logger.warning("Failed to resolve telegram.%s -- skipping", k, exc_info=True)
-        vc_data = data.get("channels", {}).get("voice_call", {})
-        for k, v in vc_data.items():
-            if hasattr(self.channels.voice_call, k):
-                try:
-                    setattr(self.channels.voice_call, k, self._resolve_secret(v))
-                except Exception:
-                    logger.warning("Failed to resolve voice_call.%s -- skipping", k, exc_info=True)
+        channels = data.get("channels", {})
+        sections = (
+            ("bot", self.bot, self._BOT_FIELDS, data.get("bot", {})),
+            ("telegram", self.channels.telegram, self._TELEGRAM_FIELDS,
+             channels.get("telegram", {})),
+            ("voice_call", self.channels.voice_call, self._VOICE_CALL_FIELDS,
+             channels.get("voice_call", {})),
+        )
+        # Only secret fields are ever written as references; resolve them in
+        # one concurrent batch.
+        resolved = keyvault.resolve_many(
+            v for *_, section in sections for k, v in section.items()
+            if k in self._SECRET_FIELDS and isinstance(v, str)
+        )
+        for label, target, known, section in sections:
+            for k, v in section.items():
+                if k not in known:
+                    continue
+                if k in self._SECRET_FIELDS and isinstance(v, str) and keyvault.is_kv_ref(v):
+                    if v not in resolved:
+                        logger.warning("Failed to resolve %s.%s -- skipping", label, k)
+                        continue
+                    v = resolved[v]
+                setattr(target, k, v)
 
     def _save(self) -> None:
         data = {
@@ -108,18 +120,17 @@ class InfraConfigStore:
                 "voice_call": self._store_secrets(asdict(self.channels.voice_call)),
             },
         }
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(json.dumps(data, indent=2) + "\n")
+        atomic_write_bytes(self._path, orjson.dumps(data, option=_JSON_OPTS))
 
     def save_bot(self, **kwargs: str) -> None:
         for k, v in kwargs.items():
-            if hasattr(self.bot, k):
+            if k in self._BOT_FIELDS:
                 setattr(self.bot, k, v)
         self._save()
 
     def save_telegram(self, **kwargs: str) -> None:
         for k, v in kwargs.items():
-            if hasattr(self.channels.telegram, k):
+            if k in self._TELEGRAM_FIELDS:
                 setattr(self.channels.telegram, k, v)
         self._save()
 
@@ -129,7 +140,7 @@ class InfraConfigStore:
 
     def save_voice_call(self, **kwargs: str) -> None:
         for k, v in kwargs.items():
-            if hasattr(self.channels.voice_call, k):
+            if k in self._VOICE_CALL_FIELDS:
                 setattr(self.channels.voice_call, k, v)
         self._save()
 
@@ -154,25 +165,16 @@ class InfraConfigStore:
         }
 
     def _store_secrets(self, d: dict[str, Any]) -> dict[str, Any]:
-        from ..services.keyvault import kv, env_key_to_secret_name, is_kv_ref
-
+        kv = keyvault.kv
         result = dict(d)
         if not kv.enabled:
             return result
         for k in self._SECRET_FIELDS:
             val = result.get(k, "")
-            if val and not is_kv_ref(val):
+            if val and not keyvault.is_kv_ref(val):
                 try:
-                    ref = kv.store(env_key_to_secret_name(f"infra-{k}"), val)
+                    ref = kv.store(keyvault.env_key_to_secret_name(f"infra-{k}"), val)
                     result[k] = ref
                 except Exception as exc:
                     logger.warning("Failed to store secret %s in KV: %s", k, exc)
         return result
-
-    @staticmethod
-    def _resolve_secret(value: Any) -> Any:
-        if not isinstance(value, str):
-            return value
-        from ..services.keyvault import resolve_if_kv_ref
-
-        return resolve_if_kv_ref(value)
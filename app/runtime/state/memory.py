@@ -8,6 +8,7 @@ logs and topic notes). Runs entirely in the background.
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 from dataclasses import dataclass
@@ -370,19 +371,12 @@ class MemoryFormation:
 
 # -- singleton -------------------------------------------------------------
 
-_memory: MemoryFormation | None = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_memory() -> MemoryFormation:
-    global _memory
-    if _memory is None:
-        _memory = MemoryFormation()
-    return _memory
+    return MemoryFormation()
 
 
-def _reset_memory() -> None:
-    global _memory
-    _memory = None
+_reset_memory = get_memory.cache_clear
 
 
 from ..util.singletons import register_singleton
@@ -7,6 +7,7 @@ a new one replaces the previous.
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import uuid
@@ -244,19 +245,12 @@ class ProactiveStore:
 
 # -- singleton -------------------------------------------------------------
 
-_store: ProactiveStore | None = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_proactive_store() -> ProactiveStore:
-    global _store
-    if _store is None:
-        _store = ProactiveStore()
-    return _store
+    return ProactiveStore()
 
 
-def _reset_proactive_store() -> None:
-    global _store
-    _store = None
+_reset_proactive_store = get_proactive_store.cache_clear
 
 
 from ..util.singletons import register_singleton
@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
-import json
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from ..config.settings import cfg
+from ..util.atomic_file import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
 DEFAULT_WHITELIST: list[str] = [
     "media", "memory", "notes", "sessions", "skills",
     ".copilot", ".env", ".workiq.json", "agent_profile.json",
@@ -41,9 +47,16 @@ class SandboxConfig:
 class SandboxConfigStore:
     """JSON-file-backed sandbox configuration."""
 
+    _FIELDS = frozenset(SandboxConfig.__dataclass_fields__)
+
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or (cfg.data_dir / "sandbox.json")
         self._config = SandboxConfig()
+        # Insertion-ordered set: O(1) membership, add and remove. Copied back
+        # onto ``self._config.whitelist`` whenever the config is read out.
+        self._whitelist: dict[str, None] = dict.fromkeys(self._config.whitelist)
+        self._batch_depth = 0
+        self._dirty = False
         self._load()
 
     @property
@@ -52,6 +65,7 @@ class SandboxConfigStore:
 
     @property
     def config(self) -> SandboxConfig:
+        self._sync_whitelist()
         return self._config
 
     @property
@@ -68,7 +82,7 @@ class SandboxConfigStore:
 
     @property
     def whitelist(self) -> list[str]:
-        return list(self._config.whitelist)
+        return list(self._whitelist)
 
     @property
     def resource_group(self) -> str:
@@ -103,24 +117,24 @@ class SandboxConfigStore:
         self._save()
 
     def set_whitelist(self, whitelist: list[str]) -> None:
-        self._config.whitelist = [w for w in whitelist if w not in BLACKLIST]
+        self._whitelist = dict.fromkeys(w for w in whitelist if w not in BLACKLIST)
         self._save()
 
     def add_whitelist_item(self, item: str) -> bool:
         if item in BLACKLIST:
             return False
-        if item not in self._config.whitelist:
-            self._config.whitelist.append(item)
+        if item not in self._whitelist:
+            self._whitelist[item] = None
             self._save()
         return True
 
     def remove_whitelist_item(self, item: str) -> None:
-        if item in self._config.whitelist:
-            self._config.whitelist.remove(item)
+        if item in self._whitelist:
+            del self._whitelist[item]
             self._save()
 
     def reset_whitelist(self) -> None:
-        self._config.whitelist = list(DEFAULT_WHITELIST)
+        self._whitelist = dict.fromkeys(DEFAULT_WHITELIST)
         self._save()
 
     def set_pool_metadata(
@@ -151,18 +165,19 @@ class SandboxConfigStore:
         for k, v in kwargs.items():
             if k == "whitelist":
                 self.set_whitelist(v)
-            elif hasattr(self._config, k):
+            elif k in self._FIELDS:
                 setattr(self._config, k, v)
         self._save()
 
     def to_dict(self) -> dict[str, Any]:
+        self._sync_whitelist()
         return asdict(self._config)
 
     def _load(self) -> None:
         if not self._path.exists():
             return
         try:
-            raw = json.loads(self._path.read_text())
+            raw = orjson.loads(self._path.read_bytes())
             self._config = SandboxConfig(
                 enabled=raw.get("enabled", False),
                 sync_data=raw.get("sync_data", True),
@@ -173,9 +188,27 @@ class SandboxConfigStore:
                 pool_name=raw.get("pool_name", ""),
                 pool_id=raw.get("pool_id", ""),
             )
+            self._whitelist = dict.fromkeys(self._config.whitelist)
         except Exception as exc:
             logger.warning("Failed to load sandbox config from %s: %s", self._path, exc)
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several setters into a single write on exit."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._save()
+
     def _save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(json.dumps(asdict(self._config), indent=2) + "\n")
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._dirty = False
+        atomic_write_bytes(self._path, orjson.dumps(self.to_dict(), option=_JSON_OPTS))
+
+    def _sync_whitelist(self) -> None:
+        self._config.whitelist = list(self._whitelist)
@@ -1,15 +1,20 @@
-"""Session history store -- one JSON file per session."""
+"""Session history store -- one JSON Lines log per session."""
 
 from __future__ import annotations
 
-import json
 import logging
+import os
+import threading
 import time
-from dataclasses import asdict, dataclass, field
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from ..config.settings import cfg
+from ..util.atomic_file import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -47,8 +52,36 @@ class Session:
     title: str = ""
 
 
+@dataclass(frozen=True)
+class _SessionMeta:
+    """Listing fields of a session file, without its messages."""
+
+    id: str
+    title: str
+    model: str
+    message_count: int
+    created_at: float
+    updated_at: float
+
+
+_MESSAGE_FIELDS = frozenset(f.name for f in fields(SessionMessage))
+
+# Sessions are append-only logs; ``.json`` files are the legacy format.
+_SESSION_SUFFIXES = (".jsonl", ".json")
+
+# Shared by every SessionStore (several are created over the same directory);
+# entries are keyed by path and revalidated against (mtime_ns, size).
+_meta_cache: dict[str, tuple[tuple[int, int], _SessionMeta | None]] = {}
+_meta_lock = threading.Lock()
+# Held only around a single log write or a sweep's unlink, so a sweep never
+# removes a file that was written after it was parsed.
+_write_lock = threading.Lock()
+# The background sweep started for each directory; later stores reuse it.
+_sweepers: dict[str, threading.Thread] = {}
+
+
 class SessionStore:
-    """Directory-backed session store with one JSON file per session."""
+    """Directory-backed session store with one append-only log per session."""
 
     def __init__(self, directory: Path | None = None) -> None:
         self._dir = directory or cfg.sessions_dir
@@ -56,8 +89,17 @@ class SessionStore:
         self._current_id: str = ""
         self._pending_model: str = ""
         self._policy: str = "7d"
-        self._purge_empty()
-        self._apply_archival()
+        # Purge and archival run in the background, once per directory, so
+        # construction never waits on a full parse; list_sessions sweeps again.
+        with _meta_lock:
+            sweeper = _sweepers.get(str(self._dir))
+            if sweeper is None:
+                sweeper = threading.Thread(
+                    target=self._sweep, name="session-sweep", daemon=True,
+                )
+                sweeper.start()
+                _sweepers[str(self._dir)] = sweeper
+        self._maintenance = sweeper
 
     @property
     def current_session_id(self) -> str:
@@ -68,40 +110,47 @@ class SessionStore:
         self._current_id = value
 
     def _path(self, session_id: str) -> Path:
+        return self._dir / f"{session_id}.jsonl"
+
+    def _legacy_path(self, session_id: str) -> Path:
         return self._dir / f"{session_id}.json"
 
-    def _load(self, session_id: str) -> Session | None:
+    def _read(self, session_id: str) -> dict[str, Any] | None:
         path = self._path(session_id)
         if not path.exists():
+            path = self._legacy_path(session_id)
+        return _read_session_file(str(path))
+
+    def _load(self, session_id: str) -> Session | None:
+        data = self._read(session_id)
+        if data is None:
             return None
         try:
-            data = json.loads(path.read_text())
-            msgs = [
-                SessionMessage(
-                    role=m.get("role", ""),
-                    content=m.get("content", ""),
-                    timestamp=m.get("timestamp", 0),
-                    channel=m.get("channel", ""),
-                    tool_calls=[ToolCall(**tc) for tc in m.get("tool_calls", [])],
-                )
-                for m in data.get("messages", [])
-            ]
-            return Session(
-                id=data.get("id", session_id),
-                messages=msgs,
-                model=data.get("model", ""),
-                created_at=data.get("created_at", 0),
-                updated_at=data.get("updated_at", 0),
-                title=data.get("title", ""),
-            )
-        except (json.JSONDecodeError, OSError):
+            msgs = [_message_from_dict(m) for m in data.get("messages", [])]
+        except (AttributeError, TypeError):
             return None
+        return Session(
+            id=data.get("id", session_id),
+            messages=msgs,
+            model=data.get("model", ""),
+            created_at=data.get("created_at", 0),
+            updated_at=data.get("updated_at", 0),
+            title=data.get("title", ""),
+        )
 
     def _save_session(self, session: Session) -> None:
+        """Rewrite *session* as a full log (header line + one line per message)."""
         session.updated_at = time.time()
-        self._path(session.id).write_text(
-            json.dumps(asdict(session), indent=2, default=str) + "\n"
-        )
+        header = {
+            "id": session.id, "model": session.model, "title": session.title,
+            "created_at": session.created_at, "updated_at": session.updated_at,
+        }
+        lines = [_dump_line(header)]
+        lines.extend(_dump_line(m) for m in session.messages)
+        atomic_write_bytes(self._path(session.id), b"".join(lines))
+        legacy = self._legacy_path(session.id)
+        if legacy.exists():
+            _unlink(str(legacy))
 
     def record(
         self,
@@ -113,67 +162,99 @@ class SessionStore:
     ) -> None:
         if not self._current_id:
             return
+        message = SessionMessage(
+            role=role,
+            content=content,
+            timestamp=time.time(),
+            channel=channel,
+            tool_calls=tool_calls or [],
+        )
+        # A concurrent sweep must not unlink an expired log between the
+        # existence check and the write.
+        with _write_lock:
+            self._write(message)
+
+    def _write(self, message: SessionMessage) -> None:
+        path = self._path(self._current_id)
+        if path.exists():
+            # Append-only: a new message never rewrites the earlier ones.
+            line = _dump_line(message)
+            with open(path, "a+b") as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # Close off a torn line so this message stays readable.
+                        line = b"\n" + line
+                f.write(line)
+            return
+        # New session, or a legacy single-JSON session converted on first write.
         session = self._load(self._current_id) or Session(
             id=self._current_id,
             created_at=time.time(),
             model=self._pending_model,
         )
-        session.messages.append(
-            SessionMessage(
-                role=role,
-                content=content,
-                timestamp=time.time(),
-                channel=channel,
-                tool_calls=tool_calls or [],
-            )
-        )
+        session.messages.append(message)
         self._save_session(session)
 
     def start_session(self, session_id: str, model: str = "") -> None:
         self._current_id = session_id
         self._pending_model = model
-        existing = self._load(session_id)
-        if existing and existing.messages:
-            existing.model = model
-            self._save_session(existing)
+        with _write_lock:
+            existing = self._load(session_id)
+            if existing and existing.messages:
+                existing.model = model
+                self._save_session(existing)
 
     def list_sessions(self) -> list[dict[str, Any]]:
-        result: list[dict[str, Any]] = []
-        for path in self._dir.glob("*.json"):
-            session = self._load(path.stem)
-            if not session or not session.messages:
-                if path.exists():
-                    path.unlink()
-                continue
-            result.append({
-                "id": session.id,
-                "title": session.title or self._derive_title(session),
-                "model": session.model,
-                "message_count": len(session.messages),
-                "created_at": session.created_at,
-                "updated_at": session.updated_at,
-            })
+        result = [
+            {
+                "id": meta.id,
+                "title": meta.title,
+                "model": meta.model,
+                "message_count": meta.message_count,
+                "created_at": meta.created_at,
+                "updated_at": meta.updated_at,
+            }
+            for meta in self._sweep()
+        ]
         result.sort(key=lambda s: s["updated_at"] or s["created_at"], reverse=True)
         return result
 
     def get_session(self, session_id: str) -> dict[str, Any] | None:
-        session = self._load(session_id)
-        if not session:
+        """The session as a plain dict, in the shape of ``asdict(Session)``.
+
+        Built straight from the parsed log: complete message records are
+        passed through rather than round-tripped via dataclasses.
+        """
+        data = self._read(session_id)
+        if data is None:
             return None
-        return asdict(session)
+        try:
+            messages = [
+                m if m.keys() == _MESSAGE_FIELDS else asdict(_message_from_dict(m))
+                for m in data.get("messages", [])
+            ]
+        except (AttributeError, TypeError):
+            return None
+        return {
+            "id": data.get("id", session_id),
+            "messages": messages,
+            "model": data.get("model", ""),
+            "created_at": data.get("created_at", 0),
+            "updated_at": data.get("updated_at", 0),
+            "title": data.get("title", ""),
+        }
 
     def delete_session(self, session_id: str) -> bool:
-        path = self._path(session_id)
-        if path.exists():
-            path.unlink()
-            return True
-        return False
+        deleted = False
+        for path in (self._path(session_id), self._legacy_path(session_id)):
+            deleted |= _unlink(str(path))
+        return deleted
 
     def clear_all(self) -> int:
         count = 0
-        for path in self._dir.glob("*.json"):
-            path.unlink()
-            count += 1
+        for entry in self._scan():
+            count += _unlink(entry.path)
         return count
 
     def get_session_stats(self) -> dict[str, Any]:
@@ -192,28 +273,152 @@ class SessionStore:
         if policy not in ARCHIVAL_OPTIONS:
             raise ValueError(f"Invalid policy: {policy}")
         self._policy = policy
-        self._apply_archival()
+        self._sweep()
 
-    def _purge_empty(self) -> None:
-        """Remove session files that contain zero messages."""
-        for path in self._dir.glob("*.json"):
-            session = self._load(path.stem)
-            if session and not session.messages:
-                path.unlink()
+    def _sweep(self) -> list[_SessionMeta]:
+        """One pass over the directory: drop unreadable, empty and expired sessions.
 
-    def _apply_archival(self) -> None:
+        Returns the metadata of the sessions that remain.
+        """
         max_age = ARCHIVAL_OPTIONS.get(self._policy)
-        if max_age is None:
+        cutoff = time.time() - max_age if max_age is not None else None
+        kept: list[_SessionMeta] = []
+        for path, stamp, meta in self._iter_meta():
+            if not meta or not meta.message_count or (
+                cutoff is not None and meta.updated_at and meta.updated_at < cutoff
+            ):
+                _unlink_unchanged(path, stamp)
+                continue
+            kept.append(meta)
+        return kept
+
+    def _iter_meta(self) -> Iterator[tuple[str, tuple[int, int], _SessionMeta | None]]:
+        """Yield ``(path, stamp, meta)`` per session file; ``meta`` is None if unreadable."""
+        for entry in self._scan():
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            yield entry.path, stamp, _load_meta(entry.path, stamp)
+
+    def _scan(self) -> list[os.DirEntry[str]]:
+        """Session files in the store directory, from a single ``scandir`` pass."""
+        try:
+            it = os.scandir(self._dir)
+        except FileNotFoundError:
+            return []
+        with it:
+            return [e for e in it if e.name.endswith(_SESSION_SUFFIXES) and e.is_file()]
+
+
+def _load_meta(path: str, stamp: tuple[int, int]) -> _SessionMeta | None:
+    """Listing metadata for *path*, parsed only when the file changed."""
+    with _meta_lock:
+        cached = _meta_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    meta: _SessionMeta | None = None
+    data = _read_session_file(path)
+    if data is not None:
+        try:
+            messages = data.get("messages", [])
+            session_id = data.get("id", "") or os.path.splitext(os.path.basename(path))[0]
+            title = data.get("title", "") or next(
+                (
+                    m["content"][:60]
+                    for m in messages
+                    if m.get("role") == "user" and m.get("content")
+                ),
+                f"Session {session_id[:8]}",
+            )
+            meta = _SessionMeta(
+                id=session_id, title=title, model=data.get("model", ""),
+                message_count=len(messages),
+                created_at=data.get("created_at", 0),
+                # Records without any timestamp fall back to the file's mtime,
+                # so they still sort sensibly and age out under archival.
+                updated_at=data.get("updated_at", 0) or stamp[0] / 1e9,
+            )
+        except (AttributeError, TypeError, KeyError):
+            meta = None
+    with _meta_lock:
+        _meta_cache[path] = (stamp, meta)
+    return meta
+
+
+def _read_session_file(path: str) -> dict[str, Any] | None:
+    """Parse a session log (``.jsonl``) or legacy single document (``.json``).
+
+    Both are returned in the legacy shape: header fields plus ``messages``.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        if not path.endswith(".jsonl"):
+            data = orjson.loads(raw)
+            return data if isinstance(data, dict) else None
+    except (orjson.JSONDecodeError, OSError):
+        return None
+    lines = raw.splitlines()
+    if not lines:
+        return None
+    try:
+        data = orjson.loads(lines[0])
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    messages: list[dict[str, Any]] = []
+    for line in lines[1:]:
+        try:
+            messages.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            # A torn trailing line from an interrupted append.
+            continue
+    data["messages"] = messages
+    if messages:
+        data["updated_at"] = max(data.get("updated_at", 0), messages[-1].get("timestamp", 0))
+    return data
+
+
+def _message_from_dict(m: dict[str, Any]) -> SessionMessage:
+    if m.keys() == _MESSAGE_FIELDS:
+        # Lines written by this store carry every field: build in one call.
+        msg = SessionMessage(**m)
+        if msg.tool_calls:
+            msg.tool_calls = [ToolCall(**tc) for tc in msg.tool_calls]
+        return msg
+    return SessionMessage(
+        role=m.get("role", ""),
+        content=m.get("content", ""),
+        timestamp=m.get("timestamp", 0),
+        channel=m.get("channel", ""),
+        tool_calls=[ToolCall(**tc) for tc in m.get("tool_calls", [])],
+    )
+
+
+def _dump_line(obj: dict[str, Any] | SessionMessage) -> bytes:
+    # orjson encodes dataclasses natively, without an intermediate asdict() tree.
+    return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _unlink_unchanged(path: str, stamp: tuple[int, int]) -> None:
+    """Unlink *path* unless it was written after being parsed at *stamp*."""
+    with _write_lock:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             return
-        cutoff = time.time() - max_age
-        for path in self._dir.glob("*.json"):
-            session = self._load(path.stem)
-            if session and session.updated_at and session.updated_at < cutoff:
-                path.unlink()
-
-    @staticmethod
-    def _derive_title(session: Session) -> str:
-        for msg in session.messages:
-            if msg.role == "user" and msg.content:
-                return msg.content[:60]
-        return f"Session {session.id[:8]}"
+        if (st.st_mtime_ns, st.st_size) == stamp:
+            _unlink(path)
+
+
+def _unlink(path: str) -> bool:
+    with _meta_lock:
+        _meta_cache.pop(path, None)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        return False
+    return True
@@ -2,11 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock
 
 import pytest
 
+try:
+    import uvloop
+except ImportError:  # optional: not available on Windows
+    uvloop = None
+
+
+def _new_test_loop() -> asyncio.AbstractEventLoop:
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    # Debug mode (PYTHONASYNCIODEBUG, -X dev) times every callback; opt back in per test.
+    loop.set_debug(False)
+    # Coroutines that finish without suspending (AsyncMock returns, set
+    # events) complete inside create_task instead of a loop iteration later.
+    eager = getattr(asyncio, "eager_task_factory", None)  # Python 3.12+
+    if eager is not None:
+        loop.set_task_factory(eager)
+    return loop
+
+
+def pytest_asyncio_loop_factories(config: pytest.Config, item: pytest.Item):
+    """Loop factory for async tests (pytest-asyncio >= 1.4)."""
+    return {"default": _new_test_loop}
+
 
 @pytest.fixture(autouse=True)
 def _isolate_data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
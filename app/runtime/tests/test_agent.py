@@ -4,13 +4,52 @@ from __future__ import annotations
 
 import asyncio
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from copilot import CopilotSession
 
 from app.runtime.agent.agent import Agent, MAX_START_RETRIES
 
 
+class _FakeClient:
+    """Stands in for CopilotClient; only the coroutines Agent calls are mocked."""
+
+    def __init__(self) -> None:
+        self.start = AsyncMock()
+        self.stop = AsyncMock()
+        self.create_session = AsyncMock()
+        self.list_models = AsyncMock()
+
+
+_MODEL = SimpleNamespace(
+    id="gpt-4.1",
+    name="GPT-4.1",
+    policy=SimpleNamespace(state="enabled"),
+    billing=SimpleNamespace(multiplier=1.0),
+    supported_reasoning_efforts=["low", "high"],
+)
+
+
+@pytest.fixture(autouse=True)
+def copilot(monkeypatch: pytest.MonkeyPatch) -> _FakeClient:
+    """The CopilotClient instance every Agent in this module gets."""
+    instance = _FakeClient()
+    monkeypatch.setattr("app.runtime.agent.agent.CopilotClient", MagicMock(return_value=instance))
+    monkeypatch.setattr("app.runtime.agent.agent.build_system_prompt", lambda: "sp")
+    monkeypatch.setattr("app.runtime.agent.agent.get_all_tools", lambda: [])
+    monkeypatch.setattr("app.runtime.agent.agent.RETRY_DELAY", 0)
+    return instance
+
+
+@pytest.fixture()
+def mcp_store(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    store = MagicMock()
+    store.return_value.get_enabled_servers.return_value = {}
+    monkeypatch.setattr("app.runtime.agent.agent.McpConfigStore", store)
+    return store
+
+
 class TestAgentInit:
     def test_defaults(self):
         a = Agent()
@@ -21,8 +60,7 @@ class TestAgentInit:
 
     def test_set_sandbox(self):
         a = Agent()
-        mock_executor = MagicMock()
-        mock_executor.enabled = True
+        mock_executor = SimpleNamespace(enabled=True)
         a.set_sandbox(mock_executor)
         assert a._sandbox is mock_executor
         assert a._interceptor is not None
@@ -30,61 +68,44 @@ class TestAgentInit:
 
 class TestAgentLifecycle:
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_start_success(self, MockClient):
-        instance = AsyncMock()
-        MockClient.return_value = instance
+    async def test_start_success(self, copilot):
         a = Agent()
         await a.start()
-        instance.start.assert_awaited_once()
-        assert a._client is instance
+        copilot.start.assert_awaited_once()
+        assert a._client is copilot
 
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_start_retries_on_timeout(self, MockClient):
-        instance = AsyncMock()
-        instance.start.side_effect = [TimeoutError(), None]
-        MockClient.return_value = instance
-        with patch("app.runtime.agent.agent.RETRY_DELAY", 0):
-            a = Agent()
-            await a.start()
-        assert instance.start.await_count == 2
+    async def test_start_retries_on_timeout(self, copilot):
+        copilot.start.side_effect = [TimeoutError(), None]
+        a = Agent()
+        await a.start()
+        assert copilot.start.await_count == 2
 
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_start_exhausts_retries(self, MockClient):
-        instance = AsyncMock()
-        instance.start.side_effect = TimeoutError()
-        MockClient.return_value = instance
-        with patch("app.runtime.agent.agent.RETRY_DELAY", 0):
-            a = Agent()
-            with pytest.raises(RuntimeError, match="Could not connect"):
-                await a.start()
+    async def test_start_exhausts_retries(self, copilot):
+        copilot.start.side_effect = TimeoutError()
+        a = Agent()
+        with pytest.raises(RuntimeError, match="Could not connect"):
+            await a.start()
 
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_stop(self, MockClient):
-        instance = AsyncMock()
-        MockClient.return_value = instance
+    async def test_stop(self, copilot):
         a = Agent()
         await a.start()
-        session = AsyncMock()
+        session = AsyncMock(spec=CopilotSession)
         a._session = session
         await a.stop()
         session.destroy.assert_awaited_once()
-        instance.stop.assert_awaited_once()
+        copilot.stop.assert_awaited_once()
         assert a._client is None
         assert a._session is None
 
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_stop_handles_errors(self, MockClient):
-        instance = AsyncMock()
-        instance.stop.side_effect = RuntimeError("oops")
-        MockClient.return_value = instance
+    async def test_stop_handles_errors(self, copilot):
+        copilot.stop.side_effect = RuntimeError("oops")
         a = Agent()
         await a.start()
-        session = AsyncMock()
+        session = AsyncMock(spec=CopilotSession)
         session.destroy.side_effect = RuntimeError("destroy error")
         a._session = session
         await a.stop()
@@ -93,21 +114,16 @@ class TestAgentLifecycle:
 
 class TestAgentSession:
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.build_system_prompt", return_value="system prompt")
-    @patch("app.runtime.agent.agent.get_all_tools", return_value=[])
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_new_session(self, MockClient, mock_tools, mock_prompt):
-        instance = AsyncMock()
-        session = AsyncMock()
-        instance.create_session.return_value = session
-        MockClient.return_value = instance
+    async def test_new_session(self, copilot):
+        session = AsyncMock(spec=CopilotSession)
+        copilot.create_session.return_value = session
 
         a = Agent()
         await a.start()
         result = await a.new_session()
         assert result is session
         assert a.has_session
-        instance.create_session.assert_awaited_once()
+        copilot.create_session.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_new_session_without_start_raises(self):
@@ -118,13 +134,9 @@ class TestAgentSession:
 
 class TestAgentSend:
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.build_system_prompt", return_value="prompt")
-    @patch("app.runtime.agent.agent.get_all_tools", return_value=[])
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_send_creates_session_if_needed(self, MockClient, mock_tools, mock_prompt):
-        instance = AsyncMock()
-        session = AsyncMock()
-        instance.create_session.return_value = session
+    async def test_send_creates_session_if_needed(self, copilot):
+        session = AsyncMock(spec=CopilotSession)
+        copilot.create_session.return_value = session
 
         captured_handler = None
 
@@ -140,7 +152,6 @@ class TestAgentSend:
 
         session.on = mock_on
         session.send = mock_send
-        MockClient.return_value = instance
 
         a = Agent()
         await a.start()
@@ -150,18 +161,8 @@ class TestAgentSend:
 
 class TestAgentListModels:
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_list_models(self, MockClient):
-        model = SimpleNamespace(
-            id="gpt-4.1",
-            name="GPT-4.1",
-            policy=SimpleNamespace(state="enabled"),
-            billing=SimpleNamespace(multiplier=1.0),
-            supported_reasoning_efforts=["low", "high"],
-        )
-        instance = AsyncMock()
-        instance.list_models.return_value = [model]
-        MockClient.return_value = instance
+    async def test_list_models(self, copilot):
+        copilot.list_models.return_value = [_MODEL]
 
         a = Agent()
         await a.start()
@@ -170,11 +171,8 @@ class TestAgentListModels:
         assert models[0]["id"] == "gpt-4.1"
 
     @pytest.mark.asyncio
-    @patch("app.runtime.agent.agent.CopilotClient")
-    async def test_list_models_failure(self, MockClient):
-        instance = AsyncMock()
-        instance.list_models.side_effect = RuntimeError("fail")
-        MockClient.return_value = instance
+    async def test_list_models_failure(self, copilot):
+        copilot.list_models.side_effect = RuntimeError("fail")
 
         a = Agent()
         await a.start()
@@ -189,11 +187,7 @@ class TestAgentListModels:
 
 
 class TestBuildSessionConfig:
-    @patch("app.runtime.agent.agent.build_system_prompt", return_value="sp")
-    @patch("app.runtime.agent.agent.get_all_tools", return_value=[])
-    @patch("app.runtime.agent.agent.McpConfigStore")
-    def test_basic_config(self, MockMcp, mock_tools, mock_prompt):
-        MockMcp.return_value.get_enabled_servers.return_value = {}
+    def test_basic_config(self, mcp_store):
         a = Agent()
         config = a._build_session_config()
         assert config["model"] is not None
@@ -201,23 +195,15 @@ class TestBuildSessionConfig:
         assert "system_message" in config
         assert "hooks" in config
 
-    @patch("app.runtime.agent.agent.build_system_prompt", return_value="sp")
-    @patch("app.runtime.agent.agent.get_all_tools", return_value=[])
-    @patch("app.runtime.agent.agent.McpConfigStore")
-    def test_config_with_sandbox(self, MockMcp, mock_tools, mock_prompt):
-        MockMcp.return_value.get_enabled_servers.return_value = {}
+    def test_config_with_sandbox(self, mcp_store):
         a = Agent()
-        executor = MagicMock()
-        executor.enabled = True
+        executor = SimpleNamespace(enabled=True)
         a.set_sandbox(executor)
         config = a._build_session_config()
         assert "excluded_tools" in config
 
-    @patch("app.runtime.agent.agent.build_system_prompt", return_value="sp")
-    @patch("app.runtime.agent.agent.get_all_tools", return_value=[])
-    @patch("app.runtime.agent.agent.McpConfigStore")
-    def test_mcp_fallback_on_error(self, MockMcp, mock_tools, mock_prompt):
-        MockMcp.return_value.get_enabled_servers.side_effect = RuntimeError("fail")
+    def test_mcp_fallback_on_error(self, mcp_store):
+        mcp_store.return_value.get_enabled_servers.side_effect = RuntimeError("fail")
         a = Agent()
         config = a._build_session_config()
         assert "playwright" in config["mcp_servers"]
@@ -219,6 +219,22 @@ class TestSearchMemoriesTool:
         result = _call_tool(search_memories_tool, {"query": "test"})
         assert result["status"] == "error"
 
+    @patch("app.runtime.services.foundry_iq.search_memories")
+    @patch("app.runtime.state.foundry_iq_config.get_foundry_iq_config")
+    def test_search_runs_off_event_loop(self, mock_config, mock_search):
+        import threading
+
+        from app.runtime.agent.tools import search_memories_tool
+
+        mock_config.return_value.enabled = True
+        mock_config.return_value.is_configured = True
+        threads: list[threading.Thread] = []
+        mock_search.side_effect = lambda *_a: threads.append(threading.current_thread()) or {
+            "status": "ok", "results": [],
+        }
+        _call_tool(search_memories_tool, {"query": "test"})
+        assert threads and threads[0] is not threading.main_thread()
+
 
 class TestGetAllTools:
     def test_returns_tools_list(self):
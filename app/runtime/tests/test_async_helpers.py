@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import threading
+from unittest.mock import patch
+
 import pytest
 
-from app.runtime.util.async_helpers import run_sync
+from app.runtime.util.async_helpers import run_az_sync, run_sync
 
 
 @pytest.mark.asyncio
@@ -32,3 +35,24 @@ async def test_run_sync_exception() -> None:
 
     with pytest.raises(ValueError, match="fail"):
         await run_sync(boom)
+
+
+@pytest.mark.asyncio
+async def test_run_sync_does_not_copy_context() -> None:
+    with patch("contextvars.copy_context") as copy_context:
+        assert await run_sync(lambda: 1) == 1
+    copy_context.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_az_sync_uses_dedicated_pool() -> None:
+    name = await run_az_sync(lambda: threading.current_thread().name)
+    assert name.startswith("az")
+
+
+@pytest.mark.asyncio
+async def test_run_az_sync_kwargs() -> None:
+    def greet(name: str, prefix: str = "Hello") -> str:
+        return f"{prefix}, {name}"
+
+    assert await run_az_sync(greet, "World", prefix="Hi") == "Hi, World"
@@ -0,0 +1,33 @@
+"""Tests for the atomic file helpers."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.runtime.util.atomic_file import atomic_write_bytes, atomic_write_text
+
+
+class TestAtomicWrite:
+    def test_creates_parent_and_writes(self, tmp_path: Path) -> None:
+        target = tmp_path / "nested" / "cfg.json"
+        atomic_write_text(target, "{}\n")
+        assert target.read_text() == "{}\n"
+
+    def test_replaces_existing(self, tmp_path: Path) -> None:
+        target = tmp_path / "cfg.json"
+        target.write_bytes(b"old")
+        atomic_write_bytes(target, b"new")
+        assert target.read_bytes() == b"new"
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @patch("app.runtime.util.atomic_file.os.replace", side_effect=OSError("boom"))
+    def test_failure_keeps_original_and_cleans_up(self, _replace, tmp_path: Path) -> None:
+        target = tmp_path / "cfg.json"
+        target.write_bytes(b"old")
+        with pytest.raises(OSError):
+            atomic_write_bytes(target, b"new")
+        assert target.read_bytes() == b"old"
+        assert not list(tmp_path.glob("*.tmp"))
@@ -85,6 +85,33 @@ class TestAzureCLIJsonCached:
         az.invalidate_cache()
         assert len(az._cache) == 0
 
+    @patch("app.runtime.services.azure._time")
+    @patch.object(AzureCLI, "_run")
+    def test_failure_ttl(self, mock_run, mock_time) -> None:
+        mock_run.return_value = subprocess.CompletedProcess(
+            ["az"], returncode=1, stdout="", stderr="boom"
+        )
+        mock_time.return_value = 1000.0
+        az = AzureCLI()
+        az.json_cached("a", ttl=300, failure_ttl=10)
+        az.json_cached("a", ttl=300, failure_ttl=10)
+        assert mock_run.call_count == 1
+        mock_time.return_value = 1011.0
+        az.json_cached("a", ttl=300, failure_ttl=10)
+        assert mock_run.call_count == 2
+
+    @patch.object(AzureCLI, "_run")
+    def test_zero_failure_ttl_skips_cache(self, mock_run) -> None:
+        mock_run.side_effect = [
+            subprocess.CompletedProcess(["az"], returncode=1, stdout="", stderr="boom"),
+            subprocess.CompletedProcess(["az"], returncode=0, stdout="[1]", stderr=""),
+        ]
+        az = AzureCLI()
+        assert az.json_cached("a", failure_ttl=0) is None
+        assert az.json_cached("a", failure_ttl=0) == [1]
+        assert az.json_cached("a", failure_ttl=0) == [1]
+        assert mock_run.call_count == 2
+
 
 class TestAzureCLIOk:
     @patch.object(AzureCLI, "_run")
@@ -126,6 +153,34 @@ class TestAzureCLIAccountInfo:
         az = AzureCLI()
         assert az.account_info() is None
 
+    @patch("app.runtime.services.azure._time")
+    @patch.object(AzureCLI, "_run")
+    def test_success_cached_for_account_ttl(self, mock_run, mock_time) -> None:
+        mock_run.return_value = subprocess.CompletedProcess(
+            ["az"], returncode=0, stdout='{"id": "sub"}', stderr=""
+        )
+        mock_time.return_value = 1000.0
+        az = AzureCLI()
+        az.account_info()
+        mock_time.return_value = 1000.0 + AzureCLI.CACHE_TTL + 1
+        assert az.account_info() == {"id": "sub"}
+        assert mock_run.call_count == 1
+
+    @patch("app.runtime.services.azure._time")
+    @patch.object(AzureCLI, "_run")
+    def test_failure_cached_for_short_ttl(self, mock_run, mock_time) -> None:
+        mock_run.return_value = subprocess.CompletedProcess(
+            ["az"], returncode=1, stdout="", stderr="Please run 'az login'"
+        )
+        mock_time.return_value = 1000.0
+        az = AzureCLI()
+        az.account_info()
+        az.account_info()
+        assert mock_run.call_count == 1
+        mock_time.return_value = 1000.0 + AzureCLI.CACHE_TTL + 1
+        az.account_info()
+        assert mock_run.call_count == 2
+
 
 class TestValidateTelegramToken:
     @patch("urllib.request.urlopen")
@@ -220,6 +275,21 @@ class TestAzureCLIGetChannels:
             result = az.get_channels()
         assert result.get("telegram") is True
 
+    @patch.object(AzureCLI, "ok", return_value=Result.ok("deleted"))
+    @patch.object(AzureCLI, "json")
+    def test_cached_until_channel_removed(self, mock_json, _mock_ok) -> None:
+        mock_json.return_value = {"properties": {"configuredChannels": ["telegram"]}}
+        az = AzureCLI()
+        with patch("app.runtime.services.azure.cfg") as mock_cfg:
+            mock_cfg.env = MagicMock()
+            mock_cfg.env.read.side_effect = lambda k: "rg" if k == "BOT_RESOURCE_GROUP" else "bot"
+            az.get_channels()
+            az.get_channels()
+            assert mock_json.call_count == 1
+            az.remove_channel("telegram")
+            az.get_channels()
+        assert mock_json.call_count == 2
+
 
 class TestAzureCLIUpdateEndpoint:
     @patch.object(AzureCLI, "json")
@@ -2,17 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import pytest_asyncio
 from aiohttp import web
-from aiohttp.test_utils import TestClient, TestServer
+from aiohttp.streams import StreamReader
+from aiohttp.test_utils import TestClient, TestServer, make_mocked_request
+from botbuilder.schema import Activity
 
 from app.runtime.server.bot_endpoint import BotEndpoint
 
+# Most tests call the handlers directly; the full HTTP path runs against one
+# module-scoped server. Tests share the endpoint and only reset its mocks.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-@pytest.fixture()
+
+@pytest.fixture(scope="module")
 def endpoint() -> BotEndpoint:
     adapter = AsyncMock()
     adapter.process_activity = AsyncMock(return_value=None)
@@ -20,112 +30,107 @@ def endpoint() -> BotEndpoint:
     return BotEndpoint(adapter, bot)
 
 
-def _patch_bot_creds():
-    """Patch cfg in bot_endpoint module to report bot credentials as configured."""
-    return patch.multiple(
-        "app.runtime.server.bot_endpoint.cfg",
-        bot_app_id="test-id",
-        bot_app_password="test-pw",
-    )
+@pytest.fixture(scope="module")
+def app(endpoint: BotEndpoint) -> web.Application:
+    app = web.Application()
+    endpoint.register(app.router)
+    return app
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client(app: web.Application) -> AsyncIterator[TestClient]:
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def _reset_adapter(endpoint: BotEndpoint) -> None:
+    process = endpoint.adapter.process_activity
+    process.reset_mock(return_value=True, side_effect=True)
+    process.return_value = None
+
+
+def _request(
+    method: str, payload: dict | None = None, headers: dict[str, str] | None = None,
+) -> web.Request:
+    """A request for calling a handler directly, without a server round trip."""
+    stream = StreamReader(MagicMock(_reading_paused=False), 2**16, loop=asyncio.get_running_loop())
+    if payload is not None:
+        stream.feed_data(json.dumps(payload).encode())
+    stream.feed_eof()
+    return make_mocked_request(method, "/api/messages", headers=headers, payload=stream)
+
+
+@pytest.fixture()
+def bot_creds(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Report bot credentials as configured."""
+    from app.runtime.server import bot_endpoint
+
+    monkeypatch.setattr(bot_endpoint.cfg, "bot_app_id", "test-id")
+    monkeypatch.setattr(bot_endpoint.cfg, "bot_app_password", "test-pw")
+
+
+_AUTH = {"Authorization": "Bearer fake"}
 
 
 class TestHandle:
-    @pytest.mark.asyncio
     async def test_no_credentials(self, endpoint: BotEndpoint, data_dir: Path) -> None:
-        app = web.Application()
-        endpoint.register(app.router)
-        async with TestClient(TestServer(app)) as client:
-            resp = await client.post("/api/messages", json={"type": "message"})
-            assert resp.status == 503
-            data = await resp.json()
-            assert "not configured" in data["message"].lower()
-
-    @pytest.mark.asyncio
-    async def test_success(self, endpoint: BotEndpoint, data_dir: Path) -> None:
-        with _patch_bot_creds():
-            app = web.Application()
-            endpoint.register(app.router)
-            async with TestClient(TestServer(app)) as client:
-                resp = await client.post(
-                    "/api/messages",
-                    json={"type": "message", "text": "hello"},
-                    headers={"Authorization": "Bearer fake"},
-                )
-                assert resp.status == 200
-
-    @pytest.mark.asyncio
-    async def test_process_returns_response(self, endpoint: BotEndpoint, data_dir: Path) -> None:
-        with _patch_bot_creds():
-            mock_response = MagicMock()
-            mock_response.status = 201
-            mock_response.body = b'{"ok": true}'
-            endpoint.adapter.process_activity.return_value = mock_response
-            app = web.Application()
-            endpoint.register(app.router)
-            async with TestClient(TestServer(app)) as client:
-                resp = await client.post(
-                    "/api/messages",
-                    json={"type": "message"},
-                    headers={"Authorization": "Bearer fake"},
-                )
-                assert resp.status == 201
-
-    @pytest.mark.asyncio
-    async def test_permission_error(self, endpoint: BotEndpoint, data_dir: Path) -> None:
-        with _patch_bot_creds():
-            endpoint.adapter.process_activity.side_effect = PermissionError("denied")
-            app = web.Application()
-            endpoint.register(app.router)
-            async with TestClient(TestServer(app)) as client:
-                resp = await client.post(
-                    "/api/messages",
-                    json={"type": "message"},
-                    headers={"Authorization": "Bearer fake"},
-                )
-                assert resp.status == 401
-
-    @pytest.mark.asyncio
-    async def test_internal_error(self, endpoint: BotEndpoint, data_dir: Path) -> None:
-        with _patch_bot_creds():
-            endpoint.adapter.process_activity.side_effect = RuntimeError("boom")
-            app = web.Application()
-            endpoint.register(app.router)
-            async with TestClient(TestServer(app)) as client:
-                resp = await client.post(
-                    "/api/messages",
-                    json={"type": "message"},
-                    headers={"Authorization": "Bearer fake"},
-                )
-                assert resp.status == 500
-
-    @pytest.mark.asyncio
+        resp = await endpoint.handle(_request("POST", {"type": "message"}))
+        assert resp.status == 503
+        data = json.loads(resp.body)
+        assert "not configured" in data["message"].lower()
+
+    async def test_success(
+        self, endpoint: BotEndpoint, data_dir: Path, bot_creds: None,
+    ) -> None:
+        resp = await endpoint.handle(
+            _request("POST", {"type": "message", "text": "hello"}, _AUTH)
+        )
+        assert resp.status == 200
+
+    async def test_process_returns_response(
+        self, endpoint: BotEndpoint, data_dir: Path, bot_creds: None,
+    ) -> None:
+        mock_response = MagicMock()
+        mock_response.status = 201
+        mock_response.body = b'{"ok": true}'
+        endpoint.adapter.process_activity.return_value = mock_response
+        resp = await endpoint.handle(_request("POST", {"type": "message"}, _AUTH))
+        assert resp.status == 201
+
+    async def test_permission_error(
+        self, endpoint: BotEndpoint, data_dir: Path, bot_creds: None,
+    ) -> None:
+        endpoint.adapter.process_activity.side_effect = PermissionError("denied")
+        resp = await endpoint.handle(_request("POST", {"type": "message"}, _AUTH))
+        assert resp.status == 401
+
+    async def test_internal_error(
+        self, endpoint: BotEndpoint, data_dir: Path, bot_creds: None,
+    ) -> None:
+        endpoint.adapter.process_activity.side_effect = RuntimeError("boom")
+        resp = await endpoint.handle(_request("POST", {"type": "message"}, _AUTH))
+        assert resp.status == 500
+
     async def test_get_messages_probe(self, endpoint: BotEndpoint) -> None:
-        app = web.Application()
-        endpoint.register(app.router)
-        async with TestClient(TestServer(app)) as client:
-            resp = await client.get("/api/messages")
-            assert resp.status == 200
-            data = await resp.json()
-            assert data["status"] == "ok"
-            assert data["method"] == "POST required"
-
-    @pytest.mark.asyncio
-    async def test_passes_activity_object(self, endpoint: BotEndpoint, data_dir: Path) -> None:
+        resp = await endpoint._get_messages(_request("GET"))
+        assert resp.status == 200
+        data = json.loads(resp.body)
+        assert data["status"] == "ok"
+        assert data["method"] == "POST required"
+
+    async def test_passes_activity_object(
+        self, client: TestClient, endpoint: BotEndpoint, data_dir: Path, bot_creds: None,
+    ) -> None:
         """process_activity must receive an Activity, not a raw dict."""
-        from botbuilder.schema import Activity
-
-        with _patch_bot_creds():
-            app = web.Application()
-            endpoint.register(app.router)
-            async with TestClient(TestServer(app)) as client:
-                resp = await client.post(
-                    "/api/messages",
-                    json={"type": "message", "text": "hi", "channelId": "telegram"},
-                    headers={"Authorization": "Bearer fake"},
-                )
-                assert resp.status == 200
-                call_args = endpoint.adapter.process_activity.call_args
-                activity_arg = call_args[0][0]
-                assert isinstance(activity_arg, Activity)
-                assert activity_arg.type == "message"
-                assert activity_arg.channel_id == "telegram"
+        resp = await client.post(
+            "/api/messages",
+            json={"type": "message", "text": "hi", "channelId": "telegram"},
+            headers={"Authorization": "Bearer fake"},
+        )
+        assert resp.status == 200
+        call_args = endpoint.adapter.process_activity.call_args
+        activity_arg = call_args[0][0]
+        assert isinstance(activity_arg, Activity)
+        assert activity_arg.type == "message"
+        assert activity_arg.channel_id == "telegram"
@@ -2,13 +2,29 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from app.runtime.messaging.bot import Bot, _BotChannelContext, _is_authorized, _reply
 
 
+@pytest.fixture()
+def bot_cfg(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    from app.runtime.messaging import bot
+
+    cfg = SimpleNamespace(telegram_whitelist=[])
+    monkeypatch.setattr(bot, "cfg", cfg)
+    return cfg
+
+
+def _ctx(channel_id: str, user_id: str | None = None) -> SimpleNamespace:
+    """A turn context carrying only what _is_authorized reads."""
+    sender = SimpleNamespace(id=user_id) if user_id else None
+    return SimpleNamespace(activity=SimpleNamespace(channel_id=channel_id, from_property=sender))
+
+
 class TestBotChannelContext:
     def test_conversation_refs_count(self) -> None:
         store = MagicMock()
@@ -17,14 +33,9 @@ class TestBotChannelContext:
         assert ctx.conversation_refs_count == 3
 
     def test_connected_channels(self) -> None:
-        ref1 = MagicMock()
-        ref1.channel_id = "telegram"
-        ref2 = MagicMock()
-        ref2.channel_id = "webchat"
-        ref3 = MagicMock()
-        ref3.channel_id = None
+        refs = [SimpleNamespace(channel_id=c) for c in ("telegram", "webchat", None)]
         store = MagicMock()
-        store.get_all.return_value = [ref1, ref2, ref3]
+        store.get_all.return_value = refs
         ctx = _BotChannelContext(store)
         channels = ctx.connected_channels
         assert "telegram" in channels
@@ -40,51 +51,29 @@ class TestBotChannelContext:
 
 
 class TestIsAuthorized:
-    def test_non_telegram_always_authorized(self) -> None:
-        turn_ctx = MagicMock()
-        turn_ctx.activity.channel_id = "webchat"
-        with patch("app.runtime.messaging.bot.cfg") as mock_cfg:
-            mock_cfg.telegram_whitelist = ["123"]
-            assert _is_authorized(turn_ctx) is True
-
-    def test_telegram_no_whitelist(self) -> None:
-        turn_ctx = MagicMock()
-        turn_ctx.activity.channel_id = "telegram"
-        with patch("app.runtime.messaging.bot.cfg") as mock_cfg:
-            mock_cfg.telegram_whitelist = []
-            assert _is_authorized(turn_ctx) is True
-
-    def test_telegram_authorized(self) -> None:
-        turn_ctx = MagicMock()
-        turn_ctx.activity.channel_id = "telegram"
-        turn_ctx.activity.from_property.id = "user-123"
-        with patch("app.runtime.messaging.bot.cfg") as mock_cfg:
-            mock_cfg.telegram_whitelist = ["user-123", "user-456"]
-            assert _is_authorized(turn_ctx) is True
-
-    def test_telegram_blocked(self) -> None:
-        turn_ctx = MagicMock()
-        turn_ctx.activity.channel_id = "telegram"
-        turn_ctx.activity.from_property.id = "user-999"
-        with patch("app.runtime.messaging.bot.cfg") as mock_cfg:
-            mock_cfg.telegram_whitelist = ["user-123"]
-            assert _is_authorized(turn_ctx) is False
-
-    def test_telegram_no_from_property(self) -> None:
-        turn_ctx = MagicMock()
-        turn_ctx.activity.channel_id = "telegram"
-        turn_ctx.activity.from_property = None
-        with patch("app.runtime.messaging.bot.cfg") as mock_cfg:
-            mock_cfg.telegram_whitelist = ["user-123"]
-            assert _is_authorized(turn_ctx) is False
-
-    def test_case_insensitive_channel(self) -> None:
-        turn_ctx = MagicMock()
-        turn_ctx.activity.channel_id = "Telegram"
-        turn_ctx.activity.from_property.id = "user-123"
-        with patch("app.runtime.messaging.bot.cfg") as mock_cfg:
-            mock_cfg.telegram_whitelist = ["user-123"]
-            assert _is_authorized(turn_ctx) is True
+    def test_non_telegram_always_authorized(self, bot_cfg: SimpleNamespace) -> None:
+        bot_cfg.telegram_whitelist = ["123"]
+        assert _is_authorized(_ctx("webchat")) is True
+
+    def test_telegram_no_whitelist(self, bot_cfg: SimpleNamespace) -> None:
+        bot_cfg.telegram_whitelist = []
+        assert _is_authorized(_ctx("telegram")) is True
+
+    def test_telegram_authorized(self, bot_cfg: SimpleNamespace) -> None:
+        bot_cfg.telegram_whitelist = ["user-123", "user-456"]
+        assert _is_authorized(_ctx("telegram", "user-123")) is True
+
+    def test_telegram_blocked(self, bot_cfg: SimpleNamespace) -> None:
+        bot_cfg.telegram_whitelist = ["user-123"]
+        assert _is_authorized(_ctx("telegram", "user-999")) is False
+
+    def test_telegram_no_from_property(self, bot_cfg: SimpleNamespace) -> None:
+        bot_cfg.telegram_whitelist = ["user-123"]
+        assert _is_authorized(_ctx("telegram")) is False
+
+    def test_case_insensitive_channel(self, bot_cfg: SimpleNamespace) -> None:
+        bot_cfg.telegram_whitelist = ["user-123"]
+        assert _is_authorized(_ctx("Telegram", "user-123")) is True
 
 
 class TestReply:
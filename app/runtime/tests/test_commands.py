@@ -10,18 +10,25 @@ import pytest
 from app.runtime.config.settings import cfg
 from app.runtime.messaging.commands import CommandContext, CommandDispatcher
 
+_MODEL = {
+    "id": "gpt-4.1", "name": "GPT-4.1", "policy": "enabled", "billing_multiplier": 1.0,
+    "reasoning_efforts": [], "supported_reasoning_efforts": [],
+}
 
-@pytest.fixture()
+
+@pytest.fixture(scope="module")
 def agent() -> AsyncMock:
-    a = AsyncMock()
-    a.has_session = True
-    a.request_counts = {"gpt-4.1": 5}
-    a.send = AsyncMock(return_value="response")
-    a.new_session = AsyncMock()
-    a.list_models = AsyncMock(return_value=[
-        {"id": "gpt-4.1", "name": "GPT-4.1", "policy": "enabled", "billing_multiplier": 1.0, "reasoning_efforts": [], "supported_reasoning_efforts": []},
-    ])
-    return a
+    """One agent mock for the module; ``_reset_agent`` restores it before each test."""
+    return AsyncMock()
+
+
+@pytest.fixture(autouse=True)
+def _reset_agent(agent: AsyncMock) -> None:
+    agent.reset_mock(return_value=True, side_effect=True)
+    agent.has_session = True
+    agent.request_counts = {"gpt-4.1": 5}
+    agent.send.return_value = "response"
+    agent.list_models.return_value = [_MODEL]
 
 
 @pytest.fixture()
@@ -52,6 +59,13 @@ class TestTryHandle:
         assert not handled
         reply.assert_not_awaited()
 
+    @pytest.mark.asyncio
+    async def test_mentions_command_mid_text(self, dispatcher: CommandDispatcher) -> None:
+        reply = AsyncMock()
+        handled = await dispatcher.try_handle("try /help later", reply, "web")
+        assert not handled
+        reply.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_case_insensitive(self, dispatcher: CommandDispatcher) -> None:
         reply = AsyncMock()
@@ -134,3 +134,27 @@ class TestDeployStateStore:
         store.update(rec)
         reloaded = DeployStateStore(path=tmp_path / "deploys.json")
         assert len(reloaded.get("u1").resources) == 1
+
+    def test_batch_writes_once(self, tmp_path: Path) -> None:
+        db = tmp_path / "deploys.json"
+        store = DeployStateStore(path=db)
+        with store.batch():
+            rec = DeploymentRecord.new("local", deploy_id="b1")
+            store.register(rec)
+            rec.add_resource("Microsoft.KeyVault/vaults", "rg1", "kv1")
+            store.update(rec)
+            store.register(DeploymentRecord.new("aca", deploy_id="b2"))
+            store.remove("b2")
+            assert not db.exists()
+        reloaded = DeployStateStore(path=db)
+        assert len(reloaded.get("b1").resources) == 1
+        assert reloaded.get("b2") is None
+
+    def test_nested_batch_writes_on_outer_exit(self, tmp_path: Path) -> None:
+        db = tmp_path / "deploys.json"
+        store = DeployStateStore(path=db)
+        with store.batch():
+            with store.batch():
+                store.register(DeploymentRecord.new("local", deploy_id="n1"))
+            assert not db.exists()
+        assert DeployStateStore(path=db).get("n1") is not None
@@ -37,6 +37,9 @@ class TestExtractToolName:
         data = SimpleNamespace(tool_name=None, name=None)
         assert _extract_tool_name(data, "custom") == "custom"
 
+    def test_missing_attributes_fall_back(self):
+        assert _extract_tool_name(SimpleNamespace(), "custom") == "custom"
+
 
 class TestEventHandler:
     def test_init_defaults(self):
@@ -38,6 +38,13 @@ class TestMarkdownToTelegram:
     def test_empty_string(self) -> None:
         assert markdown_to_telegram("") == ""
 
+    def test_multiple_code_spans_restored_in_order(self) -> None:
+        src = "`a` then ```sh\nls\n``` and `b`"
+        assert markdown_to_telegram(src) == src
+
+    def test_plain_text_stripped(self) -> None:
+        assert markdown_to_telegram("  hello world\n") == "hello world"
+
 
 class TestStripMarkdown:
     def test_bold(self) -> None:
@@ -2,19 +2,24 @@
 
 from __future__ import annotations
 
-import hashlib
+import os
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-import pytest
+import orjson
 
 from app.runtime.services.foundry_iq import (
+    _SESSION,
     _chunk_text,
     _discover_memory_files,
     _file_to_doc_id,
+    _get_embeddings,
+    _get_entra_token,
     _search_headers,
     _search_url,
     get_index_stats,
+    index_memories,
     test_search_connection,
 )
 
@@ -54,6 +59,16 @@ class TestChunkText:
         for p in paragraphs:
             assert p in rejoined
 
+    def test_collapses_blank_runs(self) -> None:
+        text = "first\n\n\n\nsecond\n\nthird"
+        assert _chunk_text(text, max_chars=14) == ["first\n\nsecond", "third"]
+
+    def test_large_input_respects_limit(self) -> None:
+        text = "\n\n".join(f"para {i}" for i in range(20000))
+        chunks = _chunk_text(text, max_chars=4000)
+        assert all(len(c) <= 4000 for c in chunks)
+        assert "\n\n".join(chunks) == text
+
 
 class TestFileToDocId:
     def test_deterministic(self) -> None:
@@ -114,6 +129,20 @@ class TestDiscoverMemoryFiles:
             result = _discover_memory_files()
         assert len(result) == 2
 
+    def test_ignores_non_markdown_entries(self, tmp_path: Path) -> None:
+        topics = tmp_path / "topics"
+        topics.mkdir()
+        (topics / "b.md").write_text("b")
+        (topics / "a.md").write_text("a")
+        (topics / "notes.txt").write_text("x")
+        (topics / ".hidden.md").write_text("x")
+        (topics / "dir.md").mkdir()
+        with patch("app.runtime.services.foundry_iq.cfg") as mock_cfg:
+            mock_cfg.memory_daily_dir = tmp_path / "daily"
+            mock_cfg.memory_topics_dir = topics
+            result = _discover_memory_files()
+        assert [r["path"] for r in result] == [str(topics / "a.md"), str(topics / "b.md")]
+
 
 class TestSearchHeaders:
     def test_includes_api_key(self) -> None:
@@ -149,7 +178,7 @@ class TestGetIndexStats:
         assert result["document_count"] == 0
         assert result.get("index_missing") is True
 
-    @patch("app.runtime.services.foundry_iq.requests")
+    @patch("app.runtime.services.foundry_iq._SESSION")
     def test_success(self, mock_requests) -> None:
         config = MagicMock()
         config.is_configured = True
@@ -164,7 +193,7 @@ class TestGetIndexStats:
         assert result["status"] == "ok"
         assert result["document_count"] == 42
 
-    @patch("app.runtime.services.foundry_iq.requests")
+    @patch("app.runtime.services.foundry_iq._SESSION")
     def test_404(self, mock_requests) -> None:
         config = MagicMock()
         config.is_configured = True
@@ -178,7 +207,7 @@ class TestGetIndexStats:
         result = get_index_stats(config)
         assert result.get("index_missing") is True
 
-    @patch("app.runtime.services.foundry_iq.requests")
+    @patch("app.runtime.services.foundry_iq._SESSION")
     def test_connection_error(self, mock_requests) -> None:
         config = MagicMock()
         config.is_configured = True
@@ -191,7 +220,7 @@ class TestGetIndexStats:
 
 
 class TestTestSearchConnection:
-    @patch("app.runtime.services.foundry_iq.requests")
+    @patch("app.runtime.services.foundry_iq._SESSION")
     def test_success(self, mock_requests) -> None:
         config = MagicMock()
         config.config.search_endpoint = "https://search.example.com"
@@ -204,7 +233,7 @@ class TestTestSearchConnection:
         assert result["status"] == "ok"
         assert "2 index" in result["message"]
 
-    @patch("app.runtime.services.foundry_iq.requests")
+    @patch("app.runtime.services.foundry_iq._SESSION")
     def test_failure(self, mock_requests) -> None:
         config = MagicMock()
         config.config.search_endpoint = "https://search.example.com"
@@ -217,7 +246,7 @@ class TestTestSearchConnection:
         result = test_search_connection(config)
         assert result["status"] == "error"
 
-    @patch("app.runtime.services.foundry_iq.requests")
+    @patch("app.runtime.services.foundry_iq._SESSION")
     def test_exception(self, mock_requests) -> None:
         config = MagicMock()
         config.config.search_endpoint = "https://search.example.com"
@@ -225,3 +254,237 @@ class TestTestSearchConnection:
         mock_requests.get.side_effect = RuntimeError("boom")
         result = test_search_connection(config)
         assert result["status"] == "error"
+
+
+def _configured_store() -> MagicMock:
+    config = MagicMock()
+    config.is_configured = True
+    config.config.index_name = "idx"
+    config.config.search_endpoint = "https://search.example.com"
+    config.config.search_api_key = "key"
+    config.config.embedding_endpoint = "https://aoai.example.com"
+    config.config.embedding_model = "text-embedding-3-large"
+    config.config.embedding_api_key = "ekey"
+    config.config.last_indexed_at = ""
+    return config
+
+
+class TestIndexMemories:
+    @patch("app.runtime.services.foundry_iq.ensure_index", return_value={"status": "ok"})
+    @patch("app.runtime.services.foundry_iq._discover_memory_files")
+    @patch("app.runtime.services.foundry_iq._get_embeddings")
+    @patch("app.runtime.services.foundry_iq._SESSION")
+    def test_embeds_in_batches(
+        self, mock_requests, mock_embed, mock_discover, _mock_index, tmp_path: Path,
+    ) -> None:
+        files = []
+        for n in range(20):
+            path = tmp_path / f"2024-01-{n:02d}.md"
+            path.write_text(f"note {n}")
+            files.append({"path": str(path), "title": "t", "source_type": "daily", "date": ""})
+        mock_discover.return_value = files
+        mock_embed.side_effect = lambda texts, _config: [[0.1] for _ in texts]
+        upload = MagicMock(ok=True)
+        upload.json.return_value = {"value": [{"statusCode": 200}] * 20}
+        mock_requests.post.return_value = upload
+
+        result = index_memories(_configured_store())
+
+        assert result["indexed"] == 20
+        assert [len(c.args[0]) for c in mock_embed.call_args_list] == [16, 4]
+
+    @patch("app.runtime.services.foundry_iq.ensure_index", return_value={"status": "ok"})
+    @patch("app.runtime.services.foundry_iq._discover_memory_files")
+    @patch("app.runtime.services.foundry_iq._get_embeddings", side_effect=RuntimeError("429"))
+    def test_embedding_failure_reported_per_chunk(
+        self, _mock_embed, mock_discover, _mock_index, tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "a.md"
+        path.write_text("hello")
+        mock_discover.return_value = [
+            {"path": str(path), "title": "t", "source_type": "daily", "date": ""},
+        ]
+        result = index_memories(_configured_store())
+        assert result["indexed"] == 0
+        assert result["errors"] == [f"Embedding failed for {path}[0]: 429"]
+
+
+    @patch("app.runtime.services.foundry_iq.ensure_index", return_value={"status": "ok"})
+    @patch("app.runtime.services.foundry_iq._discover_memory_files")
+    @patch("app.runtime.services.foundry_iq._get_embeddings")
+    @patch("app.runtime.services.foundry_iq._SESSION")
+    def test_skips_files_unchanged_since_last_run(
+        self, mock_requests, mock_embed, mock_discover, _mock_index, tmp_path: Path,
+    ) -> None:
+        old, new = tmp_path / "old.md", tmp_path / "new.md"
+        old.write_text("old")
+        new.write_text("new")
+        os.utime(old, (1_000_000_000, 1_000_000_000))
+        mock_discover.return_value = [
+            {"path": str(p), "title": "t", "source_type": "daily", "date": ""} for p in (old, new)
+        ]
+        mock_embed.side_effect = lambda texts, _config: [[0.1] for _ in texts]
+        upload = MagicMock(ok=True)
+        upload.json.return_value = {"value": [{"statusCode": 200}]}
+        mock_requests.post.return_value = upload
+        config = _configured_store()
+        config.config.last_indexed_at = "2020-01-01T00:00:00+00:00"
+
+        result = index_memories(config)
+
+        assert result["skipped"] == 1
+        assert mock_embed.call_args.args[0] == ["new"]
+        config.set_last_indexed.assert_called_once()
+
+    @patch("app.runtime.services.foundry_iq.ensure_index")
+    @patch("app.runtime.services.foundry_iq._discover_memory_files")
+    @patch("app.runtime.services.foundry_iq._get_embeddings")
+    @patch("app.runtime.services.foundry_iq._SESSION")
+    def test_new_index_reindexes_everything(
+        self, mock_requests, mock_embed, mock_discover, mock_index, tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "old.md"
+        path.write_text("old")
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+        mock_index.return_value = {"status": "ok", "created": True}
+        mock_discover.return_value = [
+            {"path": str(path), "title": "t", "source_type": "daily", "date": ""},
+        ]
+        mock_embed.side_effect = lambda texts, _config: [[0.1] for _ in texts]
+        upload = MagicMock(ok=True)
+        upload.json.return_value = {"value": [{"statusCode": 201}]}
+        mock_requests.post.return_value = upload
+        config = _configured_store()
+        config.config.last_indexed_at = "2020-01-01T00:00:00+00:00"
+
+        result = index_memories(config)
+
+        assert result["indexed"] == 1
+        assert result["skipped"] == 0
+
+    @patch("app.runtime.services.foundry_iq.ensure_index", return_value={"status": "ok"})
+    @patch("app.runtime.services.foundry_iq._discover_memory_files")
+    @patch("app.runtime.services.foundry_iq._get_embeddings", side_effect=RuntimeError("429"))
+    def test_failed_run_keeps_watermark(
+        self, _mock_embed, mock_discover, _mock_index, tmp_path: Path,
+    ) -> None:
+        path = tmp_path / "a.md"
+        path.write_text("hello")
+        mock_discover.return_value = [
+            {"path": str(path), "title": "t", "source_type": "daily", "date": ""},
+        ]
+        config = _configured_store()
+        index_memories(config)
+        config.set_last_indexed.assert_not_called()
+
+    @patch("app.runtime.services.foundry_iq.ensure_index", return_value={"status": "ok"})
+    @patch("app.runtime.services.foundry_iq._discover_memory_files")
+    @patch("app.runtime.services.foundry_iq._get_embeddings")
+    @patch("app.runtime.services.foundry_iq._SESSION")
+    def test_uploads_batches_and_collects_failures(
+        self, mock_requests, mock_embed, mock_discover, _mock_index, tmp_path: Path,
+    ) -> None:
+        files = []
+        for n in range(250):
+            path = tmp_path / f"{n}.md"
+            path.write_text(f"note {n}")
+            files.append({"path": str(path), "title": "t", "source_type": "topic", "date": ""})
+        mock_discover.return_value = files
+        mock_embed.side_effect = lambda texts, _config: [[0.1] for _ in texts]
+
+        def _post(*_args, data: bytes, **_kwargs):
+            count = data.count(b'"id"')
+            if count == 50:
+                return MagicMock(ok=False, status_code=503, text="busy")
+            resp = MagicMock(ok=True)
+            resp.json.return_value = {"value": [{"statusCode": 201}] * count}
+            return resp
+
+        mock_requests.post.side_effect = _post
+        result = index_memories(_configured_store())
+
+        assert mock_requests.post.call_count == 3
+        assert result["indexed"] == 200
+        assert result["errors"] == ["Batch upload failed: 503 busy"]
+
+    @patch("app.runtime.services.foundry_iq.ensure_index", return_value={"status": "ok"})
+    @patch("app.runtime.services.foundry_iq._discover_memory_files")
+    @patch("app.runtime.services.foundry_iq._get_embeddings")
+    @patch("app.runtime.services.foundry_iq._SESSION")
+    def test_partial_batch_failure_keeps_watermark(
+        self, mock_requests, mock_embed, mock_discover, _mock_index, tmp_path: Path,
+    ) -> None:
+        files = []
+        for name in ("a", "b"):
+            path = tmp_path / f"{name}.md"
+            path.write_text(name)
+            files.append({"path": str(path), "title": "t", "source_type": "topic", "date": ""})
+        mock_discover.return_value = files
+        mock_embed.side_effect = lambda texts, _config: [[0.1] for _ in texts]
+        upload = MagicMock(ok=True, status_code=207)
+        upload.json.return_value = {"value": [
+            {"key": "a", "status": True, "statusCode": 201},
+            {"key": "b", "status": False, "statusCode": 422, "errorMessage": "bad vector"},
+        ]}
+        mock_requests.post.return_value = upload
+        config = _configured_store()
+
+        result = index_memories(config)
+
+        assert result["indexed"] == 1
+        assert result["errors"] == ["1 of 2 documents failed to index: b: bad vector"]
+        config.set_last_indexed.assert_not_called()
+
+
+class TestSession:
+    def test_retries_throttling_but_not_timeouts(self) -> None:
+        retry = _SESSION.get_adapter("https://search.example.net").max_retries
+        assert retry.status == 3
+        assert set(retry.status_forcelist) == {429, 503}
+        assert retry.read == 0
+        assert retry.connect == 1
+
+
+class TestGetEmbeddings:
+    @patch("app.runtime.services.foundry_iq._SESSION")
+    def test_orders_by_index(self, mock_requests) -> None:
+        resp = MagicMock()
+        resp.content = orjson.dumps({"data": [
+            {"index": 1, "embedding": [2.0]}, {"index": 0, "embedding": [1.0]},
+        ]})
+        mock_requests.post.return_value = resp
+        assert _get_embeddings(["a", "b"], _configured_store()) == [[1.0], [2.0]]
+
+    @patch("app.runtime.services.foundry_iq._SESSION")
+    def test_decodes_response_bytes(self, mock_requests) -> None:
+        resp = MagicMock()
+        resp.content = b'{"data": [{"index": 0, "embedding": [0.25, -1.5, 3.0]}]}'
+        resp.json.side_effect = AssertionError("response should be decoded from bytes")
+        mock_requests.post.return_value = resp
+        assert _get_embeddings(["hello"], _configured_store()) == [[0.25, -1.5, 3.0]]
+        kwargs = mock_requests.post.call_args.kwargs
+        assert orjson.loads(kwargs["data"])["input"] == ["hello"]
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+
+class TestGetEntraToken:
+    @patch("azure.identity.DefaultAzureCredential")
+    def test_reuses_credential_and_token(self, mock_cred_cls) -> None:
+        mock_cred_cls.return_value.get_token.return_value = MagicMock(
+            token="tok", expires_on=time.time() + 3600,
+        )
+        assert _get_entra_token() == "tok"
+        assert _get_entra_token() == "tok"
+        mock_cred_cls.assert_called_once()
+        mock_cred_cls.return_value.get_token.assert_called_once()
+
+    @patch("azure.identity.DefaultAzureCredential")
+    def test_refreshes_near_expiry(self, mock_cred_cls) -> None:
+        get_token = mock_cred_cls.return_value.get_token
+        get_token.side_effect = [
+            MagicMock(token="old", expires_on=time.time() + 30),
+            MagicMock(token="new", expires_on=time.time() + 3600),
+        ]
+        assert _get_entra_token() == "old"
+        assert _get_entra_token() == "new"
+        mock_cred_cls.assert_called_once()
@@ -13,6 +13,7 @@ from app.runtime.services.keyvault import (
     is_kv_ref,
     make_ref,
     resolve_if_kv_ref,
+    resolve_many,
     secret_name_to_env_key,
 )
 
@@ -102,6 +103,24 @@ class TestKeyVaultClient:
         kv._ensure_init()
         assert not kv.enabled
 
+    def test_reentrant_init_does_not_publish_empty_url(self):
+        client = KeyVaultClient()
+        nested: list[bool] = []
+
+        def configured_url():
+            # Importing settings resolves @kv: refs, which re-enters _ensure_init.
+            nested.append(client.enabled)
+            return "https://test.vault.azure.net"
+
+        with (
+            patch.object(client, "_configured_url", side_effect=configured_url) as lookup,
+            patch.object(client, "_connect") as connect,
+        ):
+            client._ensure_init()
+        assert nested == [False]
+        lookup.assert_called_once()
+        connect.assert_called_once_with("https://test.vault.azure.net")
+
     def test_is_firewall_error(self):
         assert KeyVaultClient._is_firewall_error(
             Exception("ForbiddenByConnection: access denied")
@@ -114,6 +133,45 @@ class TestKeyVaultClient:
         )
 
 
+class TestSecretCache:
+    def _enabled_client(self) -> KeyVaultClient:
+        kv = KeyVaultClient()
+        kv._initialised = True
+        kv._url = "https://test.vault.azure.net"
+        kv._client = MagicMock()
+        kv._client.get_secret.return_value = MagicMock(value="s3cret")
+        return kv
+
+    def test_resolved_once(self):
+        kv = self._enabled_client()
+        assert kv.resolve_value("@kv:token") == "s3cret"
+        assert kv.resolve_value("@kv:token") == "s3cret"
+        kv._client.get_secret.assert_called_once_with("token")
+
+    def test_expires(self):
+        kv = self._enabled_client()
+        kv.SECRET_CACHE_TTL = 0
+        kv.resolve_value("@kv:token")
+        kv.resolve_value("@kv:token")
+        assert kv._client.get_secret.call_count == 2
+
+    def test_store_writes_through(self):
+        kv = self._enabled_client()
+        kv.resolve_value("@kv:token")
+        kv.store("token", "rotated")
+        assert kv.resolve_value("@kv:token") == "rotated"
+        kv._client.get_secret.assert_called_once()
+
+    def test_delete_and_reinit_invalidate(self):
+        kv = self._enabled_client()
+        kv.resolve_value("@kv:token")
+        kv.delete("token")
+        kv.resolve_value("@kv:token")
+        assert kv._client.get_secret.call_count == 2
+        kv.reinit()
+        assert kv._secret_cache == {}
+
+
 class TestResolveIfKvRef:
     def test_plain_value(self):
         result = resolve_if_kv_ref("plain-text")
@@ -123,3 +181,71 @@ class TestResolveIfKvRef:
         """When KV is disabled, a KV reference must NOT leak through as a raw string."""
         result = resolve_if_kv_ref("@kv:test-secret")
         assert result == ""
+
+
+class TestResolveMany:
+    @patch("app.runtime.services.keyvault.resolve_if_kv_ref")
+    def test_resolves_distinct_refs_only(self, mock_resolve):
+        mock_resolve.side_effect = lambda v: v.upper()
+        result = resolve_many(["@kv:a", "plain", "@kv:b", "@kv:a"])
+        assert result == {"@kv:a": "@KV:A", "@kv:b": "@KV:B"}
+        assert mock_resolve.call_count == 2
+
+    @patch("app.runtime.services.keyvault.resolve_if_kv_ref")
+    def test_failures_omitted(self, mock_resolve):
+        def _resolve(v):
+            if v == "@kv:bad":
+                raise RuntimeError("denied")
+            return "ok"
+
+        mock_resolve.side_effect = _resolve
+        assert resolve_many(["@kv:good", "@kv:bad"]) == {"@kv:good": "ok"}
+
+    @patch.dict("os.environ", {"KEY_VAULT_URL": "https://test.vault.azure.net"})
+    def test_concurrent_first_use_waits_for_init(self):
+        import time
+
+        client = KeyVaultClient()
+
+        def slow_credential():
+            time.sleep(0.2)
+            return MagicMock()
+
+        secret_client = MagicMock()
+        secret_client.return_value.get_secret.side_effect = lambda n: MagicMock(value=f"real-{n}")
+        with (
+            patch("app.runtime.services.keyvault.kv", client),
+            patch("azure.identity.DefaultAzureCredential", side_effect=slow_credential),
+            patch("azure.keyvault.secrets.SecretClient", secret_client),
+        ):
+            result = resolve_many(["@kv:a", "@kv:b", "@kv:c"])
+        assert result == {"@kv:a": "real-a", "@kv:b": "real-b", "@kv:c": "real-c"}
+
+    def test_concurrent_firewall_errors_allow_ip_once(self):
+        import threading
+        import time
+
+        client = KeyVaultClient()
+        client._initialised = True
+        client._url = "https://test.vault.azure.net"
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get_secret(name):
+            if not client._ip_allowed:
+                barrier.wait()
+                raise Exception("ForbiddenByConnection")
+            return MagicMock(value=f"real-{name}")
+
+        def allow_current_ip():
+            time.sleep(0.2)
+            return True
+
+        client._client = MagicMock()
+        client._client.get_secret.side_effect = get_secret
+        with (
+            patch("app.runtime.services.keyvault.kv", client),
+            patch.object(client, "_allow_current_ip", side_effect=allow_current_ip) as allow,
+        ):
+            result = resolve_many(["@kv:a", "@kv:b", "@kv:c"])
+        assert result == {"@kv:a": "real-a", "@kv:b": "real-b", "@kv:c": "real-c"}
+        allow.assert_called_once()
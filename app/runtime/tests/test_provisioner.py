@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -18,6 +21,8 @@ def az() -> MagicMock:
     mock = MagicMock()
     mock.ok.return_value = (True, "ok")
     mock.json.return_value = None
+    mock.json_cached.return_value = None
+    mock.STATUS_CACHE_TTL = 5
     mock.update_endpoint.return_value = Result.ok("Endpoint updated")
     mock.validate_telegram_token.return_value = (True, "valid")
     mock.configure_telegram.return_value = (True, "configured")
@@ -152,3 +157,86 @@ class TestProvision:
         assert tunnel_steps[0]["status"] == "ok"
         deployer.delete.assert_called_once()
         deployer.deploy.assert_called_once()
+
+
+class TestDecommission:
+    """Decommission reads bot/RG state through the short-lived az cache."""
+
+    def test_uses_cached_lookups(self, provisioner, az, deployer, data_dir):
+        cfg.write_env(BOT_NAME="my-bot", BOT_RESOURCE_GROUP="my-rg")
+        deployer.delete.return_value = MagicMock(ok=True, steps=[])
+        az.json_cached.return_value = {"name": "exists"}
+
+        steps = provisioner.decommission()
+
+        cached = [c.args for c in az.json_cached.call_args_list]
+        assert ("bot", "show", "--resource-group", "my-rg", "--name", "my-bot") in cached
+        assert ("group", "show", "--name", "my-rg") in cached
+        az.json.assert_not_called()
+        az.invalidate_cache.assert_any_call("group", "show", "--name", "my-rg")
+        assert any(s["step"] == "resource_group_delete" and s["status"] == "ok" for s in steps)
+
+
+class TestAsyncLifecycle:
+    """Async wrappers run off the loop and never overlap."""
+
+    @pytest.mark.asyncio
+    async def test_runs_are_serialised(self, provisioner):
+        active = 0
+        overlap = False
+        guard = threading.Lock()
+
+        def _slow() -> list[dict]:
+            nonlocal active, overlap
+            with guard:
+                active += 1
+                overlap = overlap or active > 1
+            time.sleep(0.05)
+            with guard:
+                active -= 1
+            return [{"step": "x", "status": "ok"}]
+
+        with patch.object(provisioner, "provision", side_effect=_slow), \
+                patch.object(provisioner, "decommission", side_effect=_slow):
+            results = await asyncio.gather(
+                provisioner.provision_async(),
+                provisioner.decommission_async(),
+                provisioner.redeploy_async(),
+            )
+
+        assert not overlap
+        assert results[2] == ([{"step": "x", "status": "ok"}], [{"step": "x", "status": "ok"}])
+
+
+class TestTelegramPrecheck:
+    """Telegram token validation overlaps with tunnel and bot deployment."""
+
+    def test_validation_started_before_tunnel(
+        self, provisioner, tunnel, az, deployer, store, data_dir,
+    ):
+        order: list[str] = []
+        started = threading.Event()
+
+        def _validate(_token):
+            order.append("validate")
+            started.set()
+            return (True, "@bot")
+
+        def _start(_port):
+            started.wait(timeout=2)
+            order.append("tunnel")
+            return Result.ok("started", value="https://t.trycloudflare.com")
+
+        az.validate_telegram_token.side_effect = _validate
+        tunnel.start.side_effect = _start
+        deployer.deploy.return_value = MagicMock(ok=True, steps=[], bot_handle="b", error="")
+        store.channels.telegram.token = "123:abc"
+
+        with patch.object(
+            type(store), "bot_configured", new_callable=lambda: property(lambda self: True),
+        ):
+            steps = provisioner.provision()
+
+        assert order == ["validate", "tunnel"]
+        az.validate_telegram_token.assert_called_once_with("123:abc")
+        assert any(s["step"] == "telegram_validate" and s["status"] == "ok" for s in steps)
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import json
+import os
+import threading
 from pathlib import Path
+from unittest.mock import patch
 
-from app.runtime.state.session_store import SessionStore
+from app.runtime.state.session_store import SessionStore, ToolCall
 
 
 class TestSessionStore:
@@ -88,11 +92,235 @@ class TestSessionStore:
         sessions_dir = tmp_path / "sessions"
         sessions_dir.mkdir(parents=True, exist_ok=True)
         # Manually create an empty session file (legacy)
-        import json
         (sessions_dir / "stale.json").write_text(
             json.dumps({"id": "stale", "messages": [], "model": "x",
                         "created_at": 0, "updated_at": 0, "title": ""})
         )
         store = SessionStore(directory=sessions_dir)
+        store._maintenance.join()
         assert not (sessions_dir / "stale.json").exists()
         assert store.list_sessions() == []
+
+    def test_list_sessions_reuses_metadata(self, tmp_path: Path) -> None:
+        store = SessionStore(directory=tmp_path / "sessions")
+        store.start_session("s1")
+        store.record("user", "hello there")
+        store._maintenance.join()
+        store.list_sessions()
+        with patch("app.runtime.state.session_store._read_session_file") as mock_read:
+            sessions = store.list_sessions()
+        mock_read.assert_not_called()
+        assert sessions[0]["title"] == "hello there"
+        assert sessions[0]["message_count"] == 1
+
+    def test_list_sessions_sees_changes_from_other_stores(self, tmp_path: Path) -> None:
+        first = SessionStore(directory=tmp_path / "sessions")
+        first.start_session("s1")
+        first.record("user", "one")
+        assert first.list_sessions()[0]["message_count"] == 1
+        second = SessionStore(directory=tmp_path / "sessions")
+        second.start_session("s1")
+        second.record("assistant", "two")
+        assert first.list_sessions()[0]["message_count"] == 2
+
+    def test_archival_removes_old_sessions(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        (sessions_dir / "old.json").write_text(json.dumps({
+            "id": "old", "messages": [{"role": "user", "content": "x"}],
+            "created_at": 1, "updated_at": 1,
+        }))
+        store = SessionStore(directory=sessions_dir)
+        store._maintenance.join()
+        assert not (sessions_dir / "old.json").exists()
+        assert store.list_sessions() == []
+
+    def test_archival_uses_mtime_without_timestamps(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        old = sessions_dir / "old.json"
+        old.write_text(json.dumps({"id": "old", "messages": [{"role": "user", "content": "x"}]}))
+        os.utime(old, (1, 1))
+        fresh = sessions_dir / "fresh.json"
+        fresh.write_text(json.dumps({
+            "id": "fresh", "messages": [{"role": "user", "content": "y"}],
+        }))
+        store = SessionStore(directory=sessions_dir)
+        sessions = store.list_sessions()
+        assert not old.exists()
+        assert [s["id"] for s in sessions] == ["fresh"]
+        assert sessions[0]["updated_at"] > 0
+
+    def test_init_scans_directory_once(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        with patch("app.runtime.state.session_store.os.scandir", wraps=os.scandir) as mock_scan:
+            SessionStore(directory=sessions_dir)._maintenance.join()
+        assert mock_scan.call_count == 1
+
+    def test_init_does_not_wait_for_sweep(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        (sessions_dir / "stale.json").write_text("{}")
+        release = threading.Event()
+        with patch("app.runtime.state.session_store._write_lock") as lock:
+            lock.__enter__.side_effect = lambda: release.wait(5)
+            store = SessionStore(directory=sessions_dir)
+            assert (sessions_dir / "stale.json").exists()
+            release.set()
+            store._maintenance.join()
+        assert not (sessions_dir / "stale.json").exists()
+
+    def test_record_during_sweep_not_blocked_or_lost(self, tmp_path: Path) -> None:
+        from app.runtime.state import session_store
+
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        (sessions_dir / "s1.jsonl").write_text(
+            '{"id": "s1", "created_at": 1, "updated_at": 1}\n'
+            '{"role": "user", "content": "old", "timestamp": 1}\n'
+        )
+        scanned, release = threading.Event(), threading.Event()
+        load_meta = session_store._load_meta
+
+        def _slow_load_meta(*args):
+            meta = load_meta(*args)
+            scanned.set()
+            release.wait(5)
+            return meta
+
+        with patch("app.runtime.state.session_store._load_meta", _slow_load_meta):
+            store = SessionStore(directory=sessions_dir)
+            assert scanned.wait(5)
+            store.current_session_id = "s1"
+            writer = threading.Thread(target=store.record, args=("user", "new"))
+            writer.start()
+            writer.join(5)
+            # The write does not wait for the sweep to finish parsing.
+            assert not writer.is_alive()
+            release.set()
+            store._maintenance.join()
+        # The log changed after it was parsed, so the sweep leaves it alone.
+        msgs = store.get_session("s1")["messages"]
+        assert [m["content"] for m in msgs] == ["old", "new"]
+
+    def test_one_sweep_per_directory(self, tmp_path: Path) -> None:
+        first = SessionStore(directory=tmp_path / "sessions")
+        second = SessionStore(directory=tmp_path / "sessions")
+        assert second._maintenance is first._maintenance
+
+    def test_unreadable_session_removed(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        (sessions_dir / "broken.json").write_text("{not json")
+        SessionStore(directory=sessions_dir)._maintenance.join()
+        assert not (sessions_dir / "broken.json").exists()
+
+    def test_record_appends_one_line(self, tmp_path: Path) -> None:
+        store = SessionStore(directory=tmp_path / "sessions")
+        store.start_session("s1", model="m")
+        store.record("user", "first")
+        path = tmp_path / "sessions" / "s1.jsonl"
+        before = path.read_text()
+        store.record("assistant", "second\nline")
+        after = path.read_text()
+        assert after.startswith(before)
+        assert len(after.splitlines()) == 3
+        data = store.get_session("s1")
+        assert [m["content"] for m in data["messages"]] == ["first", "second\nline"]
+        assert data["model"] == "m"
+
+    def test_legacy_session_converted_on_write(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        (sessions_dir / "old.json").write_text(json.dumps({
+            "id": "old", "messages": [{"role": "user", "content": "hi", "timestamp": 1}],
+            "model": "x", "created_at": 1, "updated_at": 9e12, "title": "",
+        }))
+        store = SessionStore(directory=sessions_dir)
+        assert store.get_session("old")["messages"][0]["content"] == "hi"
+        store.start_session("old", model="y")
+        store.record("assistant", "hello")
+        assert not (sessions_dir / "old.json").exists()
+        data = store.get_session("old")
+        assert [m["content"] for m in data["messages"]] == ["hi", "hello"]
+        assert data["model"] == "y"
+
+    def test_torn_trailing_line_ignored(self, tmp_path: Path) -> None:
+        store = SessionStore(directory=tmp_path / "sessions")
+        store.start_session("s1")
+        store.record("user", "ok")
+        with open(tmp_path / "sessions" / "s1.jsonl", "a") as f:
+            f.write('{"role": "assis')
+        assert store.list_sessions()[0]["message_count"] == 1
+
+    def test_append_after_torn_line_keeps_message(self, tmp_path: Path) -> None:
+        store = SessionStore(directory=tmp_path / "sessions")
+        store.start_session("s1")
+        store.record("user", "one")
+        with open(tmp_path / "sessions" / "s1.jsonl", "a") as f:
+            f.write('{"role": "assis')
+        store.record("assistant", "two")
+        store.record("user", "three")
+        msgs = store.get_session("s1")["messages"]
+        assert [m["content"] for m in msgs] == ["one", "two", "three"]
+
+    def test_non_json_values_stringified(self, tmp_path: Path) -> None:
+        store = SessionStore(directory=tmp_path / "sessions")
+        store.start_session("s1")
+        store.record("user", "hi", tool_calls=[ToolCall(name="t", result=Path("/tmp/x"))])
+        assert store.get_session("s1")["messages"][0]["tool_calls"][0]["result"] == "/tmp/x"
+
+    def test_record_skips_asdict(self, tmp_path: Path) -> None:
+        store = SessionStore(directory=tmp_path / "sessions")
+        store.start_session("s1")
+        with patch("app.runtime.state.session_store.asdict") as asdict:
+            store.record("user", "hi", tool_calls=[ToolCall(name="t")])
+            store.record("assistant", "hello")
+        asdict.assert_not_called()
+        msgs = store.get_session("s1")["messages"]
+        assert msgs[0]["tool_calls"] == [{"name": "t", "arguments": "", "result": ""}]
+
+    def test_load_accepts_partial_messages(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / "sessions"
+        sessions_dir.mkdir()
+        (sessions_dir / "old.json").write_text(json.dumps({
+            "id": "old", "updated_at": 9e12,
+            "messages": [
+                {"role": "user", "content": "hi"},
+                {"role": "assistant", "content": "yo", "timestamp": 2, "channel": "",
+                 "tool_calls": [{"name": "t", "arguments": "{}", "result": "ok"}]},
+            ],
+        }))
+        store = SessionStore(directory=sessions_dir)
+        store.start_session("old")
+        store.record("user", "again")
+        msgs = store.get_session("old")["messages"]
+        assert [m["content"] for m in msgs] == ["hi", "yo", "again"]
+        assert msgs[0]["timestamp"] == 0
+        assert msgs[1]["tool_calls"] == [{"name": "t", "arguments": "{}", "result": "ok"}]
+
+    def test_clear_all_does_not_parse(self, tmp_path: Path) -> None:
+        store = SessionStore(directory=tmp_path / "sessions")
+        for sid in ("a", "b"):
+            store.start_session(sid)
+            store.record("user", sid)
+        (tmp_path / "sessions" / "notes.txt").write_text("keep")
+        store._maintenance.join()
+        with patch("app.runtime.state.session_store._read_session_file") as read:
+            assert store.clear_all() == 2
+        read.assert_not_called()
+        assert [p.name for p in (tmp_path / "sessions").iterdir()] == ["notes.txt"]
+
+    def test_get_session_matches_dataclass_shape(self, tmp_path: Path) -> None:
+        from dataclasses import asdict
+
+        store = SessionStore(directory=tmp_path / "sessions")
+        store.start_session("s1", model="m")
+        store.record("user", "hi", tool_calls=[ToolCall(name="t", arguments="{}")])
+        store.record("assistant", "hello")
+        store._maintenance.join()
+        with patch("app.runtime.state.session_store.SessionMessage") as msg_cls:
+            data = store.get_session("s1")
+        msg_cls.assert_not_called()
+        assert data == asdict(store._load("s1"))
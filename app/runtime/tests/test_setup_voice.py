@@ -0,0 +1,347 @@
+"""Tests for the voice setup routes."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from app.runtime.server.setup_voice import VoiceSetupRoutes
+from app.runtime.services.azure import AzureCLI
+from app.runtime.state.infra_config import InfraConfigStore
+
+_AOAI_INFO = {
+    "id": "/subscriptions/sub/rg/aoai",
+    "location": "swedencentral",
+    "properties": {"endpoint": "https://aoai.openai.azure.com/"},
+}
+_DEPLOYMENTS = [
+    {"name": "gpt-realtime-mini", "properties": {"model": {"name": "gpt-realtime-mini"}}},
+]
+
+
+def _fake_az(responses: dict[tuple[str, ...], object]) -> MagicMock:
+    """Build an ``AzureCLI`` stand-in answering on the leading command words."""
+    az = MagicMock()
+    az.last_stderr = ""
+    calls: list[tuple[str, ...]] = []
+
+    def _json(*args: str, quiet: bool = False) -> object:
+        calls.append(args)
+        for prefix, value in responses.items():
+            if args[: len(prefix)] == prefix:
+                return value
+        return None
+
+    az.json.side_effect = _json
+    az.calls = calls
+    return az
+
+
+def _build_app(routes: VoiceSetupRoutes) -> web.Application:
+    app = web.Application()
+    routes.register(app.router)
+    return app
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> InfraConfigStore:
+    return InfraConfigStore(path=tmp_path / "infra.json")
+
+
+class TestConnectExisting:
+    @pytest.mark.asyncio
+    @patch("app.runtime.server.setup_voice.cfg")
+    async def test_connect_with_existing_acs(
+        self, mock_cfg: MagicMock, store: InfraConfigStore,
+    ) -> None:
+        az = _fake_az({
+            ("cognitiveservices", "account", "show"): _AOAI_INFO,
+            ("cognitiveservices", "account", "deployment", "list"): _DEPLOYMENTS,
+            ("cognitiveservices", "account", "keys", "list"): {"key1": "k"},
+            ("communication", "list-key"): {"primaryConnectionString": "endpoint=x"},
+        })
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/connect", json={
+                "aoai_name": "aoai", "aoai_resource_group": "rg",
+                "acs_name": "acs", "acs_resource_group": "acs-rg",
+            })
+            data = await resp.json()
+        assert data["status"] == "ok"
+        assert store.channels.voice_call.acs_connection_string == "endpoint=x"
+        assert store.channels.voice_call.voice_resource_group == "acs-rg"
+        assert len(az.calls) == 4
+
+    @pytest.mark.asyncio
+    @patch("app.runtime.server.setup_voice.cfg")
+    async def test_phone_numbers_written_once(
+        self, mock_cfg: MagicMock, store: InfraConfigStore,
+    ) -> None:
+        az = _fake_az({
+            ("cognitiveservices", "account", "show"): _AOAI_INFO,
+            ("cognitiveservices", "account", "deployment", "list"): _DEPLOYMENTS,
+            ("cognitiveservices", "account", "keys", "list"): {"key1": "k"},
+            ("communication", "list-key"): {"primaryConnectionString": "endpoint=x"},
+        })
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/connect", json={
+                "aoai_name": "aoai", "aoai_resource_group": "rg",
+                "acs_name": "acs", "acs_resource_group": "acs-rg",
+                "phone_number": "+14155551234", "target_number": "+41781234567",
+            })
+            data = await resp.json()
+        assert data["status"] == "ok"
+        mock_cfg.write_env.assert_called_once()
+        env = mock_cfg.write_env.call_args.kwargs
+        assert env["ACS_SOURCE_NUMBER"] == "+14155551234"
+        assert env["VOICE_TARGET_NUMBER"] == "+41781234567"
+        assert store.channels.voice_call.voice_target_number == "+41781234567"
+
+    @pytest.mark.asyncio
+    async def test_missing_aoai_returns_404(self, store: InfraConfigStore) -> None:
+        az = _fake_az({})
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/connect", json={
+                "aoai_name": "aoai", "aoai_resource_group": "rg",
+            })
+            assert resp.status == 404
+
+    @pytest.mark.asyncio
+    async def test_missing_deployment_fails(self, store: InfraConfigStore) -> None:
+        az = _fake_az({
+            ("cognitiveservices", "account", "show"): _AOAI_INFO,
+            ("cognitiveservices", "account", "deployment", "list"): [],
+        })
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/connect", json={
+                "aoai_name": "aoai", "aoai_resource_group": "rg",
+            })
+            data = await resp.json()
+        assert data["status"] == "error"
+        assert data["steps"][-1]["step"] == "aoai_deployment"
+
+
+class TestDiscoveryCache:
+    @pytest.mark.asyncio
+    @patch.object(AzureCLI, "json")
+    async def test_list_aoai_cached(self, mock_json: MagicMock, store: InfraConfigStore) -> None:
+        mock_json.return_value = [
+            {"name": "a", "resourceGroup": "rg", "location": "x", "kind": "OpenAI"},
+            {"name": "b", "resourceGroup": "rg", "location": "x", "kind": "Speech"},
+        ]
+        app = _build_app(VoiceSetupRoutes(AzureCLI(), store))
+        async with TestClient(TestServer(app)) as client:
+            first = await (await client.get("/api/setup/voice/aoai/list")).json()
+            second = await (await client.get("/api/setup/voice/aoai/list")).json()
+        assert first == second == [{"name": "a", "resource_group": "rg", "location": "x"}]
+        assert mock_json.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch.object(AzureCLI, "json")
+    async def test_failed_listing_not_cached(
+        self, mock_json: MagicMock, store: InfraConfigStore,
+    ) -> None:
+        mock_json.side_effect = [None, [{"name": "acs", "resourceGroup": "rg"}]]
+        app = _build_app(VoiceSetupRoutes(AzureCLI(), store))
+        async with TestClient(TestServer(app)) as client:
+            first = await (await client.get("/api/setup/voice/acs/list")).json()
+            second = await (await client.get("/api/setup/voice/acs/list")).json()
+        assert first == []
+        assert [r["name"] for r in second] == ["acs"]
+        assert mock_json.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_list_aoai_include_deployments(self, store: InfraConfigStore) -> None:
+        az = _fake_az({})
+        az.json_cached.side_effect = lambda *args, **_kwargs: (
+            [
+                {"name": "a", "resourceGroup": "rg1", "location": "x", "kind": "OpenAI"},
+                {"name": "b", "resourceGroup": "rg2", "location": "x", "kind": "OpenAI"},
+            ]
+            if args[0] == "resource"
+            else _DEPLOYMENTS if "a" in args else None
+        )
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.get("/api/setup/voice/aoai/list?include_deployments=1")
+            data = await resp.json()
+        assert data[0]["deployments"][0]["model_name"] == "gpt-realtime-mini"
+        assert data[1]["deployments"] == []
+        assert az.json_cached.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("app.runtime.server.setup_voice.cfg")
+    @patch.object(AzureCLI, "json")
+    async def test_decommission_invalidates(
+        self, mock_json: MagicMock, mock_cfg: MagicMock, store: InfraConfigStore,
+    ) -> None:
+        mock_json.return_value = []
+        app = _build_app(VoiceSetupRoutes(AzureCLI(), store))
+        async with TestClient(TestServer(app)) as client:
+            await client.get("/api/setup/voice/acs/list")
+            await client.post("/api/setup/voice/decommission")
+            await client.get("/api/setup/voice/acs/list")
+        assert mock_json.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("app.runtime.server.setup_voice.cfg")
+    async def test_decommission_invalidates_voice_rg_deployments(
+        self, mock_cfg: MagicMock, store: InfraConfigStore,
+    ) -> None:
+        from app.runtime.server.setup_voice import _deployment_list_args
+
+        store.save_voice_call(
+            azure_openai_resource_name="aoai",
+            resource_group="rg-main",
+            voice_resource_group="rg-voice",
+        )
+        az = _fake_az({("group", "show"): {"name": "rg-voice"}})
+        az.ok.return_value = (True, "")
+        await VoiceSetupRoutes(az, store).decommission(MagicMock())
+        az.invalidate_cache.assert_any_call(*_deployment_list_args("aoai", "rg-voice"))
+
+
+class TestEnsureRg:
+    @pytest.mark.asyncio
+    async def test_existing_rg_probe_cached(self, store: InfraConfigStore) -> None:
+        az = _fake_az({("group", "show"): {"name": "rg"}})
+        routes = VoiceSetupRoutes(az, store)
+        steps: list[dict] = []
+        assert await routes._ensure_rg("rg", "Global", steps)
+        assert await routes._ensure_rg("rg", "Global", steps)
+        assert len(az.calls) == 1
+        assert [s["status"] for s in steps] == ["ok", "ok"]
+
+    @pytest.mark.asyncio
+    async def test_failed_create_not_cached(self, store: InfraConfigStore) -> None:
+        az = _fake_az({})
+        routes = VoiceSetupRoutes(az, store)
+        assert not await routes._ensure_rg("rg", "Global", [])
+        assert not await routes._ensure_rg("rg", "Global", [])
+        assert len(az.calls) == 4
+
+
+class TestSavePhone:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("number", ["14155551234", "+0415555123", "+1415", "+1415555abcd"])
+    async def test_rejects_non_e164(self, number: str, store: InfraConfigStore) -> None:
+        app = _build_app(VoiceSetupRoutes(_fake_az({}), store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/phone", json={"phone_number": number})
+            assert resp.status == 400
+
+    @pytest.mark.asyncio
+    @patch("app.runtime.server.setup_voice.cfg")
+    async def test_accepts_e164(self, mock_cfg: MagicMock, store: InfraConfigStore) -> None:
+        app = _build_app(VoiceSetupRoutes(_fake_az({}), store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/phone", json={
+                "phone_number": "+14155551234", "target_number": "+41781234567",
+            })
+            assert resp.status == 200
+        mock_cfg.write_env.assert_called_once_with(
+            ACS_SOURCE_NUMBER="+14155551234", VOICE_TARGET_NUMBER="+41781234567",
+        )
+
+
+class TestValidateAoai:
+    @pytest.mark.asyncio
+    async def test_full_response(self, store: InfraConfigStore) -> None:
+        az = _fake_az({})
+        az.json_cached.return_value = [
+            {"name": "chat", "properties": {"model": {"name": "gpt-4o"}}},
+            *_DEPLOYMENTS,
+        ]
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/aoai/validate", json={
+                "name": "aoai", "resource_group": "rg",
+            })
+            data = await resp.json()
+        assert data["valid"] is True
+        assert [d["is_realtime"] for d in data["deployments"]] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_summary_only(self, store: InfraConfigStore) -> None:
+        az = _fake_az({})
+        az.json_cached.return_value = [
+            {"name": "chat", "properties": {"model": {"name": "gpt-4o"}}},
+        ]
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.post("/api/setup/voice/aoai/validate?summary=1", json={
+                "name": "aoai", "resource_group": "rg",
+            })
+            data = await resp.json()
+        assert data == {"valid": False}
+
+
+class TestAcsPhones:
+    @pytest.mark.asyncio
+    async def test_connection_string_cached(self, store: InfraConfigStore) -> None:
+        az = _fake_az({
+            ("communication", "list-key"): {"primaryConnectionString": "endpoint=x"},
+            ("communication", "phonenumber", "list"): [{"phoneNumber": "+14155551234"}, {}],
+        })
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            for _ in range(2):
+                resp = await client.get(
+                    "/api/setup/voice/acs/phones?name=acs&resource_group=rg",
+                )
+                assert await resp.json() == [{"phone_number": "+14155551234"}]
+        assert [c[:2] for c in az.calls] == [
+            ("communication", "list-key"),
+            ("communication", "phonenumber"),
+            ("communication", "phonenumber"),
+        ]
+
+
+class TestEnsureRbac:
+    @pytest.mark.asyncio
+    async def test_assigns_role_for_signed_in_user(self, store: InfraConfigStore) -> None:
+        az = _fake_az({
+            ("ad", "signed-in-user", "show"): {"id": "user-oid"},
+            ("cognitiveservices", "account", "show"): _AOAI_INFO,
+        })
+        az.account_info.return_value = {"id": "sub", "user": {"name": "me"}}
+        az.ok.return_value = (True, "")
+        steps: list[dict] = []
+        await VoiceSetupRoutes(az, store)._ensure_rbac("aoai", "rg", steps)
+        assert steps == [
+            {"step": "rbac_assign", "status": "ok", "detail": "Cognitive Services OpenAI User"},
+        ]
+        assert "user-oid" in az.ok.call_args.args
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_service_principal(self, store: InfraConfigStore) -> None:
+        az = _fake_az({
+            ("ad", "sp", "show"): {"id": "sp-oid"},
+            ("cognitiveservices", "account", "show"): _AOAI_INFO,
+        })
+        az.account_info.return_value = {"id": "sub", "user": {"name": "app-id"}}
+        az.ok.return_value = (True, "")
+        await VoiceSetupRoutes(az, store)._ensure_rbac("aoai", "rg", [])
+        assert "ServicePrincipal" in az.ok.call_args.args
+
+
+class TestGetConfig:
+    @pytest.mark.asyncio
+    async def test_portal_url(self, store: InfraConfigStore) -> None:
+        store.save_voice_call(acs_resource_name="acs", voice_resource_group="rg")
+        az = _fake_az({})
+        az.account_info.return_value = {"id": "sub-1"}
+        app = _build_app(VoiceSetupRoutes(az, store))
+        async with TestClient(TestServer(app)) as client:
+            data = await (await client.get("/api/setup/voice/config")).json()
+        assert data["portal_phone_url"] == (
+            "https://portal.azure.com/#@/resource/subscriptions/sub-1/resourceGroups/rg"
+            "/providers/Microsoft.Communication/CommunicationServices/acs/phonenumbers"
+        )
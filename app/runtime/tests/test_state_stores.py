@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
@@ -11,7 +12,7 @@ import pytest
 from app.runtime.state.mcp_config import McpConfigStore
 from app.runtime.state.sandbox_config import BLACKLIST, DEFAULT_WHITELIST, SandboxConfigStore
 from app.runtime.state.plugin_config import PluginConfigStore
-from app.runtime.state.foundry_iq_config import FoundryIQConfigStore
+from app.runtime.state.foundry_iq_config import FoundryIQConfigStore, get_foundry_iq_config
 from app.runtime.state.infra_config import InfraConfigStore
 
 
@@ -159,6 +160,35 @@ class TestSandboxConfigStore:
         s2 = SandboxConfigStore(path=db)
         assert s2.enabled
 
+    def test_whitelist_deduplicated(self, tmp_path: Path) -> None:
+        db = tmp_path / "sandbox.json"
+        db.write_text(json.dumps({"whitelist": ["a", "b", "a"]}))
+        store = SandboxConfigStore(path=db)
+        assert store.whitelist == ["a", "b"]
+        store.set_whitelist(["c", "c", "d"])
+        store.add_whitelist_item("c")
+        assert store.whitelist == ["c", "d"]
+        assert store.to_dict()["whitelist"] == ["c", "d"]
+        assert SandboxConfigStore(path=db).whitelist == ["c", "d"]
+
+    def test_batch_writes_once(self, tmp_path: Path) -> None:
+        store = SandboxConfigStore(path=tmp_path / "sandbox.json")
+        with patch("app.runtime.state.sandbox_config.atomic_write_bytes") as write:
+            with store.batch():
+                store.set_enabled(True)
+                store.set_sync_data(False)
+                store.add_whitelist_item("custom")
+                write.assert_not_called()
+        write.assert_called_once()
+
+    def test_batch_persists_on_exit(self, tmp_path: Path) -> None:
+        db = tmp_path / "sandbox.json"
+        store = SandboxConfigStore(path=db)
+        with store.batch():
+            store.set_enabled(True)
+            assert not db.exists()
+        assert SandboxConfigStore(path=db).enabled
+
 
 class TestPluginConfigStore:
     def test_empty(self, tmp_path: Path) -> None:
@@ -215,6 +245,13 @@ class TestFoundryIQConfigStore:
         assert store.enabled
         assert store.is_configured
 
+    def test_save_coerces_form_strings(self, tmp_path: Path) -> None:
+        store = FoundryIQConfigStore(path=tmp_path / "fiq.json")
+        store.save(enabled="Yes", embedding_dimensions="1536", bogus="x")
+        assert store.config.enabled is True
+        assert store.config.embedding_dimensions == 1536
+        assert not hasattr(store.config, "bogus")
+
     def test_safe_dict_masks_keys(self, tmp_path: Path) -> None:
         store = FoundryIQConfigStore(path=tmp_path / "fiq.json")
         store.save(search_api_key="secret", embedding_api_key="secret2")
@@ -249,6 +286,29 @@ class TestFoundryIQConfigStore:
         assert s2.enabled
 
 
+class TestGetFoundryIQConfig:
+    def test_concurrent_first_access_builds_one_store(self, tmp_path: Path) -> None:
+        barrier = threading.Barrier(8)
+        results: list[FoundryIQConfigStore] = []
+
+        def _get() -> None:
+            barrier.wait()
+            results.append(get_foundry_iq_config())
+
+        with patch(
+            "app.runtime.state.foundry_iq_config.FoundryIQConfigStore",
+            side_effect=lambda: FoundryIQConfigStore(path=tmp_path / "fiq.json"),
+        ) as mock_cls:
+            threads = [threading.Thread(target=_get) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert mock_cls.call_count == 1
+        assert len({id(r) for r in results}) == 1
+
+
 class TestInfraConfigStore:
     def test_defaults(self, tmp_path: Path) -> None:
         store = InfraConfigStore(path=tmp_path / "infra.json")
@@ -297,3 +357,33 @@ class TestInfraConfigStore:
         s1.save_bot(display_name="Persist")
         s2 = InfraConfigStore(path=db)
         assert s2.bot.display_name == "Persist"
+
+    @patch("app.runtime.services.keyvault.resolve_if_kv_ref")
+    def test_load_resolves_refs_and_skips_failures(self, mock_resolve, tmp_path: Path) -> None:
+        def _resolve(value: str) -> str:
+            if value == "@kv:infra-token":
+                raise RuntimeError("denied")
+            return "resolved-" + value.split(":")[-1]
+
+        mock_resolve.side_effect = _resolve
+        db = tmp_path / "infra.json"
+        db.write_text(json.dumps({
+            "bot": {"display_name": "Bot"},
+            "channels": {
+                "telegram": {"token": "@kv:infra-token", "whitelist": "alice"},
+                "voice_call": {"acs_connection_string": "@kv:infra-acs"},
+            },
+        }))
+        store = InfraConfigStore(path=db)
+        assert store.bot.display_name == "Bot"
+        assert store.channels.telegram.token == ""
+        assert store.channels.telegram.whitelist == "alice"
+        assert store.channels.voice_call.acs_connection_string == "resolved-infra-acs"
+
+    @patch("app.runtime.services.keyvault.resolve_if_kv_ref")
+    def test_load_only_resolves_secret_fields(self, mock_resolve, tmp_path: Path) -> None:
+        db = tmp_path / "infra.json"
+        db.write_text(json.dumps({"bot": {"display_name": "@kv:looks-like-a-ref"}}))
+        store = InfraConfigStore(path=db)
+        assert store.bot.display_name == "@kv:looks-like-a-ref"
+        mock_resolve.assert_not_called()
@@ -0,0 +1,75 @@
+"""Tests for the CloudflareTunnel URL detection."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+from app.runtime.services.tunnel import CloudflareTunnel, _drain
+
+
+def _spawn(script: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+
+
+class TestWaitForUrl:
+    def test_detects_url(self) -> None:
+        proc = _spawn(
+            "import sys, time\n"
+            "sys.stderr.write('INF Starting tunnel\\n'); sys.stderr.flush(); time.sleep(0.1)\n"
+            "sys.stderr.write('INF |  https://quick-brown-fox.trycloudflare.com  |\\n')\n"
+            "sys.stderr.flush(); time.sleep(5)\n"
+        )
+        try:
+            assert CloudflareTunnel._wait_for_url(proc, timeout=5) == (
+                "https://quick-brown-fox.trycloudflare.com"
+            )
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_times_out_without_output(self) -> None:
+        proc = _spawn("import time; time.sleep(5)")
+        try:
+            start = time.monotonic()
+            assert CloudflareTunnel._wait_for_url(proc, timeout=0.3) is None
+            assert time.monotonic() - start < 2
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_returns_when_process_exits(self) -> None:
+        proc = _spawn("import sys; sys.stderr.write('ERR failed\\n')")
+        start = time.monotonic()
+        assert CloudflareTunnel._wait_for_url(proc, timeout=5) is None
+        assert time.monotonic() - start < 4
+        proc.wait()
+
+
+class TestStart:
+    @patch("app.runtime.services.tunnel.CloudflareTunnel._drain_background")
+    @patch("app.runtime.services.tunnel.CloudflareTunnel._wait_for_url", return_value="https://x.trycloudflare.com")
+    @patch("app.runtime.services.tunnel.subprocess.Popen")
+    @patch("app.runtime.services.tunnel.shutil.which", return_value="/usr/bin/cloudflared")
+    def test_discards_stdout(self, _which, mock_popen, _wait, mock_drain) -> None:
+        mock_popen.return_value = MagicMock()
+        result = CloudflareTunnel().start(8080)
+        assert result.value == "https://x.trycloudflare.com"
+        assert mock_popen.call_args.kwargs["stdout"] is subprocess.DEVNULL
+        assert mock_popen.call_args.kwargs["stderr"] is subprocess.PIPE
+        mock_drain.assert_called_once_with(mock_popen.return_value)
+
+
+class TestDrain:
+    def test_reads_until_eof(self) -> None:
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"x" * 10_000)
+        os.close(write_fd)
+        _drain(read_fd)
+        assert os.read(read_fd, 1) == b""
+        os.close(read_fd)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import patch
 
 import pytest
 from aiohttp import web
@@ -51,11 +51,36 @@ class TestWorkspaceListDir:
         data = await resp.json()
         names = {e["name"] for e in data["entries"]}
         assert "nested.json" in names
+        assert data["entries"][0]["path"] == "data/subdir/nested.json"
 
     async def test_list_invalid_root(self, client: TestClient) -> None:
         resp = await client.get("/api/workspace/list?path=invalid")
         assert resp.status == 400
 
+    async def test_list_permission_denied(self, client: TestClient) -> None:
+        with patch.object(WorkspaceHandler, "_scan_dir", return_value=None):
+            resp = await client.get("/api/workspace/list?path=data")
+        assert resp.status == 403
+
+    async def test_list_cached_briefly(self, client: TestClient) -> None:
+        with patch.object(WorkspaceHandler, "_scan_dir", return_value=[]) as scan:
+            await client.get("/api/workspace/list?path=data")
+            await client.get("/api/workspace/list?path=data")
+        assert scan.call_count == 1
+
+    async def test_list_cache_expires(self, client: TestClient) -> None:
+        with patch.object(WorkspaceHandler, "_scan_dir", return_value=[]) as scan, \
+                patch("app.runtime.server.workspace._LIST_CACHE_TTL", 0.0):
+            await client.get("/api/workspace/list?path=data")
+            await client.get("/api/workspace/list?path=data")
+        assert scan.call_count == 2
+
+    async def test_list_dirs_first(self, client: TestClient) -> None:
+        resp = await client.get("/api/workspace/list?path=data")
+        data = await resp.json()
+        assert [e["name"] for e in data["entries"]] == ["subdir", "hello.txt"]
+        assert data["entries"][1]["size"] == 5
+
 
 @pytest.mark.asyncio
 class TestWorkspaceReadFile:
@@ -75,8 +100,88 @@ class TestWorkspaceReadFile:
         resp = await client.get("/api/workspace/read?path=data/nope.txt")
         assert resp.status == 404
 
+    async def test_read_directory_is_not_found(self, client: TestClient) -> None:
+        resp = await client.get("/api/workspace/read?path=data/subdir")
+        assert resp.status == 404
+
+    async def test_read_truncated(self, client: TestClient) -> None:
+        with patch("app.runtime.server.workspace._MAX_PREVIEW_SIZE", 3):
+            resp = await client.get("/api/workspace/read?path=data/hello.txt")
+        data = await resp.json()
+        assert data["truncated"] is True
+        assert data["content"] == "wor"
+        assert data["size"] == 5
+
+    async def test_read_plain_text(self, client: TestClient) -> None:
+        resp = await client.get(
+            "/api/workspace/read?path=data/hello.txt", headers={"Accept": "text/plain"},
+        )
+        assert resp.status == 200
+        assert resp.content_type == "text/plain"
+        assert await resp.text() == "world"
+
+    async def test_read_plain_text_truncated(self, client: TestClient) -> None:
+        with patch("app.runtime.server.workspace._MAX_PREVIEW_SIZE", 3):
+            resp = await client.get(
+                "/api/workspace/read?path=data/hello.txt", headers={"Accept": "text/plain"},
+            )
+        assert await resp.text() == "wor"
+        assert resp.headers["X-Preview-Truncated"] == "1"
+
     async def test_read_nested(self, client: TestClient) -> None:
         resp = await client.get("/api/workspace/read?path=data/subdir/nested.json")
         assert resp.status == 200
         data = await resp.json()
         assert '"key"' in data["content"]
+
+
+class TestResolve:
+    def _handler(self, root: Path) -> WorkspaceHandler:
+        handler = WorkspaceHandler()
+        handler.ROOTS = {"data": root}
+        return handler
+
+    def test_rejects_sibling_with_shared_prefix(self, tmp_path: Path) -> None:
+        root = tmp_path / "files"
+        root.mkdir()
+        (tmp_path / "files-other").mkdir()
+        assert self._handler(root)._resolve("data/../files-other") is None
+
+    def test_root_itself_allowed(self, tmp_path: Path) -> None:
+        assert self._handler(tmp_path)._resolve("data") == tmp_path.resolve()
+
+    def test_root_resolved_once(self, tmp_path: Path) -> None:
+        handler = self._handler(tmp_path)
+        handler._resolve("data/a")
+        with patch.object(
+            Path, "resolve", autospec=True, side_effect=Path.absolute,
+        ) as mock_resolve:
+            handler._resolve("data/b")
+        assert mock_resolve.call_count == 1
+
+
+class TestIsBinary:
+    def test_empty_file_not_opened(self, tmp_path: Path) -> None:
+        with patch("builtins.open") as mock_open:
+            assert WorkspaceHandler._is_binary(tmp_path / "missing", 0) is False
+        mock_open.assert_not_called()
+
+    def test_nul_byte_is_binary(self, tmp_path: Path) -> None:
+        path = tmp_path / "blob.bin"
+        path.write_bytes(b"abc\x00def")
+        assert WorkspaceHandler._is_binary(path, 7) is True
+
+    def test_text_is_not_binary(self, tmp_path: Path) -> None:
+        path = tmp_path / "note.md"
+        path.write_text("# hi")
+        assert WorkspaceHandler._is_binary(path, 4) is False
+
+    def test_magic_bytes_are_binary(self, tmp_path: Path) -> None:
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"%PDF-1.7\nstream of text without nul")
+        assert WorkspaceHandler._is_binary(path, 35) is True
+
+    def test_text_suffix_not_sniffed(self, tmp_path: Path) -> None:
+        with patch("builtins.open") as mock_open:
+            assert WorkspaceHandler._is_binary(tmp_path / "notes.MD", 10) is False
+        mock_open.assert_not_called()
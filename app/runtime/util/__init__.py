@@ -1,6 +1,7 @@
 """Shared utilities."""
 
-from .async_helpers import run_sync
+from .async_helpers import run_az_sync, run_sync
+from .atomic_file import atomic_write_bytes, atomic_write_text
 from .env_file import EnvFile
 from .result import Result
 from .singletons import register_singleton, reset_all_singletons
@@ -8,7 +9,10 @@ from .singletons import register_singleton, reset_all_singletons
 __all__ = [
     "EnvFile",
     "Result",
+    "atomic_write_bytes",
+    "atomic_write_text",
     "register_singleton",
     "reset_all_singletons",
+    "run_az_sync",
     "run_sync",
 ]
@@ -5,12 +5,24 @@ from __future__ import annotations
 import asyncio
 import functools
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypeVar
 
 T = TypeVar("T")
 
+AZ_MAX_WORKERS = 8
+
+# Each ``az`` invocation is a heavyweight Python subprocess; cap how many run at once.
+_AZ_POOL = ThreadPoolExecutor(max_workers=AZ_MAX_WORKERS, thread_name_prefix="az")
+
 
 async def run_sync(fn: Callable[..., T], *args: object, **kwargs: object) -> T:
     """Run a blocking *fn* in the default executor without stalling the loop."""
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+async def run_az_sync(fn: Callable[..., T], *args: object, **kwargs: object) -> T:
+    """Like :func:`run_sync`, but on the bounded pool reserved for ``az`` calls."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_AZ_POOL, functools.partial(fn, *args, **kwargs))